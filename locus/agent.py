@@ -9,11 +9,16 @@ from locus.sub_agents.language.agent import language_agent
 from locus.sub_agents.explorer.agent import explorer_agent
 from locus.sub_agents.search.agent import search_agent
 from locus.sub_agents.wardrobe.agent import wardrobe_agent
+from .shared_libraries import gtfs
 from .shared_libraries.model_config import get_model_type
+from .tools.trip_context import prefetch_trip_context, remember_trip
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Offline transit timetables take a while to compile, so start on them now.
+gtfs.start_loading()
+
 # Create AgentTool instances for each sub-agent
 navigator_tool = AgentTool(agent=navigator_agent)
 weather_tool = AgentTool(agent=weather_agent)
@@ -36,5 +41,8 @@ root_agent = Agent(
         explorer_tool,
         search_tool,
         wardrobe_tool,
+        remember_trip,
     ],
+    # Keeps the weather and air quality caches warm for the trip on record.
+    before_agent_callback=prefetch_trip_context,
 )
@@ -0,0 +1,400 @@
+"""
+Shared caching utilities for upstream API results.
+
+Provides a two-tier cache: a small in-process LRU in front of an on-disk
+SQLite store, so results survive worker restarts and are shared between
+workers on the same host.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Iterator, Optional, Tuple
+
+# Every TwoTierCache registers itself here so stats can be reported together.
+_CACHES = {}
+
+
+def get_cache_dir() -> str:
+    """
+    Gets the directory used for persistent cache files.
+
+    Returns:
+        str: The value of LOCUS_CACHE_DIR, or ~/.cache/locus by default.
+    """
+    return os.path.expanduser(os.getenv("LOCUS_CACHE_DIR", "~/.cache/locus"))
+
+
+def normalize_location_key(location: str) -> str:
+    """
+    Normalizes a location string for use as a cache key.
+
+    Case, surrounding/duplicate whitespace and punctuation are ignored, so
+    "Paris, France", "paris france" and "  PARIS,  France. " share a key.
+
+    Args:
+        location (str): The raw location string.
+
+    Returns:
+        str: The normalized key.
+    """
+    text = unicodedata.normalize("NFKC", location or "").casefold()
+    text = re.sub(r"[^\w]+", " ", text)
+    return " ".join(text.split())
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Returns (value, expires_at) for a live entry, or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def scan(self, prefix: str) -> Iterator[Tuple[str, Any]]:
+        """Yields (key, value) for live entries whose key starts with prefix."""
+        now = time.time()
+        with self._lock:
+            entries = [
+                (key, entry[0])
+                for key, entry in self._data.items()
+                if key.startswith(prefix) and entry[1] > now
+            ]
+        yield from entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteStore:
+    """
+    Persistent key/value store backed by a single SQLite file.
+
+    Entries are JSON-encoded and partitioned by namespace. Each namespace is
+    bounded to max_entries rows; the least recently written rows are evicted
+    first once the bound is exceeded.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 100_000):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        self._conn = None
+        self._pid = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this process's connection, reopening it after a fork."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " written_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_written"
+                " ON cache (namespace, written_at)"
+            )
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Returns (value, expires_at) for a live entry, or None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        payload = json.dumps(value)
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache"
+                " (namespace, key, value, expires_at, written_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at, time.time()),
+            )
+            self._writes_since_prune += 1
+            # Pruning scans the namespace, so only do it every so often.
+            if self._writes_since_prune >= max(1, self.max_entries // 100):
+                self._prune()
+            self._connection().commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._connection().commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM cache WHERE namespace = ?", (self.namespace,)
+            )
+            self._connection().commit()
+
+    def scan(self, prefix: str) -> Iterator[Tuple[str, Any]]:
+        """Yields (key, value) for live entries whose key starts with prefix."""
+        # A key range rather than LIKE, so the primary key index is used.
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else "\uffff"
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT key, value FROM cache"
+                " WHERE namespace = ? AND key >= ? AND key < ? AND expires_at > ?",
+                (self.namespace, prefix, upper, time.time()),
+            ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def _prune(self) -> None:
+        """Drops expired rows, then the oldest rows beyond max_entries."""
+        self._writes_since_prune = 0
+        self._connection().execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?",
+            (self.namespace, time.time()),
+        )
+        count = self._connection().execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._connection().execute(
+                "DELETE FROM cache WHERE rowid IN ("
+                " SELECT rowid FROM cache WHERE namespace = ?"
+                " ORDER BY written_at ASC LIMIT ?)",
+                (self.namespace, excess),
+            )
+            self.evictions += excess
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+
+class TwoTierCache:
+    """
+    In-process LRU backed by an optional persistent SQLite store.
+
+    Lookups check memory first, then disk; disk hits are promoted into memory.
+    Values must be JSON-serializable. Negative results (e.g. "not found") can
+    be stored with their own, usually shorter, TTL via set_negative().
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        negative_ttl: Optional[float] = None,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 100_000,
+        path: Optional[str] = None,
+        persistent: bool = True,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl if negative_ttl is not None else ttl
+        self.memory = LRUCache(max_memory_entries)
+        self.disk = None
+        if persistent:
+            path = path or os.path.join(get_cache_dir(), "locus_cache.sqlite3")
+            try:
+                self.disk = SQLiteStore(path, namespace, max_disk_entries)
+            except (sqlite3.Error, OSError):
+                # An unwritable cache directory degrades to memory-only caching.
+                self.disk = None
+
+        _CACHES[namespace] = self
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "sets": 0,
+        }
+
+    def get(self, key: str) -> Any:
+        """
+        Looks up a key in memory, then on disk.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            The cached value, or None if the key is missing or expired.
+        """
+        entry = self.memory.get(key)
+        tier = "memory_hits"
+        if entry is None and self.disk is not None:
+            try:
+                entry = self.disk.get(key)
+            except sqlite3.Error:
+                entry = None
+            if entry is not None:
+                tier = "disk_hits"
+                self.memory.set(key, entry[0], entry[1])
+
+        if entry is None:
+            self._count("misses")
+            return None
+
+        value = entry[0]
+        self._count(tier)
+        if isinstance(value, dict) and value.get("_negative"):
+            self._count("negative_hits")
+            return value["value"]
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores a value under key for ttl seconds (defaults to the cache TTL)."""
+        self._store(key, value, self.ttl if ttl is None else ttl)
+
+    def set_negative(self, key: str, value: Any) -> None:
+        """Stores a negative result (e.g. a "not found" error) for negative_ttl."""
+        self._store(key, {"_negative": True, "value": value}, self.negative_ttl)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            try:
+                self.disk.delete(key)
+            except sqlite3.Error:
+                pass
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            try:
+                self.disk.clear()
+            except sqlite3.Error:
+                pass
+
+    def scan(self, prefix: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields every live entry whose key starts with prefix.
+
+        Reads the disk tier when there is one (it holds everything in
+        memory too), otherwise memory. Negative entries are skipped.
+
+        Args:
+            prefix (str): The key prefix.
+
+        Yields:
+            tuple: (key, value) pairs.
+        """
+        entries = self.memory.scan(prefix)
+        if self.disk is not None:
+            try:
+                # Materialized here, so a failing query falls back to memory.
+                entries = list(self.disk.scan(prefix))
+            except sqlite3.Error:
+                pass
+        for key, value in entries:
+            if not (isinstance(value, dict) and value.get("_negative")):
+                yield key, value
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters for this cache.
+
+        Returns:
+            dict: Counters plus hit_rate, current sizes and eviction counts.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats.update(
+            {
+                "namespace": self.namespace,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "memory_evictions": self.memory.evictions,
+                "persistent": self.disk is not None,
+            }
+        )
+        if self.disk is not None:
+            stats["disk_evictions"] = self.disk.evictions
+        return stats
+
+    def _store(self, key: str, value: Any, ttl: float) -> None:
+        expires_at = time.time() + ttl
+        self.memory.set(key, value, expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, expires_at)
+            except sqlite3.Error:
+                pass
+        self._count("sets")
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+def get_cache_stats() -> dict:
+    """
+    Gets hit/miss statistics for every cache created in this process.
+
+    Returns:
+        dict: Mapping of cache namespace to its stats() dictionary.
+    """
+    return {name: cache.stats() for name, cache in _CACHES.items()}
@@ -0,0 +1,182 @@
+"""
+Request deadlines shared by a tool and every upstream call it makes.
+
+A tool sets a time budget once (see with_deadline()); the absolute deadline
+is kept in a context variable, so it follows the tool's chain of calls into
+helpers, asyncio tasks and (via contextvars.copy_context) worker threads.
+The shared HTTP transports in http_client cap each request's timeout to the
+remaining budget and fail fast with DeadlineExceeded once it is spent, which
+lets the tool return a partial or degraded result instead of hanging.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, Union
+from .env_config import env_float
+
+_deadline = contextvars.ContextVar("locus_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current time budget is spent before a call starts or ends."""
+
+
+def get_call_timeouts() -> Tuple[float, float]:
+    """
+    Gets the per-call timeouts applied to every upstream request.
+
+    Returns:
+        tuple: (connect, read) timeouts in seconds, from LOCUS_HTTP_CONNECT_TIMEOUT
+            and LOCUS_HTTP_READ_TIMEOUT.
+    """
+    return (
+        env_float("LOCUS_HTTP_CONNECT_TIMEOUT", 3.05),
+        env_float("LOCUS_HTTP_READ_TIMEOUT", 10),
+    )
+
+
+def get_tool_budget() -> float:
+    """Gets the default per-tool time budget in seconds (LOCUS_TOOL_DEADLINE)."""
+    return env_float("LOCUS_TOOL_DEADLINE", 20)
+
+
+def remaining() -> Optional[float]:
+    """
+    Gets the time left before the current deadline.
+
+    Returns:
+        float: Seconds remaining (may be negative), or None if no deadline is set.
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def expired() -> bool:
+    """Returns True if a deadline is set and has passed."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> Optional[float]:
+    """
+    Raises if the current deadline has passed.
+
+    Returns:
+        float: Seconds remaining, or None if no deadline is set.
+
+    Raises:
+        DeadlineExceeded: If the budget is spent.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Time budget exhausted before the upstream call")
+    return left
+
+
+def cap_timeout(
+    timeout: Union[None, float, Tuple[Optional[float], Optional[float]]] = None,
+) -> Tuple[float, float]:
+    """
+    Resolves the (connect, read) timeout for one upstream request.
+
+    Missing values fall back to the per-call defaults, and both are capped
+    to the time remaining before the current deadline.
+
+    Args:
+        timeout: A requests-style timeout (seconds or a (connect, read) pair).
+
+    Returns:
+        tuple: The (connect, read) timeout to use.
+
+    Raises:
+        DeadlineExceeded: If the budget is already spent.
+    """
+    default_connect, default_read = get_call_timeouts()
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    connect = default_connect if connect is None else connect
+    read = default_read if read is None else read
+    left = check()
+    if left is not None:
+        connect, read = min(connect, left), min(read, left)
+    return connect, read
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Sets a deadline for the enclosed block.
+
+    Nested deadlines can only shorten the budget: an inner block never gets
+    more time than its caller has left.
+
+    Args:
+        seconds (float): Time budget for the block.
+
+    Yields:
+        float: The absolute deadline on the time.monotonic() clock.
+    """
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield expires_at
+    finally:
+        _deadline.reset(token)
+
+
+def with_deadline(seconds: Optional[float] = None) -> Callable:
+    """
+    Decorates a tool so each call runs under its own time budget.
+
+    Works for both sync and async tools and keeps the tool's name, signature
+    and docstring, so the schema the agent sees is unchanged.
+
+    Args:
+        seconds (float, optional): Budget per call. Defaults to LOCUS_TOOL_DEADLINE.
+
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with deadline(seconds or get_tool_budget()):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with deadline(seconds or get_tool_budget()):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def degraded(message: str, **partial) -> dict:
+    """
+    Builds the tool response for a call that ran out of time budget.
+
+    Args:
+        message (str): What could not be completed in time.
+        **partial: Whatever data the tool did gather (e.g. coordinates).
+
+    Returns:
+        dict: {"error": message, "degraded": True, **partial}.
+    """
+    return {"error": message, "degraded": True, **partial}
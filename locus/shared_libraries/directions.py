@@ -0,0 +1,304 @@
+"""
+Cached Directions API lookups and a compact projection of their routes.
+
+Routes are cached by normalized origin and destination, travel mode and
+departure-time bucket, so repeated questions about the same trip (from the
+navigator, or the route air quality tool) cost one upstream call per
+bucket. Walking and cycling routes do not depend on the departure time and
+are cached for longer.
+
+A raw Directions payload runs to tens of thousands of tokens, mostly step
+polylines and HTML instructions. project_routes() reduces it to what the
+agents use: durations, lines, transfers and, optionally, plain-text steps.
+"""
+
+import re
+import time
+from datetime import datetime
+from typing import List, Optional
+from . import http_client
+from .cache import TwoTierCache, normalize_location_key
+from .env_config import env_bool, env_float, env_int
+from .http_client import get_gmaps_client
+from .singleflight import upstream_flight
+
+TRAVEL_MODES = ("driving", "walking", "bicycling", "transit")
+# Modes whose routes change with the departure time (timetables, traffic).
+TIMED_MODES = ("driving", "transit")
+
+_directions_cache = TwoTierCache(
+    "directions",
+    ttl=env_float("LOCUS_DIRECTIONS_STATIC_TTL", 24 * 3600),
+    negative_ttl=env_float("LOCUS_DIRECTIONS_NEGATIVE_TTL", 300),
+    max_memory_entries=env_int("LOCUS_DIRECTIONS_CACHE_SIZE", 512),
+    persistent=env_bool("LOCUS_CACHE_PERSIST", True),
+)
+
+_TAG = re.compile(r"<[^>]+>")
+
+
+def directions_key(
+    origin: str, destination: str, mode: str, departure_time: Optional[float]
+) -> str:
+    """
+    Builds the cache key for a directions lookup.
+
+    Departure times of timed modes are bucketed by
+    LOCUS_DIRECTIONS_BUCKET_SECONDS; other modes ignore them.
+    """
+    bucket = "any"
+    if mode in TIMED_MODES:
+        bucket_seconds = env_float("LOCUS_DIRECTIONS_BUCKET_SECONDS", 900)
+        bucket = int((departure_time or time.time()) // bucket_seconds)
+    return "|".join(
+        (
+            normalize_location_key(origin) or origin,
+            normalize_location_key(destination) or destination,
+            mode,
+            str(bucket),
+        )
+    )
+
+
+def get_directions(
+    origin: str,
+    destination: str,
+    api_key: str,
+    mode: str = "transit",
+    departure_time: Optional[float] = None,
+) -> List[dict]:
+    """
+    Gets Directions API routes, from cache if held for the departure bucket.
+
+    Args:
+        origin (str): The starting address or place.
+        destination (str): The destination address or place.
+        api_key (str): Google Maps API key.
+        mode (str, optional): One of TRAVEL_MODES. Defaults to "transit".
+        departure_time (float, optional): Unix time to leave at. Defaults to
+            now.
+
+    Returns:
+        list[dict]: The raw routes, alternatives included. Empty if there is
+            no route.
+
+    Raises:
+        Exception: If the Directions API call fails.
+    """
+    key = directions_key(origin, destination, mode, departure_time)
+    routes = _directions_cache.get(key)
+    if routes is not None:
+        return routes
+    return upstream_flight.do(
+        ("directions", key),
+        _fetch_directions,
+        key,
+        origin,
+        destination,
+        api_key,
+        mode,
+        departure_time,
+    )
+
+
+async def get_directions_async(
+    origin: str,
+    destination: str,
+    api_key: str,
+    mode: str = "transit",
+    departure_time: Optional[float] = None,
+) -> List[dict]:
+    """Async variant of get_directions(); see it for details."""
+    key = directions_key(origin, destination, mode, departure_time)
+    routes = _directions_cache.get(key)
+    if routes is not None:
+        return routes
+    return await upstream_flight.do_async(
+        ("directions", key),
+        _fetch_directions_async,
+        key,
+        origin,
+        destination,
+        api_key,
+        mode,
+        departure_time,
+    )
+
+
+def _fetch_directions(
+    key: str,
+    origin: str,
+    destination: str,
+    api_key: str,
+    mode: str,
+    departure_time: Optional[float],
+) -> List[dict]:
+    kwargs = {"mode": mode, "alternatives": True}
+    if mode in TIMED_MODES:
+        kwargs["departure_time"] = datetime.fromtimestamp(
+            departure_time or time.time()
+        )
+    routes = get_gmaps_client(api_key).directions(origin, destination, **kwargs)
+    _store_routes(key, mode, routes)
+    return routes
+
+
+async def _fetch_directions_async(
+    key: str,
+    origin: str,
+    destination: str,
+    api_key: str,
+    mode: str,
+    departure_time: Optional[float],
+) -> List[dict]:
+    params = {
+        "origin": origin,
+        "destination": destination,
+        "mode": mode,
+        "alternatives": "true",
+    }
+    if mode in TIMED_MODES:
+        params["departure_time"] = int(departure_time or time.time())
+    directions_result = await http_client.amaps_get("directions", params, api_key)
+    # Match googlemaps.Client.directions(), which returns the routes list.
+    routes = directions_result.get("routes", [])
+    _store_routes(key, mode, routes)
+    return routes
+
+
+def _store_routes(key: str, mode: str, routes: List[dict]) -> None:
+    if not routes:
+        _directions_cache.set_negative(key, routes)
+    elif mode in TIMED_MODES:
+        _directions_cache.set(
+            key, routes, env_float("LOCUS_DIRECTIONS_CACHE_TTL", 900)
+        )
+    else:
+        _directions_cache.set(key, routes)
+
+
+def _text(html: Optional[str]) -> Optional[str]:
+    if not html:
+        return html
+    return " ".join(_TAG.sub(" ", html).split())
+
+
+def _minutes(value: Optional[dict]) -> Optional[float]:
+    if not value or value.get("value") is None:
+        return None
+    return round(value["value"] / 60, 1)
+
+
+def _km(value: Optional[dict]) -> Optional[float]:
+    if not value or value.get("value") is None:
+        return None
+    return round(value["value"] / 1000, 2)
+
+
+def _transit_line(step: dict) -> dict:
+    details = step.get("transit_details", {})
+    line = details.get("line", {})
+    return {
+        "vehicle": line.get("vehicle", {}).get("type"),
+        "line": line.get("short_name") or line.get("name"),
+        "headsign": details.get("headsign"),
+        "from_stop": details.get("departure_stop", {}).get("name"),
+        "to_stop": details.get("arrival_stop", {}).get("name"),
+        "departs": details.get("departure_time", {}).get("text"),
+        "arrives": details.get("arrival_time", {}).get("text"),
+        "stops": details.get("num_stops"),
+    }
+
+
+def project_route(route: dict, include_steps: bool = False) -> dict:
+    """
+    Reduces one Directions API route to the fields the agents use.
+
+    Args:
+        route (dict): A raw route.
+        include_steps (bool, optional): Add plain-text turn-by-turn steps and
+            the encoded overview polyline. Defaults to False.
+
+    Returns:
+        dict: Summary, duration, distance, times, fare, transit lines,
+            transfers and walking minutes (plus "steps" and
+            "overview_polyline" on request).
+    """
+    legs = route.get("legs", [])
+    steps = [step for leg in legs for step in leg.get("steps", [])]
+    lines = [_transit_line(s) for s in steps if s.get("travel_mode") == "TRANSIT"]
+    durations = [leg.get("duration", {}).get("value") for leg in legs]
+    in_traffic = [leg.get("duration_in_traffic", {}).get("value") for leg in legs]
+    distances = [leg.get("distance", {}).get("value") for leg in legs]
+
+    def total(values: list) -> Optional[dict]:
+        return {"value": sum(values)} if values and None not in values else None
+
+    projected = {
+        "summary": route.get("summary") or None,
+        "duration_min": _minutes(total(durations)),
+        "distance_km": _km(total(distances)),
+        "departs": legs[0].get("departure_time", {}).get("text") if legs else None,
+        "arrives": legs[-1].get("arrival_time", {}).get("text") if legs else None,
+        "fare": route.get("fare", {}).get("text"),
+        "lines": lines,
+        "transfers": max(len(lines) - 1, 0),
+        "walking_min": round(
+            sum(
+                s.get("duration", {}).get("value", 0)
+                for s in steps
+                if s.get("travel_mode") == "WALKING"
+            )
+            / 60,
+            1,
+        ),
+        "warnings": route.get("warnings") or [],
+    }
+    if any(value is not None for value in in_traffic):
+        projected["duration_in_traffic_min"] = _minutes(total(in_traffic))
+    if include_steps:
+        projected["steps"] = [
+            {
+                "mode": step.get("travel_mode"),
+                "instruction": _text(step.get("html_instructions")),
+                "duration_min": _minutes(step.get("duration")),
+                "distance_km": _km(step.get("distance")),
+                **(
+                    {"line": _transit_line(step)["line"]}
+                    if step.get("travel_mode") == "TRANSIT"
+                    else {}
+                ),
+            }
+            for step in steps
+        ]
+        projected["overview_polyline"] = route.get("overview_polyline", {}).get(
+            "points"
+        )
+    return projected
+
+
+def project_routes(
+    routes: List[dict], mode: str, include_steps: bool = False
+) -> dict:
+    """
+    Builds a compact directions response from raw routes.
+
+    Args:
+        routes (list[dict]): Raw Directions API routes.
+        mode (str): The travel mode that was requested.
+        include_steps (bool, optional): See project_route().
+
+    Returns:
+        dict: "origin" and "destination" as resolved by the API, "mode" and
+            up to LOCUS_DIRECTIONS_MAX_ROUTES projected "routes".
+    """
+    legs = routes[0].get("legs", []) if routes else []
+    return {
+        "origin": legs[0].get("start_address") if legs else None,
+        "destination": legs[-1].get("end_address") if legs else None,
+        "mode": mode,
+        "routes": [
+            project_route(route, include_steps)
+            for route in routes[: env_int("LOCUS_DIRECTIONS_MAX_ROUTES", 3)]
+        ],
+    }
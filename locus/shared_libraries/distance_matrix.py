@@ -0,0 +1,230 @@
+"""
+Batched, cached travel-time matrices from the Distance Matrix API.
+
+A request may carry at most 25 origins, 25 destinations and 100 elements,
+so an n x n matrix is fetched as row strips: the destinations are split
+into chunks of up to 25, and each chunk of d destinations is paired with
+floor(100 / d) origins per request, concurrently at bulk priority. Every origin/destination pair is cached on
+its own under the same key scheme as directions (see directions.py), so a
+matrix that shares places with an earlier one only fetches the tiles that
+hold new pairs.
+"""
+
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Tuple
+import numpy as np
+from . import http_client, rate_limit
+from .cache import TwoTierCache
+from .directions import TIMED_MODES, directions_key
+from .env_config import env_bool, env_float, env_int
+from .http_client import get_gmaps_client
+
+# Limits of one Distance Matrix request.
+MAX_PLACES = 25
+MAX_ELEMENTS = 100
+
+_matrix_cache = TwoTierCache(
+    "distance_matrix",
+    ttl=env_float("LOCUS_DIRECTIONS_STATIC_TTL", 24 * 3600),
+    negative_ttl=env_float("LOCUS_DIRECTIONS_NEGATIVE_TTL", 300),
+    max_memory_entries=env_int("LOCUS_DISTANCE_MATRIX_CACHE_SIZE", 8192),
+    persistent=env_bool("LOCUS_CACHE_PERSIST", True),
+)
+
+
+def plan_matrix(
+    places: List[str], mode: str, departure_time: Optional[float]
+) -> Tuple[np.ndarray, np.ndarray, List[tuple]]:
+    """
+    Fills a matrix from the cache and lists the tiles still to fetch.
+
+    Args:
+        places (list[str]): The places, as origins and as destinations.
+        mode (str): Travel mode.
+        departure_time (float, optional): Unix departure time.
+
+    Returns:
+        tuple: (seconds, meters, tiles). The matrices are n x n floats with
+            NaN for pairs still missing and inf for unreachable pairs. Each
+            tile is a (row indices, column indices) pair.
+    """
+    n = len(places)
+    seconds = np.full((n, n), np.nan)
+    meters = np.full((n, n), np.nan)
+    np.fill_diagonal(seconds, 0.0)
+    np.fill_diagonal(meters, 0.0)
+    for i, origin in enumerate(places):
+        for j, destination in enumerate(places):
+            if i == j:
+                continue
+            cached = _matrix_cache.get(
+                directions_key(origin, destination, mode, departure_time)
+            )
+            if cached is not None:
+                seconds[i, j], meters[i, j] = _element_values(cached)
+
+    tiles = []
+    chunks = max(1, -(-n // MAX_PLACES))
+    for chunk in np.array_split(np.arange(n), chunks):
+        missing = np.isnan(seconds[:, chunk])
+        rows = np.flatnonzero(missing.any(axis=1))
+        if not len(rows):
+            continue
+        # Only the destinations that have a missing pair, with as many origins
+        # per request as the element limit allows.
+        cols = chunk[missing.any(axis=0)]
+        strip = min(MAX_PLACES, MAX_ELEMENTS // len(cols))
+        for start in range(0, len(rows), strip):
+            strip_rows = rows[start : start + strip]
+            block = np.isnan(seconds[np.ix_(strip_rows, cols)])
+            tiles.append((strip_rows.tolist(), cols[block.any(axis=0)].tolist()))
+    return seconds, meters, tiles
+
+
+def _element_values(element: dict) -> Tuple[float, float]:
+    """(seconds, meters) of a matrix element, inf if there is no route."""
+    if element.get("status") != "OK":
+        return np.inf, np.inf
+    duration = element.get("duration_in_traffic") or element.get("duration", {})
+    return (
+        float(duration.get("value", np.inf)),
+        float(element.get("distance", {}).get("value", np.inf)),
+    )
+
+
+def store_tile(
+    places: List[str],
+    tile: tuple,
+    response: dict,
+    mode: str,
+    departure_time: Optional[float],
+    seconds: np.ndarray,
+    meters: np.ndarray,
+) -> None:
+    """Caches a tile's elements and writes them into the matrices."""
+    rows, cols = tile
+    ttl = env_float("LOCUS_DIRECTIONS_CACHE_TTL", 900) if mode in TIMED_MODES else None
+    for i, row in zip(rows, response.get("rows", [])):
+        for j, element in zip(cols, row.get("elements", [])):
+            if i == j:
+                continue
+            element = {
+                key: element[key]
+                for key in ("status", "duration", "duration_in_traffic", "distance")
+                if key in element
+            }
+            key = directions_key(places[i], places[j], mode, departure_time)
+            if element.get("status") == "ZERO_RESULTS":
+                _matrix_cache.set_negative(key, element)
+            elif element.get("status") == "OK":
+                _matrix_cache.set(key, element, ttl)
+            seconds[i, j], meters[i, j] = _element_values(element)
+
+
+def tile_concurrency(tiles: List[tuple]) -> int:
+    """Number of tiles to fetch at once (LOCUS_DISTANCE_MATRIX_CONCURRENCY)."""
+    return max(1, min(env_int("LOCUS_DISTANCE_MATRIX_CONCURRENCY", 4), len(tiles)))
+
+
+def get_travel_matrix(
+    places: List[str],
+    api_key: str,
+    mode: str = "transit",
+    departure_time: Optional[float] = None,
+) -> dict:
+    """
+    Gets pairwise travel times and distances between places.
+
+    Args:
+        places (list[str]): Addresses or place names.
+        api_key (str): Google Maps API key.
+        mode (str, optional): Travel mode. Defaults to "transit".
+        departure_time (float, optional): Unix departure time for timed
+            modes. Defaults to now.
+
+    Returns:
+        dict: "seconds" and "meters" (n x n arrays, inf where there is no
+            route, NaN where a tile failed) and "requests" (the number of
+            API requests made).
+
+    Raises:
+        Exception: If every tile request fails.
+    """
+    seconds, meters, tiles = plan_matrix(places, mode, departure_time)
+    if not tiles:
+        return {"seconds": seconds, "meters": meters, "requests": 0}
+
+    gmaps = get_gmaps_client(api_key)
+    kwargs = {"mode": mode}
+    if mode in TIMED_MODES:
+        kwargs["departure_time"] = datetime.fromtimestamp(
+            departure_time or time.time()
+        )
+
+    def fetch(tile: tuple) -> dict:
+        rows, cols = tile
+        return gmaps.distance_matrix(
+            [places[i] for i in rows], [places[j] for j in cols], **kwargs
+        )
+
+    errors = []
+    with rate_limit.bulk(), ThreadPoolExecutor(
+        max_workers=tile_concurrency(tiles)
+    ) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch, tile)
+            for tile in tiles
+        ]
+        for tile, future in zip(tiles, futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            store_tile(places, tile, response, mode, departure_time, seconds, meters)
+    if errors and len(errors) == len(tiles):
+        raise errors[0]
+    return {"seconds": seconds, "meters": meters, "requests": len(tiles)}
+
+
+async def get_travel_matrix_async(
+    places: List[str],
+    api_key: str,
+    mode: str = "transit",
+    departure_time: Optional[float] = None,
+) -> dict:
+    """Async variant of get_travel_matrix(); see it for details."""
+    seconds, meters, tiles = plan_matrix(places, mode, departure_time)
+    if not tiles:
+        return {"seconds": seconds, "meters": meters, "requests": 0}
+
+    base = {"mode": mode}
+    if mode in TIMED_MODES:
+        base["departure_time"] = int(departure_time or time.time())
+    semaphore = asyncio.Semaphore(tile_concurrency(tiles))
+
+    async def fetch(tile: tuple) -> dict:
+        rows, cols = tile
+        params = {
+            **base,
+            "origins": "|".join(places[i] for i in rows),
+            "destinations": "|".join(places[j] for j in cols),
+        }
+        async with semaphore:
+            return await http_client.amaps_get("distancematrix", params, api_key)
+
+    with rate_limit.bulk():
+        responses = await asyncio.gather(
+            *(fetch(tile) for tile in tiles), return_exceptions=True
+        )
+    errors = [r for r in responses if isinstance(r, Exception)]
+    for tile, response in zip(tiles, responses):
+        if not isinstance(response, Exception):
+            store_tile(places, tile, response, mode, departure_time, seconds, meters)
+    if errors and len(errors) == len(tiles):
+        raise errors[0]
+    return {"seconds": seconds, "meters": meters, "requests": len(tiles)}
@@ -0,0 +1,25 @@
+import os
+
+
+def env_float(name: str, default: float) -> float:
+    """Reads a float setting from the environment, falling back to default."""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    """Reads an int setting from the environment, falling back to default."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Reads a boolean setting ("1", "true", "yes", "on") from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
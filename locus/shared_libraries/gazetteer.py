@@ -0,0 +1,287 @@
+"""
+Offline gazetteer of popular destinations.
+
+The bundled data/gazetteer.csv (major cities, countries and landmarks) is
+compiled once into column arrays under the cache directory and then opened
+memory-mapped, so every worker on a host shares a single copy of the data.
+Lookup keys are stored as a sorted byte array, which doubles as a prefix
+index: exact matches and prefix scans are both binary searches.
+"""
+
+import csv
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from typing import List, Optional
+import numpy as np
+from .cache import get_cache_dir, normalize_location_key
+from .env_config import env_bool
+
+SOURCE_PATH = os.path.join(os.path.dirname(__file__), "data", "gazetteer.csv")
+KINDS = ("city", "country", "landmark")
+
+_COLUMNS = (
+    "lat",
+    "lng",
+    "country",
+    "kind",
+    "name_offsets",
+    "names",
+    "address_offsets",
+    "addresses",
+    "key_offsets",
+    "keys",
+    "key_rows",
+)
+
+_lock = threading.Lock()
+_gazetteer = None
+_load_failed = False
+
+
+def _entry_keys(name: str, formatted_address: str, aliases: List[str]) -> List[str]:
+    """Builds the normalized lookup keys for one gazetteer entry."""
+    parts = [p.strip() for p in formatted_address.split(",") if p.strip()]
+    candidates = [name, formatted_address] + aliases
+    # "San Francisco, CA" and "San Francisco, CA, USA" for "San Francisco, CA, USA"
+    candidates += [", ".join(parts[:i]) for i in range(2, len(parts))]
+    if len(parts) > 1:
+        candidates.append(f"{name}, {parts[-1]}")
+    keys = []
+    for candidate in candidates:
+        key = normalize_location_key(candidate)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _string_column(values: List[str]) -> tuple:
+    """Packs strings into (offsets, utf-8 byte blob) arrays."""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, blob
+
+
+def _source_digest(source: str) -> str:
+    with open(source, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def build_gazetteer(source: str = SOURCE_PATH, directory: Optional[str] = None) -> str:
+    """
+    Compiles the gazetteer CSV into memory-mappable column arrays.
+
+    The output directory name includes a digest of the source, so edited data
+    is rebuilt automatically and concurrent builders never clobber each other.
+
+    Args:
+        source (str): Path to the gazetteer CSV.
+        directory (str, optional): Parent directory for the compiled arrays.
+            Defaults to the cache directory.
+
+    Returns:
+        str: Path of the directory holding the compiled .npy columns.
+    """
+    directory = directory or get_cache_dir()
+    target = os.path.join(directory, f"gazetteer-{_source_digest(source)}")
+    if os.path.isdir(target):
+        return target
+
+    names, addresses, lats, lngs, countries, kinds = [], [], [], [], [], []
+    key_rows = {}
+    with open(source, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            index = len(names)
+            names.append(row["name"])
+            addresses.append(row["formatted_address"])
+            lats.append(float(row["lat"]))
+            lngs.append(float(row["lng"]))
+            countries.append(row["country_code"])
+            kinds.append(KINDS.index(row["kind"]))
+            aliases = [a for a in (row.get("aliases") or "").split("|") if a]
+            for key in _entry_keys(row["name"], row["formatted_address"], aliases):
+                # Earlier rows win, so the CSV order sets priority on clashes.
+                key_rows.setdefault(key.encode("utf-8"), index)
+
+    sorted_keys = sorted(key_rows)
+    name_offsets, name_blob = _string_column(names)
+    address_offsets, address_blob = _string_column(addresses)
+    key_offsets, key_blob = _string_column([k.decode("utf-8") for k in sorted_keys])
+    columns = {
+        "lat": np.array(lats, dtype=np.float64),
+        "lng": np.array(lngs, dtype=np.float64),
+        "country": np.array(countries, dtype="S2"),
+        "kind": np.array(kinds, dtype=np.uint8),
+        "name_offsets": name_offsets,
+        "names": name_blob,
+        "address_offsets": address_offsets,
+        "addresses": address_blob,
+        "key_offsets": key_offsets,
+        "keys": key_blob,
+        "key_rows": np.array([key_rows[k] for k in sorted_keys], dtype=np.int32),
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".gazetteer-", dir=directory)
+    try:
+        for column, values in columns.items():
+            np.save(os.path.join(staging, f"{column}.npy"), values)
+        os.rename(staging, target)
+    except OSError:
+        # Another worker finished the same build first.
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(target):
+            raise
+    return target
+
+
+class Gazetteer:
+    """Read-only, memory-mapped view of a compiled gazetteer."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        for column in _COLUMNS:
+            path = os.path.join(directory, f"{column}.npy")
+            # Plain ndarray views over the mapping avoid np.memmap's per-slice
+            # overhead while still sharing the pages between processes.
+            setattr(self, column, np.load(path, mmap_mode="r").view(np.ndarray))
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def _key(self, i: int) -> bytes:
+        return self.keys[self.key_offsets[i] : self.key_offsets[i + 1]].tobytes()
+
+    def _lower_bound(self, target: bytes) -> int:
+        lo, hi = 0, len(self.key_rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _string(self, offsets, blob, row: int) -> str:
+        return blob[offsets[row] : offsets[row + 1]].tobytes().decode("utf-8")
+
+    def address(self, row: int) -> str:
+        """Returns the formatted address of a row."""
+        return self._string(self.address_offsets, self.addresses, row)
+
+    def entry(self, row: int) -> dict:
+        """
+        Gets one gazetteer row.
+
+        Args:
+            row (int): Row index.
+
+        Returns:
+            dict: name, formatted_address, lat, lng, country_code and kind.
+        """
+        return {
+            "name": self._string(self.name_offsets, self.names, row),
+            "formatted_address": self.address(row),
+            "lat": float(self.lat[row]),
+            "lng": float(self.lng[row]),
+            "country_code": self.country[row].decode("ascii"),
+            "kind": KINDS[int(self.kind[row])],
+        }
+
+    def find_row(self, location: str) -> Optional[int]:
+        """Returns the row for an exact (normalized) match, or None."""
+        target = normalize_location_key(location).encode("utf-8")
+        if not target:
+            return None
+        i = self._lower_bound(target)
+        if i < len(self.key_rows) and self._key(i) == target:
+            return int(self.key_rows[i])
+        return None
+
+    def lookup(self, location: str) -> Optional[dict]:
+        """
+        Looks up a location by exact normalized name, alias or address.
+
+        Args:
+            location (str): The location string (e.g., "Paris, France").
+
+        Returns:
+            dict: The matching entry (see entry()), or None.
+        """
+        row = self.find_row(location)
+        return self.entry(row) if row is not None else None
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Finds entries with a lookup key starting with prefix.
+
+        Args:
+            prefix (str): The typed prefix (e.g., "san fr").
+            limit (int): Maximum number of distinct entries to return.
+
+        Returns:
+            list[dict]: Matching entries in key order.
+        """
+        target = normalize_location_key(prefix).encode("utf-8")
+        if not target:
+            return []
+        results, seen = [], set()
+        i = self._lower_bound(target)
+        while i < len(self.key_rows) and len(results) < limit:
+            if not self._key(i).startswith(target):
+                break
+            row = int(self.key_rows[i])
+            if row not in seen:
+                seen.add(row)
+                results.append(self.entry(row))
+            i += 1
+        return results
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    Gets the shared gazetteer, compiling it on first use if needed.
+
+    Returns:
+        Gazetteer: The memory-mapped gazetteer, or None when disabled via
+            LOCUS_GAZETTEER_ENABLED=0 or when it cannot be built.
+    """
+    global _gazetteer, _load_failed
+    if _gazetteer is None and not _load_failed:
+        if not env_bool("LOCUS_GAZETTEER_ENABLED", True):
+            return None
+        with _lock:
+            if _gazetteer is None and not _load_failed:
+                try:
+                    _gazetteer = Gazetteer(build_gazetteer())
+                except (OSError, ValueError, KeyError):
+                    _load_failed = True
+    return _gazetteer
+
+
+def lookup_location(location: str) -> Optional[dict]:
+    """
+    Resolves a location from the offline gazetteer.
+
+    Args:
+        location (str): The location string to resolve.
+
+    Returns:
+        dict: {"lat", "lng", "formatted_address"} in the same shape as
+            geocode_location(), or None if the location is not bundled.
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+    row = gazetteer.find_row(location)
+    if row is None:
+        return None
+    return {
+        "lat": float(gazetteer.lat[row]),
+        "lng": float(gazetteer.lng[row]),
+        "formatted_address": gazetteer.address(row),
+    }
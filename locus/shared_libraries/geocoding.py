@@ -1,11 +1,40 @@
+import asyncio
+import contextvars
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from . import http_client, rate_limit
+from .cache import TwoTierCache, normalize_location_key
+from .env_config import env_bool, env_float, env_int
+from .gazetteer import lookup_location
+from .singleflight import upstream_flight
+
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+# Geocodes rarely change, so results are kept for a long time. "Not found"
+# results are cached too, but for much shorter in case of transient gaps.
+_geocode_cache = TwoTierCache(
+    "geocode",
+    ttl=env_float("LOCUS_GEOCODE_CACHE_TTL", 30 * 24 * 3600),
+    negative_ttl=env_float("LOCUS_GEOCODE_NEGATIVE_TTL", 24 * 3600),
+    max_memory_entries=env_int("LOCUS_GEOCODE_CACHE_SIZE", 2048),
+    max_disk_entries=env_int("LOCUS_GEOCODE_DISK_CACHE_SIZE", 100_000),
+    persistent=env_bool("LOCUS_CACHE_PERSIST", True),
+)
+# Stored for a location the API does not know. It leaves the spelling out,
+# since every spelling with the same normalized key shares the entry.
+_NOT_FOUND = {"not_found": True}
 
 
 def geocode_location(location: str) -> dict:
     """
     Geocodes a location string to latitude and longitude coordinates.
 
+    Popular destinations are resolved from the offline gazetteer without a
+    network call. Other results are cached by normalized location string
+    (case, whitespace and punctuation are ignored), including "Could not
+    find location" results.
+
     Args:
         location (str): The location string to geocode (e.g., "New York, NY" or "Paris, France").
 
@@ -21,31 +50,240 @@ def geocode_location(location: str) -> dict:
         >>> print(result)
         {"lat": 37.3900264, "lng": -122.0812304, "formatted_address": "Mountain View, CA, USA"}
     """
+    return _spelled(_geocode(location), location)
+
+
+def _geocode(location: str) -> dict:
+    """geocode_location() with misses left as the shared _NOT_FOUND marker."""
+    cache_key = normalize_location_key(location)
+    known = _lookup_known(location, cache_key)
+    if known is not None:
+        return known
+
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
 
     if not api_key:
         return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
 
-    try:
-        geocode_url = "https://maps.googleapis.com/maps/api/geocode/json"
-        geocode_params = {"address": location, "key": api_key}
+    # Concurrent lookups for the same place share a single upstream request.
+    flight_key = ("geocode", cache_key or location)
+    return upstream_flight.do(
+        flight_key, _fetch_geocode, location, api_key, cache_key
+    )
+
+
+def geocode_locations(
+    locations: List[str], max_concurrency: Optional[int] = None
+) -> List[dict]:
+    """
+    Geocodes several location strings at once.
+
+    Inputs are deduplicated by normalized location string, gazetteer and
+    cached entries are served directly, and the remaining lookups run
+    concurrently.
+
+    Args:
+        locations (list[str]): The location strings to geocode.
+        max_concurrency (int, optional): Maximum concurrent upstream lookups.
+            Defaults to LOCUS_GEOCODE_BATCH_CONCURRENCY (8).
+
+    Returns:
+        list[dict]: One geocode_location() result per input, in input order.
+            A failed lookup yields an {"error": ...} entry without affecting
+            the others.
+    """
+    unique, resolved, pending = _plan_batch(locations)
+
+    if pending:
+        if max_concurrency is None:
+            max_concurrency = env_int("LOCUS_GEOCODE_BATCH_CONCURRENCY", 8)
+        workers = max(1, min(max_concurrency, len(pending)))
+        # Batch lookups run at bulk priority so they can't starve interactive
+        # calls. Each worker runs in a copy of the caller's context, so the
+        # priority and the caller's request deadline apply to it too.
+        with rate_limit.bulk(), ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(
+                    contextvars.copy_context().run, _geocode, location
+                )
+                for key, location in pending
+            }
+            for key, future in futures.items():
+                try:
+                    resolved[key] = future.result()
+                except Exception as e:
+                    resolved[key] = {
+                        "error": f"Failed to geocode location '{unique[key]}': {str(e)}"
+                    }
+
+    return _batch_results(locations, resolved)
+
+
+async def geocode_location_async(location: str) -> dict:
+    """Async variant of geocode_location(); see it for details."""
+    return _spelled(await _geocode_async(location), location)
+
+
+async def _geocode_async(location: str) -> dict:
+    """Async variant of _geocode()."""
+    cache_key = normalize_location_key(location)
+    known = _lookup_known(location, cache_key)
+    if known is not None:
+        return known
+
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    flight_key = ("geocode", cache_key or location)
+    return await upstream_flight.do_async(
+        flight_key, _fetch_geocode_async, location, api_key, cache_key
+    )
+
+
+async def geocode_locations_async(
+    locations: List[str], max_concurrency: Optional[int] = None
+) -> List[dict]:
+    """Async variant of geocode_locations(); see it for details."""
+    unique, resolved, pending = _plan_batch(locations)
+
+    if pending:
+        if max_concurrency is None:
+            max_concurrency = env_int("LOCUS_GEOCODE_BATCH_CONCURRENCY", 8)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def resolve(location: str) -> dict:
+            async with semaphore:
+                return await _geocode_async(location)
+
+        with rate_limit.bulk():
+            results = await asyncio.gather(
+                *(resolve(location) for _, location in pending),
+                return_exceptions=True,
+            )
+        for (key, location), result in zip(pending, results):
+            if isinstance(result, Exception):
+                result = {
+                    "error": f"Failed to geocode location '{location}': {str(result)}"
+                }
+            resolved[key] = result
+
+    return _batch_results(locations, resolved)
 
-        geocode_response = requests.get(geocode_url, params=geocode_params)
+
+def lookup_known_location(location: str) -> Optional[dict]:
+    """
+    Resolves a location from the gazetteer or the geocode cache only.
+
+    Args:
+        location (str): The location string.
+
+    Returns:
+        dict: A geocode_location() result (possibly a cached "error"), or
+            None if resolving it would take a network call.
+    """
+    known = _lookup_known(location, normalize_location_key(location))
+    return None if known is None else _spelled(known, location)
+
+
+def _lookup_known(location: str, cache_key: str) -> Optional[dict]:
+    """Resolves a location from the gazetteer or the cache, without the network."""
+    offline = lookup_location(location)
+    if offline is not None:
+        return offline
+    if cache_key:
+        cached = _geocode_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+    return None
+
+
+def _spelled(result: dict, location: str) -> dict:
+    """A copy of a lookup result, with a miss worded for this spelling."""
+    if result.get("not_found"):
+        return {"error": f"Could not find location: {location}"}
+    return dict(result)
+
+
+def _plan_batch(locations: List[str]) -> tuple:
+    """Deduplicates a batch and splits it into resolved and pending lookups."""
+    # Map each distinct normalized key to the first spelling that used it.
+    unique = {}
+    for location in locations:
+        unique.setdefault(normalize_location_key(location) or location, location)
+
+    resolved = {}
+    pending = []
+    for key, location in unique.items():
+        known = _lookup_known(location, normalize_location_key(location))
+        if known is not None:
+            resolved[key] = known
+        else:
+            pending.append((key, location))
+    return unique, resolved, pending
+
+
+def _batch_results(locations: List[str], resolved: dict) -> List[dict]:
+    return [
+        _spelled(resolved[normalize_location_key(location) or location], location)
+        for location in locations
+    ]
+
+
+def _fetch_geocode(location: str, api_key: str, cache_key: str) -> dict:
+    """Calls the Geocoding API for a location and caches the outcome."""
+    try:
+        geocode_response = http_client.get(
+            GEOCODE_URL, params={"address": location, "key": api_key}
+        )
         geocode_response.raise_for_status()
-        geocode_data = geocode_response.json()
+        return _store_geocode_response(geocode_response.json(), location, cache_key)
 
-        if not geocode_data.get("results"):
-            return {"error": f"Could not find location: {location}"}
+    except Exception as e:
+        return {"error": f"Failed to geocode location '{location}': {str(e)}"}
 
-        # Get the first result
-        result = geocode_data["results"][0]
-        location_data = result["geometry"]["location"]
 
-        return {
-            "lat": location_data["lat"],
-            "lng": location_data["lng"],
-            "formatted_address": result.get("formatted_address", location),
-        }
+async def _fetch_geocode_async(location: str, api_key: str, cache_key: str) -> dict:
+    """Async variant of _fetch_geocode()."""
+    try:
+        geocode_response = await http_client.aget(
+            GEOCODE_URL, params={"address": location, "key": api_key}
+        )
+        geocode_response.raise_for_status()
+        return _store_geocode_response(geocode_response.json(), location, cache_key)
 
     except Exception as e:
         return {"error": f"Failed to geocode location '{location}': {str(e)}"}
+
+
+def _store_geocode_response(geocode_data: dict, location: str, cache_key: str) -> dict:
+    """Parses a Geocoding API response and caches the outcome."""
+    if not geocode_data.get("results"):
+        # Only ZERO_RESULTS is a definitive miss; anything else may be transient.
+        if cache_key and geocode_data.get("status") == "ZERO_RESULTS":
+            _geocode_cache.set_negative(cache_key, _NOT_FOUND)
+        return _NOT_FOUND
+
+    # Get the first result
+    result = geocode_data["results"][0]
+    location_data = result["geometry"]["location"]
+
+    geocoded = {
+        "lat": location_data["lat"],
+        "lng": location_data["lng"],
+        "formatted_address": result.get("formatted_address", location),
+    }
+    if cache_key:
+        _geocode_cache.set(cache_key, geocoded)
+    return geocoded
+
+
+def get_geocode_cache_stats() -> dict:
+    """
+    Gets hit/miss statistics for the geocoding cache.
+
+    Returns:
+        dict: Memory/disk hit counts, misses, negative hits, hit rate and sizes.
+    """
+    return _geocode_cache.stats()
@@ -0,0 +1,653 @@
+"""
+Offline GTFS timetables for local transit routing.
+
+Transit feeds downloaded ahead of time (LOCUS_GTFS_FEEDS, GTFS .zip files)
+are compiled once into column arrays under the cache directory and then
+opened memory-mapped, like the gazetteer, so every worker on a host shares
+one copy. Journeys are planned over them by raptor.py.
+
+Trips that visit the same stops in the same order on the same route are
+grouped into patterns, and each pattern's stop times are stored as a
+(trips, stops) block sorted by departure, so finding the first catchable
+trip at every stop of a pattern is a single comparison over the block.
+Trips that would overtake one another get patterns of their own.
+
+Compiling a feed takes far longer than a request may, so feeds are loaded
+in a background thread started at agent startup, and transit requests fall
+back to the Directions API until it finishes. To compile ahead of time, run:
+
+    python -m locus.shared_libraries.gtfs feed.zip [feed.zip ...]
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from .cache import get_cache_dir
+from .env_config import env_float
+from .polyline import EARTH_RADIUS_M
+from .station_index import _distances
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 3600
+WALK_SPEED_MPS = 1.3
+# GTFS route_type -> vehicle type, named as in Directions API results.
+VEHICLES = {
+    0: "TRAM",
+    1: "SUBWAY",
+    2: "HEAVY_RAIL",
+    3: "BUS",
+    4: "FERRY",
+    5: "CABLE_CAR",
+    6: "GONDOLA_LIFT",
+    7: "FUNICULAR",
+    11: "TROLLEYBUS",
+    12: "MONORAIL",
+}
+# Extended route types (e.g. 700 bus, 900 tram), by hundreds.
+EXTENDED_VEHICLES = {
+    1: "HEAVY_RAIL",
+    2: "BUS",
+    4: "SUBWAY",
+    7: "BUS",
+    8: "TROLLEYBUS",
+    9: "TRAM",
+    10: "FERRY",
+    13: "GONDOLA_LIFT",
+    14: "FUNICULAR",
+}
+
+_COLUMNS = (
+    "stop_lat",
+    "stop_lng",
+    "stop_lat_order",
+    "stop_name_offsets",
+    "stop_names",
+    "route_type",
+    "route_name_offsets",
+    "route_names",
+    "pattern_route",
+    "pattern_stop_offsets",
+    "pattern_stops",
+    "pattern_trip_offsets",
+    "pattern_time_offsets",
+    "pattern_max_time",
+    "arrivals",
+    "departures",
+    "trip_service",
+    "trip_headsign_offsets",
+    "trip_headsigns",
+    "stop_pattern_offsets",
+    "stop_patterns",
+    "stop_positions",
+    "transfer_offsets",
+    "transfer_stops",
+    "transfer_seconds",
+    "service_weekdays",
+    "service_start",
+    "service_end",
+    "exception_service",
+    "exception_date",
+    "exception_type",
+    "timezone",
+    "bounds",
+)
+# Part of the compiled directory name; bumped whenever the columns change so
+# older builds are recompiled instead of failing to open.
+FORMAT_VERSION = 2
+
+_lock = threading.Lock()
+_timetables = None
+_loader = None
+
+
+def _string_column(values: List[str]) -> tuple:
+    """Packs strings into (offsets, utf-8 byte blob) arrays."""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, blob
+
+
+def _csr(groups: List[List[int]], dtype=np.int32) -> tuple:
+    """Packs lists of ints into (offsets, values) arrays."""
+    offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(g) for g in groups])
+    values = np.array([v for g in groups for v in g], dtype=dtype)
+    return offsets, values
+
+
+def _rows(feed: zipfile.ZipFile, name: str) -> Iterator[dict]:
+    """Yields the rows of a feed file, or nothing if the file is absent."""
+    if name not in feed.namelist():
+        return
+    with feed.open(name) as f:
+        for row in csv.DictReader(io.TextIOWrapper(f, encoding="utf-8-sig")):
+            yield {k.strip(): (v or "").strip() for k, v in row.items() if k}
+
+
+def _seconds(value: str) -> float:
+    """Parses a GTFS time (H:MM:SS, may exceed 24:00:00); NaN if empty."""
+    if not value:
+        return np.nan
+    hours, minutes, seconds = value.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _gtfs_date(value: str) -> int:
+    return int(value) if value else 0
+
+
+def _read_stop_times(feed: zipfile.ZipFile, trip_index: Dict[str, int], stop_index):
+    """
+    Reads stop_times.txt into per-trip (sequence, stop, arrival, departure).
+
+    Uses a plain csv reader, since this is by far the largest file.
+    """
+    trips = {}
+    with feed.open("stop_times.txt") as f:
+        reader = csv.reader(io.TextIOWrapper(f, encoding="utf-8-sig"))
+        header = [column.strip() for column in next(reader)]
+        trip_col, stop_col = header.index("trip_id"), header.index("stop_id")
+        seq_col = header.index("stop_sequence")
+        arr_col, dep_col = header.index("arrival_time"), header.index("departure_time")
+        for row in reader:
+            trip = trip_index.get(row[trip_col].strip())
+            stop = stop_index.get(row[stop_col].strip())
+            if trip is None or stop is None:
+                continue
+            arrival = _seconds(row[arr_col].strip())
+            departure = _seconds(row[dep_col].strip())
+            trips.setdefault(trip, []).append(
+                (
+                    int(row[seq_col]),
+                    stop,
+                    departure if np.isnan(arrival) else arrival,
+                    arrival if np.isnan(departure) else departure,
+                )
+            )
+    return trips
+
+
+def _trip_times(rows: list) -> Optional[Tuple[tuple, np.ndarray, np.ndarray]]:
+    """
+    Orders a trip's stop times and fills in untimed stops.
+
+    Returns:
+        tuple: (stop indices, arrivals, departures), or None if the trip has
+            fewer than two stops or two timed stops.
+    """
+    rows.sort()
+    stops = tuple(row[1] for row in rows)
+    arrivals = np.array([row[2] for row in rows], dtype=float)
+    departures = np.array([row[3] for row in rows], dtype=float)
+    timed = ~np.isnan(arrivals)
+    if len(rows) < 2 or timed.sum() < 2:
+        return None
+    # Untimed stops are interpolated by position between the timed ones.
+    positions = np.arange(len(rows))
+    arrivals = np.interp(positions, positions[timed], arrivals[timed])
+    departures = np.interp(positions, positions[timed], departures[timed])
+    return stops, arrivals, np.maximum(departures, arrivals)
+
+
+def _group_patterns(trips: Dict[int, tuple], trip_route: List[int]) -> List[dict]:
+    """
+    Groups trips into patterns whose trips never overtake one another.
+
+    Returns:
+        list[dict]: Patterns with "route", "stops" and "trips" (trip
+            indices sorted by departure).
+    """
+    groups = {}
+    for trip, (stops, arrivals, departures) in trips.items():
+        groups.setdefault((trip_route[trip], stops), []).append(trip)
+    patterns = []
+    for (route, stops), members in groups.items():
+        members.sort(key=lambda t: trips[t][2][0])
+        lanes = []
+        for trip in members:
+            _, arrivals, departures = trips[trip]
+            for lane in lanes:
+                _, last_arrivals, last_departures = trips[lane[-1]]
+                if (departures >= last_departures).all() and (
+                    arrivals >= last_arrivals
+                ).all():
+                    lane.append(trip)
+                    break
+            else:
+                lanes.append([trip])
+        patterns += [{"route": route, "stops": stops, "trips": lane} for lane in lanes]
+    return patterns
+
+
+def _transfers(lats: np.ndarray, lngs: np.ndarray, radius: float) -> tuple:
+    """
+    Walking transfers between stops within radius meters of each other.
+
+    Returns:
+        tuple: (offsets, stops, seconds) arrays, grouped by origin stop.
+    """
+    order = np.argsort(lats, kind="stable")
+    sorted_lats = lats[order]
+    band = np.degrees(radius / EARTH_RADIUS_M)
+    targets, seconds = [], []
+    for stop in range(len(lats)):
+        lo, hi = np.searchsorted(sorted_lats, [lats[stop] - band, lats[stop] + band])
+        near = order[lo:hi]
+        near = near[near != stop]
+        meters = _distances(lats[stop], lngs[stop], lats[near], lngs[near])
+        keep = meters <= radius
+        targets.append(near[keep].tolist())
+        seconds.append(np.ceil(meters[keep] / WALK_SPEED_MPS).astype(int).tolist())
+    offsets, stops = _csr(targets)
+    return offsets, stops, _csr(seconds)[1]
+
+
+def _feed_digest(source: str) -> str:
+    digest = hashlib.sha1()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def build_timetable(source: str, directory: Optional[str] = None) -> str:
+    """
+    Compiles a GTFS feed into memory-mappable column arrays.
+
+    The output directory name includes a digest of the feed and the
+    transfer radius, so an updated feed is rebuilt automatically and
+    concurrent builders never clobber each other.
+
+    Args:
+        source (str): Path to the GTFS .zip file.
+        directory (str, optional): Parent directory for the compiled arrays.
+            Defaults to the cache directory.
+
+    Returns:
+        str: Path of the directory holding the compiled .npy columns.
+
+    Raises:
+        KeyError: If a required file or column is missing from the feed.
+    """
+    radius = env_float("LOCUS_GTFS_TRANSFER_RADIUS_M", 250)
+    directory = directory or get_cache_dir()
+    target = os.path.join(
+        directory, f"gtfs-{_feed_digest(source)}-{int(radius)}-v{FORMAT_VERSION}"
+    )
+    if os.path.isdir(target):
+        return target
+
+    with zipfile.ZipFile(source) as feed:
+        missing = {"stops.txt", "routes.txt", "trips.txt", "stop_times.txt"} - set(
+            feed.namelist()
+        )
+        if missing:
+            raise KeyError(f"{source} is missing {sorted(missing)}")
+
+        timezone = next(
+            (row.get("agency_timezone") for row in _rows(feed, "agency.txt")), None
+        )
+        stop_index, stop_names, lats, lngs = {}, [], [], []
+        for row in _rows(feed, "stops.txt"):
+            # Stations and entrances are not served by trips.
+            if row.get("location_type", "") not in ("", "0"):
+                continue
+            try:
+                lat, lng = float(row["stop_lat"]), float(row["stop_lon"])
+            except (KeyError, ValueError):
+                continue
+            stop_index[row["stop_id"]] = len(stop_names)
+            stop_names.append(row.get("stop_name") or row["stop_id"])
+            lats.append(lat)
+            lngs.append(lng)
+
+        route_index, route_names, route_types = {}, [], []
+        for row in _rows(feed, "routes.txt"):
+            route_index[row["route_id"]] = len(route_names)
+            route_names.append(
+                row.get("route_short_name") or row.get("route_long_name") or ""
+            )
+            route_types.append(int(row.get("route_type") or 3))
+
+        service_index = {}
+        weekdays, starts, ends = [], [], []
+        days = ("monday", "tuesday", "wednesday", "thursday", "friday")
+        days += ("saturday", "sunday")
+        for row in _rows(feed, "calendar.txt"):
+            service_index[row["service_id"]] = len(weekdays)
+            weekdays.append([row.get(day) == "1" for day in days])
+            starts.append(_gtfs_date(row.get("start_date")))
+            ends.append(_gtfs_date(row.get("end_date")))
+        exceptions = []
+        for row in _rows(feed, "calendar_dates.txt"):
+            if row["service_id"] not in service_index:
+                # Services defined by exceptions alone run on no weekday.
+                service_index[row["service_id"]] = len(weekdays)
+                weekdays.append([False] * 7)
+                starts.append(0)
+                ends.append(0)
+            exceptions.append(
+                (
+                    service_index[row["service_id"]],
+                    _gtfs_date(row["date"]),
+                    int(row["exception_type"]),
+                )
+            )
+
+        trip_index, trip_route, trip_service, trip_headsign = {}, [], [], []
+        for row in _rows(feed, "trips.txt"):
+            route = route_index.get(row["route_id"])
+            service = service_index.get(row["service_id"])
+            if route is None or service is None:
+                continue
+            trip_index[row["trip_id"]] = len(trip_route)
+            trip_route.append(route)
+            trip_service.append(service)
+            trip_headsign.append(row.get("trip_headsign", ""))
+
+        trips = {}
+        for trip, rows in _read_stop_times(feed, trip_index, stop_index).items():
+            times = _trip_times(rows)
+            if times is not None:
+                trips[trip] = times
+
+    patterns = _group_patterns(trips, trip_route)
+    trip_order = [trip for pattern in patterns for trip in pattern["trips"]]
+    arrivals = [
+        np.concatenate([trips[t][1] for t in p["trips"]]) for p in patterns
+    ]
+    departures = [
+        np.concatenate([trips[t][2] for t in p["trips"]]) for p in patterns
+    ]
+    stop_patterns = [[] for _ in stop_names]
+    stop_positions = [[] for _ in stop_names]
+    for index, pattern in enumerate(patterns):
+        for position, stop in enumerate(pattern["stops"]):
+            stop_patterns[stop].append(index)
+            stop_positions[stop].append(position)
+
+    lats, lngs = np.array(lats, dtype=np.float64), np.array(lngs, dtype=np.float64)
+    stop_name_offsets, stop_name_blob = _string_column(stop_names)
+    route_name_offsets, route_name_blob = _string_column(route_names)
+    headsign_offsets, headsign_blob = _string_column(
+        [trip_headsign[t] for t in trip_order]
+    )
+    pattern_stop_offsets, pattern_stops = _csr([p["stops"] for p in patterns])
+    pattern_trip_offsets = _csr([p["trips"] for p in patterns])[0]
+    pattern_time_offsets = np.zeros(len(patterns) + 1, dtype=np.int64)
+    pattern_time_offsets[1:] = np.cumsum([len(a) for a in arrivals])
+    stop_pattern_offsets, stop_pattern_values = _csr(stop_patterns)
+    transfer_offsets, transfer_stops, transfer_seconds = _transfers(
+        lats, lngs, radius
+    )
+    exception_array = np.array(exceptions, dtype=np.int64).reshape(-1, 3)
+    columns = {
+        "stop_lat": lats,
+        "stop_lng": lngs,
+        "stop_lat_order": np.argsort(lats, kind="stable").astype(np.int32),
+        "stop_name_offsets": stop_name_offsets,
+        "stop_names": stop_name_blob,
+        "route_type": np.array(route_types, dtype=np.int16),
+        "route_name_offsets": route_name_offsets,
+        "route_names": route_name_blob,
+        "pattern_route": np.array([p["route"] for p in patterns], dtype=np.int32),
+        "pattern_stop_offsets": pattern_stop_offsets,
+        "pattern_stops": pattern_stops,
+        "pattern_trip_offsets": pattern_trip_offsets,
+        "pattern_time_offsets": pattern_time_offsets,
+        "pattern_max_time": np.array(
+            [a.max() for a in arrivals], dtype=np.int32
+        ),
+        "arrivals": np.concatenate(arrivals or [[]]).round().astype(np.int32),
+        "departures": np.concatenate(departures or [[]]).round().astype(np.int32),
+        "trip_service": np.array(
+            [trip_service[t] for t in trip_order], dtype=np.int32
+        ),
+        "trip_headsign_offsets": headsign_offsets,
+        "trip_headsigns": headsign_blob,
+        "stop_pattern_offsets": stop_pattern_offsets,
+        "stop_patterns": stop_pattern_values,
+        "stop_positions": _csr(stop_positions)[1],
+        "transfer_offsets": transfer_offsets,
+        "transfer_stops": transfer_stops,
+        "transfer_seconds": transfer_seconds,
+        "service_weekdays": np.array(weekdays, dtype=bool).reshape(-1, 7),
+        "service_start": np.array(starts, dtype=np.int32),
+        "service_end": np.array(ends, dtype=np.int32),
+        "exception_service": exception_array[:, 0].astype(np.int32),
+        "exception_date": exception_array[:, 1].astype(np.int32),
+        "exception_type": exception_array[:, 2].astype(np.int8),
+        "timezone": np.array([(timezone or "UTC").encode("utf-8")]),
+        # [[min lat, min lng], [max lat, max lng]] of the stops, NaN if none.
+        "bounds": np.array(
+            [
+                [lats.min(), lngs.min()] if len(lats) else [np.nan, np.nan],
+                [lats.max(), lngs.max()] if len(lats) else [np.nan, np.nan],
+            ]
+        ),
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".gtfs-", dir=directory)
+    try:
+        for column, values in columns.items():
+            np.save(os.path.join(staging, f"{column}.npy"), values)
+        os.rename(staging, target)
+    except OSError:
+        # Another worker finished the same build first.
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(target):
+            raise
+    return target
+
+
+class Timetable:
+    """Read-only, memory-mapped view of a compiled GTFS feed."""
+
+    def __init__(self, directory: str, name: Optional[str] = None):
+        self.directory = directory
+        self.name = name or os.path.basename(directory)
+        for column in _COLUMNS:
+            path = os.path.join(directory, f"{column}.npy")
+            # Plain ndarray views over the mapping avoid np.memmap's per-slice
+            # overhead while still sharing the pages between processes.
+            setattr(self, column, np.load(path, mmap_mode="r").view(np.ndarray))
+        self.timezone = self.timezone[0].decode("utf-8")
+        self._sorted_lats = self.stop_lat[self.stop_lat_order]
+
+    def __len__(self) -> int:
+        return len(self.stop_lat)
+
+    def _string(self, offsets, blob, row: int) -> str:
+        return blob[offsets[row] : offsets[row + 1]].tobytes().decode("utf-8")
+
+    def stop_name(self, stop: int) -> str:
+        return self._string(self.stop_name_offsets, self.stop_names, stop)
+
+    def route_name(self, route: int) -> str:
+        return self._string(self.route_name_offsets, self.route_names, route)
+
+    def headsign(self, trip: int) -> str:
+        return self._string(self.trip_headsign_offsets, self.trip_headsigns, trip)
+
+    def vehicle(self, route: int) -> str:
+        route_type = int(self.route_type[route])
+        if route_type in VEHICLES:
+            return VEHICLES[route_type]
+        return EXTENDED_VEHICLES.get(route_type // 100, "BUS")
+
+    def stops_near(
+        self, lat: float, lng: float, radius: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the stops within a radius.
+
+        Returns:
+            tuple: (stop indices, distances in meters).
+        """
+        band = np.degrees(radius / EARTH_RADIUS_M)
+        lo, hi = np.searchsorted(self._sorted_lats, [lat - band, lat + band])
+        candidates = self.stop_lat_order[lo:hi]
+        meters = _distances(
+            lat, lng, self.stop_lat[candidates], self.stop_lng[candidates]
+        )
+        keep = meters <= radius
+        return candidates[keep], meters[keep]
+
+    def covers(self, lat: float, lng: float) -> bool:
+        """Whether a point is within walking distance of the stops' bounding box."""
+        band = np.degrees(walk_radius() / EARTH_RADIUS_M)
+        (south, west), (north, east) = self.bounds
+        # Longitude degrees shrink away from the equator.
+        lng_band = band / max(np.cos(np.radians(lat)), 0.01)
+        return bool(
+            south - band <= lat <= north + band
+            and west - lng_band <= lng <= east + lng_band
+        )
+
+    def active_services(self, day: date) -> np.ndarray:
+        """Which services run on a date, as a boolean array."""
+        stamp = int(day.strftime("%Y%m%d"))
+        active = (
+            self.service_weekdays[:, day.weekday()]
+            & (self.service_start <= stamp)
+            & (self.service_end >= stamp)
+        )
+        today = self.exception_date == stamp
+        active[self.exception_service[today & (self.exception_type == 1)]] = True
+        active[self.exception_service[today & (self.exception_type == 2)]] = False
+        return active
+
+    def pattern_stops_of(self, pattern: int) -> np.ndarray:
+        return self.pattern_stops[
+            self.pattern_stop_offsets[pattern] : self.pattern_stop_offsets[pattern + 1]
+        ]
+
+    def pattern_block(self, pattern: int) -> Tuple[np.ndarray, np.ndarray, range]:
+        """
+        Gets a pattern's stop times.
+
+        Returns:
+            tuple: (arrivals, departures) as (trips, stops) arrays in
+                seconds after midnight of the service day, and the range
+                of trip indices.
+        """
+        stops = (
+            self.pattern_stop_offsets[pattern + 1] - self.pattern_stop_offsets[pattern]
+        )
+        lo, hi = self.pattern_time_offsets[pattern : pattern + 2]
+        trips = range(*self.pattern_trip_offsets[pattern : pattern + 2])
+        shape = (len(trips), stops)
+        return (
+            self.arrivals[lo:hi].reshape(shape),
+            self.departures[lo:hi].reshape(shape),
+            trips,
+        )
+
+
+def walk_radius() -> float:
+    """How far journeys may walk to the first and from the last stop, in meters."""
+    return env_float("LOCUS_GTFS_WALK_RADIUS_M", 800)
+
+
+def feed_paths() -> List[str]:
+    """The GTFS feeds configured in LOCUS_GTFS_FEEDS (os.pathsep-separated)."""
+    value = os.getenv("LOCUS_GTFS_FEEDS", "")
+    return [os.path.expanduser(p) for p in value.split(os.pathsep) if p.strip()]
+
+
+def load_timetables() -> List[Timetable]:
+    """
+    Compiles the configured feeds where needed and opens them. Blocking.
+
+    Feeds that cannot be read are logged and skipped.
+
+    Returns:
+        list[Timetable]: One per usable feed; empty if none are configured.
+    """
+    global _timetables
+    timetables = []
+    try:
+        for path in feed_paths():
+            try:
+                timetables.append(
+                    Timetable(
+                        build_timetable(path),
+                        name=os.path.splitext(os.path.basename(path))[0],
+                    )
+                )
+            except Exception as e:
+                # A malformed feed can fail anywhere in the build.
+                logger.warning("Skipping GTFS feed %s: %s", path, e)
+    finally:
+        # Whatever happens, loading counts as done; the loader never reruns.
+        _timetables = timetables
+    return timetables
+
+
+def start_loading() -> None:
+    """Starts load_timetables() in a background thread, once per process."""
+    global _loader
+    if _timetables is not None or not feed_paths():
+        return
+    with _lock:
+        if _loader is None:
+            _loader = threading.Thread(
+                target=load_timetables, name="gtfs-loader", daemon=True
+            )
+            _loader.start()
+
+
+def get_timetables() -> List[Timetable]:
+    """
+    Gets the timetables that are ready to route on. Never blocks.
+
+    Starts loading the feeds if that has not happened yet (see
+    start_loading()).
+
+    Returns:
+        list[Timetable]: The loaded timetables; empty while they are still
+            loading or if none are configured.
+    """
+    if _timetables is None:
+        start_loading()
+    return _timetables or []
+
+
+def timetables_covering(lat: float, lng: float) -> List[Timetable]:
+    """The loaded timetables whose area covers a point (see Timetable.covers())."""
+    return [t for t in get_timetables() if t.covers(lat, lng)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compile GTFS feeds into timetables for local transit routing."
+    )
+    parser.add_argument(
+        "feeds", nargs="*", help="GTFS .zip files (defaults to LOCUS_GTFS_FEEDS)."
+    )
+    args = parser.parse_args()
+    for path in args.feeds or feed_paths():
+        timetable = Timetable(build_timetable(path))
+        print(
+            f"Compiled {path} into {timetable.directory}: {len(timetable)} stops, "
+            f"{len(timetable.pattern_route)} patterns, "
+            f"{len(timetable.trip_service)} trips."
+        )
+
+
+if __name__ == "__main__":
+    main()
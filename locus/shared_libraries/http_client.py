@@ -0,0 +1,347 @@
+"""
+Shared HTTP transport for all upstream API calls.
+
+Tools should use get()/post() here (or get_gmaps_client()) instead of bare
+requests calls, so that connections to Google endpoints are pooled and kept
+alive across tool invocations rather than re-handshaking TLS on every call.
+Async tools use aget()/apost()/amaps_get(), which share one httpx client per
+event loop.
+
+Both transports apply the per-call timeouts and the current request deadline
+from deadline.py, the per-key rate limits and quota budgets from
+rate_limit.py, and the retries and per-host circuit breakers from
+resilience.py to every request, including those made by googlemaps.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Optional
+from urllib.parse import urlparse
+import googlemaps
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from . import deadline, rate_limit, resilience
+from .env_config import env_int
+
+MAPS_BASE_URL = "https://maps.googleapis.com/maps/api"
+
+_lock = threading.RLock()
+_session = None
+_gmaps_clients = {}
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_pool_settings() -> dict:
+    """
+    Gets connection pool sizing from the environment.
+
+    Returns:
+        dict: A dictionary containing:
+            - "pool_connections": number of per-host pools kept (LOCUS_HTTP_POOL_HOSTS)
+            - "pool_maxsize": keep-alive connections per host (LOCUS_HTTP_POOL_SIZE)
+    """
+    return {
+        "pool_connections": env_int("LOCUS_HTTP_POOL_HOSTS", 16),
+        "pool_maxsize": env_int("LOCUS_HTTP_POOL_SIZE", 32),
+    }
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    Pooled adapter that applies the API key's rate limits, the request
+    deadline, retries and the upstream host's circuit breaker to every request.
+    """
+
+    def send(self, request, timeout=None, **kwargs):
+        breaker = resilience.get_breaker(urlparse(request.url).hostname or "")
+        retryable = resilience.is_retryable(request.method)
+        attempt = 0
+        while True:
+            rate_limit.limiter.acquire(request.url)
+            call_timeout = deadline.cap_timeout(timeout)
+            breaker.acquire()
+            attempt += 1
+            try:
+                response = super().send(request, timeout=call_timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                delay = resilience.after_error(breaker, retryable, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                # Anything else (SSL errors, cancellation, ...) still has to
+                # give back a half-open probe slot, or the breaker stays open.
+                breaker.release()
+                raise
+            else:
+                delay = resilience.after_response(
+                    breaker,
+                    retryable,
+                    attempt,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+
+
+class AsyncResilientTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport that applies the API key's rate limits, the request
+    deadline, retries and the upstream host's circuit breaker to every request.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = resilience.get_breaker(request.url.host)
+        retryable = resilience.is_retryable(request.method)
+        attempt = 0
+        while True:
+            await rate_limit.limiter.acquire_async(str(request.url))
+            left = deadline.check()
+            breaker.acquire()
+            attempt += 1
+            try:
+                response = await self._send_once(request, left)
+            except (httpx.TransportError, deadline.DeadlineExceeded) as e:
+                delay = resilience.after_error(breaker, retryable, attempt)
+                if delay is None or isinstance(e, deadline.DeadlineExceeded):
+                    raise
+            except BaseException:
+                # Including CancelledError from an enclosing wait_for().
+                breaker.release()
+                raise
+            else:
+                delay = resilience.after_response(
+                    breaker,
+                    retryable,
+                    attempt,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def _send_once(
+        self, request: httpx.Request, left: Optional[float]
+    ) -> httpx.Response:
+        if left is None:
+            return await super().handle_async_request(request)
+        timeouts = dict(request.extensions.get("timeout", {}))
+        for phase, value in timeouts.items():
+            timeouts[phase] = left if value is None else min(value, left)
+        request.extensions["timeout"] = timeouts
+        try:
+            return await asyncio.wait_for(super().handle_async_request(request), left)
+        except asyncio.TimeoutError:
+            raise deadline.DeadlineExceeded(
+                f"Time budget exhausted waiting for {request.url.host}"
+            ) from None
+
+
+class SingleAttemptClient(googlemaps.Client):
+    """
+    googlemaps client that never retries a call itself.
+
+    The session's ResilientAdapter already retries failed sends, so when
+    googlemaps would try again (a 5xx it retries, or a retriable status in
+    the body) the error of the attempt just made is raised instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last = threading.local()
+        hooks = dict(self.requests_kwargs.get("hooks", {}), response=self._remember)
+        self.requests_kwargs["hooks"] = hooks
+
+    def _remember(self, response: requests.Response, *args, **kwargs) -> None:
+        self._last.response = response
+
+    def _request(
+        self, url, params, first_request_time=None, retry_counter=0, *args, **kwargs
+    ):
+        if retry_counter > 0:
+            raise self._attempt_error()
+        self._last.response = None
+        return super()._request(
+            url, params, first_request_time, retry_counter, *args, **kwargs
+        )
+
+    def _attempt_error(self) -> Exception:
+        """The error of the response googlemaps wanted to retry."""
+        response = getattr(self._last, "response", None)
+        if response is None:
+            return googlemaps.exceptions.TransportError()
+        if response.status_code != 200:
+            return googlemaps.exceptions.HTTPError(response.status_code)
+        try:
+            body = response.json()
+        except ValueError:
+            return googlemaps.exceptions.TransportError()
+        return googlemaps.exceptions.ApiError(
+            body.get("status"), body.get("error_message")
+        )
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = ResilientAdapter(**get_pool_settings())
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Gets the process-wide requests session.
+
+    Returns:
+        requests.Session: A session with keep-alive connection pools per host.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Sends a GET request over the shared session."""
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, idempotent: bool = False, **kwargs) -> requests.Response:
+    """
+    Sends a POST request over the shared session.
+
+    Args:
+        url (str): The URL to post to.
+        idempotent (bool): Set for read-only lookups, so that transient
+            failures are retried like GET requests.
+
+    Returns:
+        requests.Response: The response.
+    """
+    if not idempotent:
+        return get_session().post(url, **kwargs)
+    with resilience.idempotent():
+        return get_session().post(url, **kwargs)
+
+
+def get_gmaps_client(api_key: str) -> googlemaps.Client:
+    """
+    Gets a googlemaps client for an API key, reused across the process.
+
+    The client sends its requests over the shared session, so Places and
+    Directions calls share the same keep-alive pools as the other tools.
+    It makes a single attempt per call (see SingleAttemptClient); failed
+    sends are retried by the session (see ResilientAdapter), with jitter and
+    circuit breakers.
+
+    Args:
+        api_key (str): The Google Maps API key.
+
+    Returns:
+        googlemaps.Client: The shared client for this key.
+    """
+    client = _gmaps_clients.get(api_key)
+    if client is None:
+        with _lock:
+            client = _gmaps_clients.get(api_key)
+            if client is None:
+                client = SingleAttemptClient(
+                    key=api_key,
+                    requests_session=get_session(),
+                    retry_over_query_limit=False,
+                )
+                _gmaps_clients[api_key] = client
+    return client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Gets the shared httpx client for the running event loop.
+
+    httpx clients are bound to the loop they were first used on, so one
+    client is kept per loop. Pool limits follow the same settings as the
+    sync session, with LOCUS_HTTP_ASYNC_MAX_CONNECTIONS capping the total,
+    and requests use the same per-call timeouts.
+
+    Returns:
+        httpx.AsyncClient: The client for the current loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        settings = get_pool_settings()
+        connect, read = deadline.get_call_timeouts()
+        client = httpx.AsyncClient(
+            transport=AsyncResilientTransport(
+                limits=httpx.Limits(
+                    max_connections=env_int("LOCUS_HTTP_ASYNC_MAX_CONNECTIONS", 200),
+                    max_keepalive_connections=settings["pool_maxsize"],
+                ),
+            ),
+            timeout=httpx.Timeout(read, connect=connect),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aget(url: str, **kwargs) -> httpx.Response:
+    """Sends a GET request over the shared async client."""
+    return await get_async_client().get(url, **kwargs)
+
+
+async def apost(url: str, idempotent: bool = False, **kwargs) -> httpx.Response:
+    """Sends a POST request over the shared async client; see post()."""
+    if not idempotent:
+        return await get_async_client().post(url, **kwargs)
+    with resilience.idempotent():
+        return await get_async_client().post(url, **kwargs)
+
+
+async def amaps_get(path: str, params: dict, api_key: str) -> dict:
+    """
+    Calls a Google Maps web service (e.g. "place/textsearch") asynchronously.
+
+    Mirrors the googlemaps client's status handling so sync and async tools
+    fail the same way.
+
+    Args:
+        path (str): Service path under /maps/api, without the "/json" suffix.
+        params (dict): Query parameters (the key is added automatically).
+        api_key (str): Google Maps API key.
+
+    Returns:
+        dict: The response body.
+
+    Raises:
+        googlemaps.exceptions.ApiError: If the service reports an error status.
+    """
+    response = await aget(
+        f"{MAPS_BASE_URL}/{path}/json", params=dict(params, key=api_key)
+    )
+    response.raise_for_status()
+    body = response.json()
+    status = body.get("status")
+    if status not in ("OK", "ZERO_RESULTS"):
+        raise googlemaps.exceptions.ApiError(status, body.get("error_message"))
+    return body
+
+
+def reset() -> None:
+    """Closes the shared session and drops cached clients (e.g. after a fork)."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _gmaps_clients.clear()
+        _async_clients.clear()
@@ -0,0 +1,202 @@
+"""
+Place Details lookups, cached per place_id and field.
+
+Each field is cached separately with the TTL of its tier: names, addresses
+and coordinates hardly ever change, contact details rarely, ratings daily,
+and opening hours (which carry "open now") only briefly. A lookup serves
+what it can from the cache and asks the API for the missing fields only,
+through the Place Details field mask, so the payload stays small and the
+request is billed at the cheapest tier covering those fields.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+import googlemaps
+from . import http_client
+from .cache import TwoTierCache
+from .env_config import env_bool, env_float, env_int
+from .http_client import get_gmaps_client
+from .singleflight import upstream_flight
+
+# Field name -> (Place Details field mask entry, TTL tier).
+FIELDS = {
+    "name": ("name", "static"),
+    "address": ("formatted_address", "static"),
+    "location": ("geometry/location", "static"),
+    "types": ("type", "static"),
+    "maps_url": ("url", "static"),
+    "phone": ("formatted_phone_number", "contact"),
+    "international_phone": ("international_phone_number", "contact"),
+    "website": ("website", "contact"),
+    "rating": ("rating", "ratings"),
+    "ratings_count": ("user_ratings_total", "ratings"),
+    "price_level": ("price_level", "ratings"),
+    "summary": ("editorial_summary", "ratings"),
+    "hours": ("opening_hours", "hours"),
+    "business_status": ("business_status", "hours"),
+}
+DEFAULT_FIELDS = ("name", "address", "phone", "website", "rating", "hours")
+
+TIER_TTLS = {
+    "static": ("LOCUS_PLACE_STATIC_TTL", 30 * 24 * 3600),
+    "contact": ("LOCUS_PLACE_CONTACT_TTL", 7 * 24 * 3600),
+    "ratings": ("LOCUS_PLACE_RATINGS_TTL", 24 * 3600),
+    "hours": ("LOCUS_PLACE_HOURS_TTL", 900),
+}
+
+# Statuses meaning the place_id itself is bad, as opposed to a failed call.
+MISSING_STATUSES = ("NOT_FOUND", "INVALID_REQUEST")
+
+_details_cache = TwoTierCache(
+    "place_details",
+    ttl=env_float("LOCUS_PLACE_STATIC_TTL", 30 * 24 * 3600),
+    negative_ttl=env_float("LOCUS_PLACE_NEGATIVE_TTL", 3600),
+    max_memory_entries=env_int("LOCUS_PLACE_DETAILS_CACHE_SIZE", 4096),
+    persistent=env_bool("LOCUS_CACHE_PERSIST", True),
+)
+
+
+def field_ttl(field: str) -> float:
+    """Seconds a field is cached for, from its tier."""
+    name, default = TIER_TTLS[FIELDS[field][1]]
+    return env_float(name, default)
+
+
+def cached_fields(place_id: str, fields: Iterable[str]) -> Tuple[dict, List[str]]:
+    """
+    Splits the requested fields into cached values and fields to fetch.
+
+    Returns:
+        tuple: (dict of cached values, list of missing field names). A
+            cached value of None means the place has no such field. If the
+            place_id is known not to exist, the dict is that error.
+    """
+    missing = _details_cache.get(f"{place_id}|missing")
+    if missing is not None:
+        return missing, []
+    values, todo = {}, []
+    for field in fields:
+        entry = _details_cache.get(f"{place_id}|{field}")
+        if entry is None:
+            todo.append(field)
+        else:
+            values[field] = entry["value"]
+    return values, todo
+
+
+def field_mask(fields: Iterable[str]) -> List[str]:
+    """The Place Details field mask covering the given fields."""
+    return sorted({FIELDS[field][0] for field in fields})
+
+
+def get_place_fields(place_id: str, fields: List[str], api_key: str) -> dict:
+    """
+    Gets the given fields of a place, fetching only those not cached.
+
+    Args:
+        place_id (str): The Google place ID.
+        fields (list[str]): Keys of FIELDS.
+        api_key (str): Google Maps API key.
+
+    Returns:
+        dict: Field values (None where the place has none), plus
+            "fetched" (the fields that came from the API), or an
+            {"error": ...} dict if the place_id does not exist.
+
+    Raises:
+        Exception: If the Place Details call fails.
+    """
+    values, todo = cached_fields(place_id, fields)
+    if "error" in values:
+        return values
+    if not todo:
+        return dict(values, fetched=[])
+    fetched = upstream_flight.do(
+        ("place_details", place_id, tuple(todo)),
+        _fetch_fields,
+        place_id,
+        todo,
+        api_key,
+    )
+    return _merge(fields, values, fetched, todo)
+
+
+async def get_place_fields_async(
+    place_id: str, fields: List[str], api_key: str
+) -> dict:
+    """Async variant of get_place_fields(); see it for details."""
+    values, todo = cached_fields(place_id, fields)
+    if "error" in values:
+        return values
+    if not todo:
+        return dict(values, fetched=[])
+    fetched = await upstream_flight.do_async(
+        ("place_details", place_id, tuple(todo)),
+        _fetch_fields_async,
+        place_id,
+        todo,
+        api_key,
+    )
+    return _merge(fields, values, fetched, todo)
+
+
+def _fetch_fields(place_id: str, fields: List[str], api_key: str) -> dict:
+    try:
+        details = get_gmaps_client(api_key).place(
+            place_id, fields=field_mask(fields)
+        )
+    except googlemaps.exceptions.ApiError as e:
+        return _store_missing(place_id, e)
+    return _store_fields(place_id, fields, details.get("result", {}))
+
+
+async def _fetch_fields_async(place_id: str, fields: List[str], api_key: str) -> dict:
+    try:
+        details = await http_client.amaps_get(
+            "place/details",
+            {"place_id": place_id, "fields": ",".join(field_mask(fields))},
+            api_key,
+        )
+    except googlemaps.exceptions.ApiError as e:
+        return _store_missing(place_id, e)
+    return _store_fields(place_id, fields, details.get("result", {}))
+
+
+def _store_missing(place_id: str, e: googlemaps.exceptions.ApiError) -> dict:
+    if e.status not in MISSING_STATUSES:
+        raise e
+    error = {"error": f"No place found for place_id '{place_id}'."}
+    _details_cache.set_negative(f"{place_id}|missing", error)
+    return error
+
+
+def _store_fields(place_id: str, fields: List[str], result: dict) -> dict:
+    values = {field: project_field(field, result) for field in fields}
+    for field, value in values.items():
+        _details_cache.set(f"{place_id}|{field}", {"value": value}, field_ttl(field))
+    return values
+
+
+def _merge(fields: List[str], values: dict, fetched: dict, todo: List[str]) -> dict:
+    if "error" in fetched:
+        return fetched
+    values = dict(values, **fetched)
+    return dict({field: values[field] for field in fields}, fetched=todo)
+
+
+def project_field(field: str, result: dict) -> Optional[object]:
+    """Extracts one field from a Place Details result, in compact form."""
+    if field == "location":
+        return result.get("geometry", {}).get("location")
+    if field == "hours":
+        hours = result.get("opening_hours")
+        if not hours:
+            return None
+        return {
+            "open_now": hours.get("open_now"),
+            "weekly": hours.get("weekday_text", []),
+        }
+    if field == "summary":
+        return (result.get("editorial_summary") or {}).get("overview")
+    # Otherwise the result key is the mask entry, bar the singular "type".
+    key = {"types": "types"}.get(field, FIELDS[field][0])
+    return result.get(key)
@@ -0,0 +1,384 @@
+"""
+Earliest-arrival transit journeys over an offline GTFS timetable.
+
+RAPTOR (round-based public transit routing) needs no graph search or
+priority queue: round k finds the earliest arrival at every stop with at
+most k vehicles, by scanning each pattern that serves a stop improved in
+round k - 1 and then relaxing the walking transfers from the stops it
+improved. The best arrival of each round is the fastest journey for that
+number of vehicles, so the rounds also give the alternatives with fewer
+transfers.
+
+Each pattern scan is vectorized: the first catchable trip at every stop is
+one comparison over the pattern's (trips, stops) block (see gtfs.py), and
+a running minimum along the stops carries the trip already boarded.
+"""
+
+from datetime import date, datetime, time as clock_time, timedelta
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+import numpy as np
+from .env_config import env_float, env_int
+from .gtfs import WALK_SPEED_MPS, Timetable, walk_radius
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenates the index ranges [start, start + count)."""
+    ends = np.cumsum(counts)
+    within = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts, counts)
+    return np.repeat(starts, counts) + within
+
+
+def _marked_patterns(timetable: Timetable, marked: np.ndarray) -> List[tuple]:
+    """The patterns serving marked stops, with the first marked position."""
+    offsets = timetable.stop_pattern_offsets
+    index = _ranges(offsets[marked], offsets[marked + 1] - offsets[marked])
+    patterns = timetable.stop_patterns[index]
+    positions = timetable.stop_positions[index]
+    order = np.lexsort((positions, patterns))
+    patterns, positions = patterns[order], positions[order]
+    first = np.concatenate(([True], patterns[1:] != patterns[:-1]))
+    return list(zip(patterns[first].tolist(), positions[first].tolist()))
+
+
+def service_day_start(day: date, zone: ZoneInfo) -> float:
+    """
+    Unix time the GTFS times of a service day count from.
+
+    GTFS measures them from noon minus 12 hours, which is midnight except on
+    the days the clocks change.
+    """
+    return datetime.combine(day, clock_time(12), zone).timestamp() - 12 * 3600
+
+
+def _pattern_view(
+    timetable: Timetable, pattern: int, services: tuple, views: dict
+) -> tuple:
+    """
+    The trips of a pattern running on the query day, in departure order.
+
+    Trips of the previous service day that run past midnight are included,
+    with their times shifted back a day.
+
+    Args:
+        timetable (Timetable): The compiled feed.
+        pattern (int): The pattern index.
+        services (tuple): The active services of the query day and of the
+            day before, and the seconds between the two days' starts.
+        views (dict): Views already built for this query.
+
+    Returns:
+        tuple: (arrivals, departures, trip indices), cached in views.
+    """
+    view = views.get(pattern)
+    if view is None:
+        arrivals, departures, trips = timetable.pattern_block(pattern)
+        trip_ids = np.arange(trips.start, trips.stop)
+        service = timetable.trip_service[trips.start : trips.stop]
+        today, previous, shift = services
+        running = today[service]
+        parts = [(arrivals[running], departures[running], trip_ids[running])]
+        if timetable.pattern_max_time[pattern] >= shift:
+            before = previous[service] & (arrivals[:, -1] >= shift)
+            if before.any():
+                parts.append(
+                    (
+                        arrivals[before] - shift,
+                        departures[before] - shift,
+                        trip_ids[before],
+                    )
+                )
+        view = tuple(np.concatenate(column) for column in zip(*parts))
+        if len(parts) > 1:
+            order = np.argsort(view[1][:, 0], kind="stable")
+            view = tuple(column[order] for column in view)
+        views[pattern] = view
+    return view
+
+
+def plan_journeys(
+    timetable: Timetable,
+    origin: Tuple[float, float],
+    destination: Tuple[float, float],
+    departure: float,
+) -> List[dict]:
+    """
+    Finds the earliest-arrival journeys between two points.
+
+    Args:
+        timetable (Timetable): The compiled feed.
+        origin (tuple): (lat, lng) to start from.
+        destination (tuple): (lat, lng) to get to.
+        departure (float): Unix time to leave at.
+
+    Returns:
+        list[dict]: Pareto-optimal journeys (each faster than any with
+            fewer transfers), with "depart" and "arrive" in GTFS seconds of
+            the departure day, "day_start" (the Unix time they count from,
+            see service_day_start()) and "legs".
+            Empty if the timetable has no journey.
+    """
+    radius = walk_radius()
+    change = env_float("LOCUS_GTFS_MIN_CHANGE_SECONDS", 60)
+    rounds = env_int("LOCUS_GTFS_MAX_TRANSFERS", 3) + 1
+
+    access, access_m = timetable.stops_near(*origin, radius)
+    egress, egress_m = timetable.stops_near(*destination, radius)
+    if not len(access) or not len(egress):
+        return []
+
+    zone = ZoneInfo(timetable.timezone)
+    day = datetime.fromtimestamp(departure, zone).date()
+    reference = service_day_start(day, zone)
+    start = departure - reference
+    # A day is 23 or 25 hours long across a clock change.
+    previous = day - timedelta(days=1)
+    services = (
+        timetable.active_services(day),
+        timetable.active_services(previous),
+        reference - service_day_start(previous, zone),
+    )
+    views = {}
+
+    n = len(timetable)
+    walks = np.full(n, np.nan)
+    walks[access] = access_m / WALK_SPEED_MPS
+    egress_seconds = egress_m / WALK_SPEED_MPS
+    # When a stop can be left from, the round that set it and the stop whose
+    # vehicle arrival it comes from (-1 for the walk from the origin).
+    ready = np.full(n, np.inf)
+    ready[access] = start + walks[access]
+    ready_round = np.zeros(n, dtype=np.int64)
+    ready_from = np.full(n, -1, dtype=np.int64)
+    snapshots = [(ready.copy(), ready_round.copy(), ready_from.copy())]
+    best = np.full(n, np.inf)
+    target = np.inf
+    labels, finals = [], []
+    marked = access
+
+    for k in range(1, rounds + 1):
+        arrival = np.full(n, np.inf)
+        via = np.full((n, 4), -1, dtype=np.int64)  # pattern, trip row, board, alight
+        for pattern, first in _marked_patterns(timetable, marked):
+            arrivals, departures, _ = _pattern_view(
+                timetable, pattern, services, views
+            )
+            trips = len(departures)
+            if not trips:
+                continue
+            stops = timetable.pattern_stops_of(pattern)[first:]
+            catchable = departures[:, first:] >= ready[stops]
+            caught = np.where(
+                catchable.any(axis=0), catchable.argmax(axis=0), trips
+            )
+            boarded = np.minimum.accumulate(caught)
+            boarded_at = np.maximum.accumulate(
+                np.where(caught == boarded, np.arange(len(stops)), -1)
+            )
+            # A stop is reached on the trip boarded at an earlier stop.
+            row = np.concatenate(([trips], boarded[:-1]))
+            board = np.concatenate(([-1], boarded_at[:-1]))
+            positions = np.flatnonzero(row < trips)
+            if not positions.size:
+                continue
+            times = arrivals[row[positions], first + positions]
+            at = stops[positions]
+            better = times < np.minimum(np.minimum(arrival[at], best[at]), target)
+            positions, at = positions[better], at[better]
+            arrival[at] = times[better]
+            via[at, 0] = pattern
+            via[at, 1] = row[positions]
+            via[at, 2] = first + board[positions]
+            via[at, 3] = first + positions
+
+        improved = np.flatnonzero(np.isfinite(arrival))
+        labels.append((arrival, via))
+        if not improved.size:
+            break
+        best[improved] = arrival[improved]
+        final = arrival[egress] + egress_seconds
+        exit_index = int(np.argmin(final))
+        if final[exit_index] < target:
+            target = float(final[exit_index])
+            finals.append((k, int(egress[exit_index]), target))
+
+        # Changing vehicles at the same stop, or walking to a nearby one.
+        offsets = timetable.transfer_offsets
+        counts = offsets[improved + 1] - offsets[improved]
+        index = _ranges(offsets[improved], counts)
+        sources = np.concatenate((improved, np.repeat(improved, counts)))
+        stops = np.concatenate((improved, timetable.transfer_stops[index]))
+        walk = np.maximum(timetable.transfer_seconds[index], change)
+        waits = np.concatenate((np.full(improved.size, change), walk))
+        times = arrival[sources] + waits
+        order = np.lexsort((times, stops))
+        sources, stops, times = sources[order], stops[order], times[order]
+        keep = np.concatenate(([True], stops[1:] != stops[:-1]))
+        sources, stops, times = sources[keep], stops[keep], times[keep]
+        better = times < ready[stops]
+        marked = stops[better]
+        ready[marked] = times[better]
+        ready_round[marked] = k
+        ready_from[marked] = sources[better]
+        snapshots.append((ready.copy(), ready_round.copy(), ready_from.copy()))
+        if not marked.size:
+            break
+
+    journeys = [
+        dict(
+            _journey(
+                timetable, views, labels, snapshots, walks, k, stop, arrive, services
+            ),
+            day_start=reference,
+        )
+        for k, stop, arrive in finals
+    ]
+    return sorted(journeys, key=lambda j: j["arrive"])
+
+
+def _journey(
+    timetable: Timetable,
+    views: dict,
+    labels: list,
+    snapshots: list,
+    walks: np.ndarray,
+    k: int,
+    stop: int,
+    arrive: float,
+    services: tuple,
+) -> dict:
+    """Traces a journey back from the stop left for the destination."""
+    legs = [
+        {
+            "mode": "WALKING",
+            "from": timetable.stop_name(stop),
+            "to": None,
+            "seconds": arrive - labels[k - 1][0][stop],
+        }
+    ]
+    while True:
+        pattern, row, board, alight = labels[k - 1][1][stop].tolist()
+        arrivals, departures, trips = _pattern_view(
+            timetable, pattern, services, views
+        )
+        stops = timetable.pattern_stops_of(pattern)
+        legs.append(
+            {
+                "mode": "TRANSIT",
+                "pattern": pattern,
+                "trip": int(trips[row]),
+                "from": timetable.stop_name(stops[board]),
+                "to": timetable.stop_name(stops[alight]),
+                "last_stop": timetable.stop_name(stops[-1]),
+                "stops": alight - board,
+                "depart": float(departures[row, board]),
+                "arrive": float(arrivals[row, alight]),
+            }
+        )
+        boarded = int(stops[board])
+        ready, ready_round, ready_from = snapshots[k - 1]
+        source, source_round = int(ready_from[boarded]), int(ready_round[boarded])
+        if source < 0:
+            legs.append(
+                {
+                    "mode": "WALKING",
+                    "from": None,
+                    "to": timetable.stop_name(boarded),
+                    "seconds": float(walks[boarded]),
+                }
+            )
+            break
+        if source != boarded:
+            legs.append(
+                {
+                    "mode": "WALKING",
+                    "from": timetable.stop_name(source),
+                    "to": timetable.stop_name(boarded),
+                    "seconds": float(
+                        ready[boarded] - labels[source_round - 1][0][source]
+                    ),
+                }
+            )
+        stop, k = source, source_round
+    legs.reverse()
+    # Leave the origin just in time for the first vehicle.
+    depart = legs[1]["depart"] - legs[0]["seconds"]
+    return {"depart": depart, "arrive": arrive, "legs": legs}
+
+
+def _clock(seconds: float, day_start: float, zone: ZoneInfo) -> str:
+    """Formats GTFS seconds of a service day as local HH:MM, marking later days."""
+    moment = datetime.fromtimestamp(round((day_start + seconds) / 60) * 60, zone)
+    # Noon is on the service day whatever the clocks do.
+    day = datetime.fromtimestamp(day_start + 12 * 3600, zone).date()
+    days = (moment.date() - day).days
+    return moment.strftime("%H:%M") + (f" (+{days}d)" if days else "")
+
+
+def project_journey(
+    timetable: Timetable, journey: dict, include_steps: bool = False
+) -> dict:
+    """
+    Reduces a journey to the route shape of directions.project_route().
+
+    Args:
+        timetable (Timetable): The timetable the journey was planned on.
+        journey (dict): A journey from plan_journeys().
+        include_steps (bool, optional): Add the legs as plain-text steps.
+
+    Returns:
+        dict: Summary, duration, departure and arrival times, transit lines,
+            transfers and walking minutes (plus "steps" on request).
+    """
+    zone = ZoneInfo(timetable.timezone)
+
+    def clock(seconds: float) -> str:
+        return _clock(seconds, journey["day_start"], zone)
+
+    rides = [leg for leg in journey["legs"] if leg["mode"] == "TRANSIT"]
+    walks = [leg for leg in journey["legs"] if leg["mode"] == "WALKING"]
+    lines = []
+    for ride in rides:
+        route = int(timetable.pattern_route[ride["pattern"]])
+        lines.append(
+            {
+                "vehicle": timetable.vehicle(route),
+                "line": timetable.route_name(route),
+                "headsign": timetable.headsign(ride["trip"]) or ride["last_stop"],
+                "from_stop": ride["from"],
+                "to_stop": ride["to"],
+                "departs": clock(ride["depart"]),
+                "arrives": clock(ride["arrive"]),
+                "stops": ride["stops"],
+            }
+        )
+    projected = {
+        "summary": " > ".join(line["line"] for line in lines if line["line"]) or None,
+        "duration_min": round((journey["arrive"] - journey["depart"]) / 60, 1),
+        "distance_km": None,
+        "departs": clock(journey["depart"]),
+        "arrives": clock(journey["arrive"]),
+        "fare": None,
+        "lines": lines,
+        "transfers": max(len(lines) - 1, 0),
+        "walking_min": round(sum(walk["seconds"] for walk in walks) / 60, 1),
+        "warnings": [],
+    }
+    if include_steps:
+        steps, ride_lines = [], iter(lines)
+        for leg in journey["legs"]:
+            step = {"mode": leg["mode"]}
+            if leg["mode"] == "WALKING":
+                step["instruction"] = f"Walk to {leg['to'] or 'the destination'}"
+                step["duration_min"] = round(leg["seconds"] / 60, 1)
+            else:
+                line = next(ride_lines)
+                step["instruction"] = (
+                    f"Take {line['line']} towards {line['headsign']} from "
+                    f"{leg['from']} to {leg['to']}"
+                )
+                step["duration_min"] = round((leg["arrive"] - leg["depart"]) / 60, 1)
+                step["line"] = line["line"]
+            steps.append(step)
+        projected["steps"] = steps
+    return projected
@@ -0,0 +1,328 @@
+"""
+Client-side rate limiting and daily quota budgets for Google API keys.
+
+Every upstream request that carries an API key draws a token from two
+token buckets: one for the key as a whole and one for the key's API family
+(geocoding, places, weather, translation, ...). Requests wait for a token
+instead of being rejected upstream, so a burst from one tool cannot use up
+the per-second quota that other tools need.
+
+Calls are interactive by default. Batch work (phrasebooks, bulk lookups)
+runs inside bulk(), and bulk calls must leave a share of each bucket
+(LOCUS_RATE_LIMIT_BULK_RESERVE) untouched, so interactive calls always find
+tokens first.
+
+Requests are also counted against optional daily budgets per key and
+family (LOCUS_DAILY_BUDGET_<FAMILY>). A warning is logged at
+LOCUS_DAILY_BUDGET_WARN of the budget. From LOCUS_DAILY_BUDGET_DEGRADE,
+bulk calls are refused so the remainder is kept for interactive ones. At
+the budget itself, every call is refused before it reaches Google's hard
+quota.
+
+Limits are enforced per process. Set LOCUS_RATE_LIMIT_WORKERS to the
+number of worker processes so each one takes its share of the rates and
+budgets.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from . import deadline
+from .env_config import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Default requests per second for each API family.
+DEFAULT_RATES = {
+    "geocoding": 50,
+    "places": 10,
+    "directions": 10,
+    "distance_matrix": 10,
+    "weather": 10,
+    "air_quality": 10,
+    "translation": 10,
+}
+
+_MAPS_SERVICES = {
+    "geocode": "geocoding",
+    "place": "places",
+    "directions": "directions",
+    "distancematrix": "distance_matrix",
+}
+_HOST_FAMILIES = {
+    "weather.googleapis.com": "weather",
+    "airquality.googleapis.com": "air_quality",
+    "translation.googleapis.com": "translation",
+    "places.googleapis.com": "places",
+}
+
+_priority = contextvars.ContextVar("locus_priority", default=INTERACTIVE)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when no token frees up within the wait limit or request deadline."""
+
+
+class DailyBudgetExceeded(Exception):
+    """Raised when a call would overrun its key's daily budget."""
+
+
+@contextmanager
+def bulk() -> Iterator[None]:
+    """Runs the enclosed block's upstream calls at bulk priority."""
+    token = _priority.set(BULK)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Returns the priority of upstream calls made from the current context."""
+    return _priority.get()
+
+
+def api_family(url: str) -> str:
+    """
+    Identifies the API family a request URL belongs to.
+
+    Args:
+        url (str): The request URL.
+
+    Returns:
+        str: The family name (e.g. "geocoding", "weather"), or the host name
+            for services without a known family.
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if host == "maps.googleapis.com":
+        segments = parts.path.split("/")
+        # /maps/api/<service>/...
+        service = segments[3] if len(segments) > 3 else ""
+        return _MAPS_SERVICES.get(service, "maps")
+    return _HOST_FAMILIES.get(host, host)
+
+
+def _api_key(url: str) -> Optional[str]:
+    values = parse_qs(urlsplit(url).query).get("key")
+    return values[0] if values else None
+
+
+def _key_id(api_key: str) -> str:
+    """Short fingerprint used in place of the key in state and logs."""
+    return hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+def _workers() -> int:
+    return max(1, env_int("LOCUS_RATE_LIMIT_WORKERS", 1))
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def wait_time(self, reserve: float) -> float:
+        """Seconds until a token can be taken while leaving reserve tokens."""
+        needed = min(1.0 + reserve, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Per-key and per-family token buckets plus daily budget accounting."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._usage = {}
+        self._warned = set()
+
+    def _bucket(self, name: Tuple[str, str], rate: float) -> TokenBucket:
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            rate = rate / _workers()
+            burst = env_float("LOCUS_RATE_LIMIT_BURST_SECONDS", 1)
+            bucket = self._buckets[name] = TokenBucket(rate, rate * burst)
+        return bucket
+
+    def _buckets_for(self, key_id: str, family: str) -> list:
+        family_rate = env_float(
+            f"LOCUS_RATE_LIMIT_{family.upper()}", DEFAULT_RATES.get(family, 10)
+        )
+        return [
+            self._bucket((key_id, "*"), env_float("LOCUS_RATE_LIMIT_KEY", 50)),
+            self._bucket((key_id, family), family_rate),
+        ]
+
+    def _check_budget(self, key_id: str, family: str, priority: str) -> None:
+        budget = env_int(f"LOCUS_DAILY_BUDGET_{family.upper()}", 0) // _workers()
+        if budget <= 0:
+            return
+        today = datetime.now(timezone.utc).date().isoformat()
+        day, used = self._usage.get((key_id, family), (today, 0))
+        if day != today:
+            used = 0
+        if used >= budget:
+            raise DailyBudgetExceeded(
+                f"Daily {family} budget of {budget} requests used up; "
+                "try again tomorrow."
+            )
+        if priority == BULK and used >= budget * env_float(
+            "LOCUS_DAILY_BUDGET_DEGRADE", 0.95
+        ):
+            raise DailyBudgetExceeded(
+                f"Daily {family} budget nearly used up; "
+                "remaining requests are reserved for interactive calls."
+            )
+        warn_at = budget * env_float("LOCUS_DAILY_BUDGET_WARN", 0.8)
+        if used >= warn_at and (key_id, family, today) not in self._warned:
+            self._warned.add((key_id, family, today))
+            logger.warning(
+                "API key %s has used %d of its %d daily %s requests",
+                key_id,
+                used,
+                budget,
+                family,
+            )
+
+    def _count(self, key_id: str, family: str) -> None:
+        today = datetime.now(timezone.utc).date().isoformat()
+        day, used = self._usage.get((key_id, family), (today, 0))
+        self._usage[(key_id, family)] = (today, used + 1 if day == today else 1)
+
+    def reserve(self, url: str, priority: Optional[str] = None) -> float:
+        """
+        Tries to take a token for a request.
+
+        Args:
+            url (str): The request URL; its "key" parameter picks the buckets.
+            priority (str, optional): INTERACTIVE or BULK. Defaults to the
+                current context's priority.
+
+        Returns:
+            float: 0 if a token was taken (or the request has no key),
+                otherwise the seconds to wait before trying again.
+
+        Raises:
+            DailyBudgetExceeded: If the daily budget does not allow the call.
+        """
+        api_key = _api_key(url)
+        if not api_key:
+            return 0.0
+        key_id = _key_id(api_key)
+        family = api_family(url)
+        priority = priority or current_priority()
+        reserve = env_float("LOCUS_RATE_LIMIT_BULK_RESERVE", 0.5)
+        with self._lock:
+            self._check_budget(key_id, family, priority)
+            buckets = self._buckets_for(key_id, family)
+            now = time.monotonic()
+            wait = 0.0
+            for bucket in buckets:
+                bucket.refill(now)
+                held_back = bucket.capacity * reserve if priority == BULK else 0.0
+                wait = max(wait, bucket.wait_time(held_back))
+            if wait > 0:
+                return wait
+            for bucket in buckets:
+                bucket.tokens -= 1
+            self._count(key_id, family)
+            return 0.0
+
+    def _next_wait(self, url: str, waited: float) -> float:
+        wait = self.reserve(url)
+        if wait <= 0:
+            return 0.0
+        max_wait = env_float("LOCUS_RATE_LIMIT_MAX_WAIT", 5)
+        left = deadline.remaining()
+        if waited + wait > max_wait or (left is not None and wait >= left):
+            raise RateLimitExceeded(
+                f"Rate limit for {api_family(url)} requests reached; try again shortly."
+            )
+        return wait
+
+    def acquire(self, url: str) -> None:
+        """
+        Blocks until a request may be sent.
+
+        Raises:
+            RateLimitExceeded: If waiting would exceed LOCUS_RATE_LIMIT_MAX_WAIT
+                or the request deadline.
+            DailyBudgetExceeded: If the daily budget does not allow the call.
+        """
+        waited = 0.0
+        while True:
+            wait = self._next_wait(url, waited)
+            if not wait:
+                return
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, url: str) -> None:
+        """Async variant of acquire()."""
+        waited = 0.0
+        while True:
+            wait = self._next_wait(url, waited)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def stats(self) -> dict:
+        """
+        Reports bucket levels and daily usage, for monitoring.
+
+        Returns:
+            dict: "buckets" maps "<key id>/<family>" to available tokens, and
+                "daily_usage" maps it to today's request count.
+        """
+        with self._lock:
+            now = time.monotonic()
+            buckets = {}
+            for (key_id, family), bucket in self._buckets.items():
+                bucket.refill(now)
+                buckets[f"{key_id}/{family}"] = round(bucket.tokens, 2)
+            today = datetime.now(timezone.utc).date().isoformat()
+            usage = {
+                f"{key_id}/{family}": used
+                for (key_id, family), (day, used) in self._usage.items()
+                if day == today
+            }
+        return {"buckets": buckets, "daily_usage": usage}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._usage.clear()
+            self._warned.clear()
+
+
+# Shared limiter applied by the HTTP transports in http_client.
+limiter = RateLimiter()
+
+
+def get_rate_limit_stats() -> dict:
+    """Reports the shared limiter's state; see RateLimiter.stats()."""
+    return limiter.stats()
@@ -0,0 +1,330 @@
+"""
+Retries and circuit breakers for upstream calls.
+
+The shared HTTP transports in http_client run every request through this
+module:
+
+- Idempotent requests that fail with a connection error, a timeout, 429 or
+  a 5xx are retried with jittered exponential backoff. The number of
+  attempts is bounded, and no retry sleeps past the current request
+  deadline (see deadline.py).
+- Each upstream host has a circuit breaker. After repeated failures it
+  opens and calls fail fast with CircuitOpenError. Once the recovery
+  timeout passes, a limited number of half-open probe requests are let
+  through to see whether the service is back.
+
+Breaker state is exposed via get_breaker_states() for monitoring.
+"""
+
+import contextvars
+import email.utils
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from . import deadline
+from .env_config import env_float, env_int
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_idempotent = contextvars.ContextVar("locus_idempotent", default=False)
+
+_lock = threading.Lock()
+_breakers = {}
+_retries = 0
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a call is refused because its host's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream host.
+
+    Closed: calls go through and failures are counted. Open: calls fail
+    fast until recovery_timeout has passed. Half-open: up to half_open_probes
+    calls go through; a success closes the breaker, a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        half_open_probes: Optional[int] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or env_int(
+            "LOCUS_BREAKER_FAILURE_THRESHOLD", 5
+        )
+        self.recovery_timeout = recovery_timeout or env_float(
+            "LOCUS_BREAKER_RECOVERY_TIMEOUT", 30
+        )
+        self.half_open_probes = half_open_probes or env_int(
+            "LOCUS_BREAKER_HALF_OPEN_PROBES", 1
+        )
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def acquire(self) -> None:
+        """
+        Admits one call, or refuses it while the breaker is open.
+
+        Every admitted call must be followed by record_success(),
+        record_failure() or release().
+
+        Raises:
+            CircuitOpenError: If the breaker is open or its probes are taken.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_in = max(
+                0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)
+            )
+        raise CircuitOpenError(
+            f"{self.name} is temporarily unavailable (circuit open, "
+            f"retry in {retry_in:.0f}s)"
+        )
+
+    def record_success(self) -> None:
+        """Records a successful call, closing a half-open breaker."""
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._probes = 0
+
+    def record_failure(self) -> None:
+        """Records a failed call, opening the breaker once past the threshold."""
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or (
+                state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+                self.trips += 1
+
+    def release(self) -> None:
+        """Ends a call whose outcome says nothing about the host's health."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def snapshot(self) -> dict:
+        """Returns the breaker's state and counters."""
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == OPEN:
+                retry_in = max(
+                    0.0,
+                    self.recovery_timeout - (time.monotonic() - self._opened_at),
+                )
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in_seconds": retry_in,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """
+    Gets the circuit breaker for an upstream host, creating it on first use.
+
+    Args:
+        host (str): Host name (e.g. "weather.googleapis.com").
+
+    Returns:
+        CircuitBreaker: The process-wide breaker for the host.
+    """
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+
+def get_breaker_states() -> dict:
+    """
+    Reports every upstream host's circuit breaker, for monitoring.
+
+    Returns:
+        dict: Host name -> CircuitBreaker.snapshot(), plus "retries", the
+            total number of retried requests in this process.
+    """
+    with _lock:
+        breakers = dict(_breakers)
+    states = {host: breaker.snapshot() for host, breaker in breakers.items()}
+    states["retries"] = _retries
+    return states
+
+
+def reset() -> None:
+    """Drops all breaker state (e.g. between test runs)."""
+    global _retries
+    with _lock:
+        _breakers.clear()
+        _retries = 0
+
+
+@contextmanager
+def idempotent() -> Iterator[None]:
+    """
+    Marks the requests sent inside the block as safe to retry.
+
+    GET and other idempotent methods are always retried. Use this for POST
+    requests that only read (e.g. the Air Quality lookup endpoints).
+    """
+    token = _idempotent.set(True)
+    try:
+        yield
+    finally:
+        _idempotent.reset(token)
+
+
+def is_retryable(method: str) -> bool:
+    """Returns True if a request with this method may be retried."""
+    return method.upper() in IDEMPOTENT_METHODS or _idempotent.get()
+
+
+def is_failure_status(status_code: int) -> bool:
+    """Returns True if a response status counts against the host's breaker."""
+    return status_code >= 500
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+    """
+    Decides whether to retry after a failed attempt, and how long to wait.
+
+    Uses "full jitter" backoff: a random delay between 0 and
+    min(LOCUS_RETRY_MAX_DELAY, LOCUS_RETRY_BASE_DELAY * 2**(attempt - 1)). A
+    Retry-After header from the server raises the delay to at least its value.
+
+    Args:
+        attempt (int): Number of attempts already made (1 after the first).
+        retry_after (str, optional): The response's Retry-After header.
+
+    Returns:
+        float: Seconds to wait before the next attempt, or None to give up
+            (attempts exhausted, or the wait would overrun the deadline).
+    """
+    global _retries
+    if attempt >= env_int("LOCUS_RETRY_MAX_ATTEMPTS", 3):
+        return None
+    cap = env_float("LOCUS_RETRY_MAX_DELAY", 4)
+    base = env_float("LOCUS_RETRY_BASE_DELAY", 0.25)
+    delay = random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+    server_delay = _retry_after(retry_after)
+    if server_delay is not None:
+        if server_delay > cap:
+            return None
+        delay = max(delay, server_delay)
+    left = deadline.remaining()
+    if left is not None and delay >= left:
+        return None
+    with _lock:
+        _retries += 1
+    return delay
+
+
+def after_response(
+    breaker: CircuitBreaker,
+    retryable: bool,
+    attempt: int,
+    status_code: int,
+    retry_after: Optional[str] = None,
+) -> Optional[float]:
+    """
+    Records a response with the host's breaker and decides whether to retry.
+
+    Args:
+        breaker (CircuitBreaker): The host's breaker (acquired for this attempt).
+        retryable (bool): Whether the request may be retried.
+        attempt (int): Number of attempts made so far, including this one.
+        status_code (int): The response status.
+        retry_after (str, optional): The response's Retry-After header.
+
+    Returns:
+        float: Seconds to wait before retrying, or None to return the response.
+    """
+    if is_failure_status(status_code):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if not retryable or status_code not in RETRYABLE_STATUSES:
+        return None
+    return retry_delay(attempt, retry_after)
+
+
+def after_error(breaker: CircuitBreaker, retryable: bool, attempt: int) -> Optional[float]:
+    """
+    Records a connection error or timeout and decides whether to retry.
+
+    Timeouts caused by the request deadline running out say nothing about
+    the host, so they release the breaker instead of counting as failures.
+
+    Args:
+        breaker (CircuitBreaker): The host's breaker (acquired for this attempt).
+        retryable (bool): Whether the request may be retried.
+        attempt (int): Number of attempts made so far, including this one.
+
+    Returns:
+        float: Seconds to wait before retrying, or None to re-raise the error.
+    """
+    if deadline.expired():
+        breaker.release()
+        return None
+    breaker.record_failure()
+    return retry_delay(attempt) if retryable else None
@@ -0,0 +1,134 @@
+"""
+Single-flight coalescing of concurrent identical upstream calls.
+
+When several callers ask for the same key at once, only the first one runs
+the underlying call; the others wait for it and share its result (or its
+exception). Works for threaded callers via do() and asyncio callers via
+do_async().
+
+Waiters are bounded by their own request deadline (see deadline.py): a
+caller whose budget runs out stops waiting with DeadlineExceeded while the
+shared call carries on for the others.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+from .deadline import DeadlineExceeded, remaining
+
+
+class _Call:
+    """An in-flight threaded call and its eventual outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Example:
+        >>> flight = SingleFlight()
+        >>> flight.do(("weather", lat, lng), fetch_weather, lat, lng)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Args:
+            key: Identifies equivalent calls (e.g. the request parameters).
+            fn: The function to run.
+
+        Returns:
+            The result of fn, shared with every concurrent caller for key.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            left = remaining()
+            if not call.done.wait(None if left is None else max(left, 0)):
+                raise DeadlineExceeded(f"Time budget exhausted waiting for {key!r}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """
+        Awaits fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Calls are coalesced per event loop. Waiters are shielded, so one
+        caller being cancelled does not cancel the shared call for the others.
+
+        Args:
+            key: Identifies equivalent calls (e.g. the request parameters).
+            fn: The coroutine function to run.
+
+        Returns:
+            The result of fn, shared with every concurrent caller for key.
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._async_calls.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(fn(*args, **kwargs))
+            calls[key] = task
+
+            def _forget(_task, calls=calls):
+                if calls.get(key) is _task:
+                    del calls[key]
+                if not calls:
+                    self._async_calls.pop(loop, None)
+
+            task.add_done_callback(_forget)
+        else:
+            self.coalesced += 1
+        left = remaining()
+        if left is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(left, 0))
+        except asyncio.TimeoutError:
+            if task.done():
+                raise
+            raise DeadlineExceeded(f"Time budget exhausted waiting for {key!r}") from None
+
+    def in_flight(self) -> int:
+        """Returns the number of keys currently being fetched."""
+        return len(self._calls) + sum(len(c) for c in self._async_calls.values())
+
+
+# Shared instance used by the upstream lookups in this package.
+upstream_flight = SingleFlight()
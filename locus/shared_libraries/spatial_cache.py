@@ -0,0 +1,343 @@
+"""
+Location-keyed result cache quantized by geohash cell and time bucket.
+
+Coordinates that fall in the same geohash cell share cached results, so two
+spellings of the same place (or two nearby places) reuse one upstream call
+while the result is still fresh.
+
+Caches created with a stale_ttl also support stale-while-revalidate via
+get_or_revalidate(): once an entry's TTL passes it is refreshed in the
+background, and the stale copy is served if the refresh is slow or fails.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterator, Optional, Tuple, Union
+from . import deadline, geohash, rate_limit
+from .cache import TwoTierCache
+from .env_config import env_bool, env_float, env_int
+from .singleflight import upstream_flight
+
+_refresh_lock = threading.Lock()
+_refresh_pool = None
+_background_tasks = set()
+
+
+def _get_refresh_pool() -> ThreadPoolExecutor:
+    """Gets the worker pool that runs background revalidations for sync callers."""
+    global _refresh_pool
+    if _refresh_pool is None:
+        with _refresh_lock:
+            if _refresh_pool is None:
+                _refresh_pool = ThreadPoolExecutor(
+                    max_workers=env_int("LOCUS_REVALIDATE_WORKERS", 4),
+                    thread_name_prefix="locus-revalidate",
+                )
+    return _refresh_pool
+
+
+def _is_error(value: Any) -> bool:
+    return isinstance(value, dict) and "error" in value
+
+
+class SpatialCache:
+    """
+    Cache keyed by (geohash cell, time bucket).
+
+    By default the bucket is the current wall-clock window of bucket_seconds,
+    so entries naturally roll over. Callers whose data is tied to a fixed
+    period (e.g. a date) can pass an explicit bucket instead.
+
+    With stale_ttl set, entries are kept for stale_ttl seconds past their TTL
+    so get_or_revalidate() can serve them while a refresh is in flight.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        precision: Optional[int] = None,
+        bucket_seconds: Optional[float] = None,
+        ttl: Optional[float] = None,
+        max_memory_entries: int = 4096,
+        persistent: Optional[bool] = None,
+        stale_ttl: Optional[float] = None,
+    ):
+        self.namespace = namespace
+        self.stale_ttl = stale_ttl or 0.0
+        self.precision = precision or env_int("LOCUS_GEOHASH_PRECISION", 6)
+        self.bucket_seconds = bucket_seconds or env_float(
+            "LOCUS_SPATIAL_CACHE_BUCKET", 600
+        )
+        if persistent is None:
+            persistent = env_bool("LOCUS_CACHE_PERSIST", True)
+        self.ttl = ttl or self.bucket_seconds
+        self.cache = TwoTierCache(
+            namespace,
+            ttl=self.ttl,
+            max_memory_entries=max_memory_entries,
+            persistent=persistent,
+        )
+
+    def cell(self, lat: float, lng: float) -> str:
+        """Returns the geohash cell for a coordinate at this cache's precision."""
+        return geohash.encode(lat, lng, self.precision)
+
+    def key(
+        self, lat: float, lng: float, bucket: Optional[Union[str, int]] = None
+    ) -> str:
+        """Returns the cache key for a coordinate and bucket."""
+        if bucket is None:
+            bucket = int(time.time() // self.bucket_seconds)
+        return f"{self.cell(lat, lng)}:{bucket}"
+
+    def get(
+        self, lat: float, lng: float, bucket: Optional[Union[str, int]] = None
+    ) -> Any:
+        return self.cache.get(self.key(lat, lng, bucket))
+
+    def set(
+        self,
+        lat: float,
+        lng: float,
+        value: Any,
+        bucket: Optional[Union[str, int]] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.cache.set(self.key(lat, lng, bucket), value, ttl)
+
+    def cell_entries(self, lat: float, lng: float) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields every cached value for a coordinate's cell, across all buckets.
+
+        Args:
+            lat (float): Latitude.
+            lng (float): Longitude.
+
+        Yields:
+            tuple: (bucket, value) pairs, with the bucket as a string.
+        """
+        prefix = f"{self.cell(lat, lng)}:"
+        for key, value in self.cache.scan(prefix):
+            yield key[len(prefix) :], value
+
+    def get_or_fetch(
+        self,
+        lat: float,
+        lng: float,
+        fetch: Callable[..., Any],
+        *args,
+        bucket: Optional[Union[str, int]] = None,
+        ttl: Optional[Union[float, Callable[[Any], Optional[float]]]] = None,
+    ) -> Any:
+        """
+        Returns the cached value for the cell, fetching it on a miss.
+
+        Concurrent misses for the same cell share one fetch. Results that are
+        dicts containing an "error" key are returned but not cached.
+
+        Args:
+            lat (float): Latitude.
+            lng (float): Longitude.
+            fetch (callable): Called as fetch(*args) on a miss.
+            bucket (str | int, optional): Explicit time bucket.
+            ttl (float | callable, optional): TTL override for a newly fetched
+                value, or a function of the value returning one.
+
+        Returns:
+            The cached or freshly fetched value.
+        """
+        key = self.key(lat, lng, bucket)
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        return upstream_flight.do(
+            (self.namespace, key), self._fetch_and_store, key, ttl, fetch, *args
+        )
+
+    async def get_or_fetch_async(
+        self,
+        lat: float,
+        lng: float,
+        fetch: Callable[..., Awaitable[Any]],
+        *args,
+        bucket: Optional[Union[str, int]] = None,
+        ttl: Optional[Union[float, Callable[[Any], Optional[float]]]] = None,
+    ) -> Any:
+        """Async variant of get_or_fetch() for coroutine fetch functions."""
+        key = self.key(lat, lng, bucket)
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        return await upstream_flight.do_async(
+            (self.namespace, key), self._fetch_and_store_async, key, ttl, fetch, *args
+        )
+
+    def _fetch_and_store(
+        self, key: str, ttl: Any, fetch: Callable[..., Any], *args
+    ) -> Any:
+        value = fetch(*args)
+        if not _is_error(value):
+            self.cache.set(key, value, ttl(value) if callable(ttl) else ttl)
+        return value
+
+    async def _fetch_and_store_async(
+        self, key: str, ttl: Any, fetch: Callable[..., Awaitable[Any]], *args
+    ) -> Any:
+        value = await fetch(*args)
+        if not _is_error(value):
+            self.cache.set(key, value, ttl(value) if callable(ttl) else ttl)
+        return value
+
+    def get_or_revalidate(
+        self,
+        lat: float,
+        lng: float,
+        fetch: Callable[..., Any],
+        *args,
+        bucket: Optional[Union[str, int]] = None,
+        ttl: Optional[float] = None,
+    ) -> Tuple[Any, Optional[float]]:
+        """
+        Returns the cached value for the cell, serving stale data while refreshing.
+
+        A fresh entry is returned as is and a miss is fetched inline, like
+        get_or_fetch(). Once an entry's TTL has passed, a refresh starts in
+        the background under its own time budget and at bulk rate-limit
+        priority. The caller waits up to LOCUS_REVALIDATE_WAIT seconds for
+        it and otherwise gets the stale copy. The refresh still updates the
+        cache for later callers.
+
+        Args:
+            lat (float): Latitude.
+            lng (float): Longitude.
+            fetch (callable): Called as fetch(*args) to (re)load the value.
+            bucket (str | int, optional): Explicit time bucket.
+            ttl (float, optional): Freshness override for a newly fetched value.
+
+        Returns:
+            tuple: (value, age) where age is None for fresh data, or the
+                seconds since the stale value was fetched.
+        """
+        key = self.key(lat, lng, bucket)
+        entry = self._entry(key)
+        if entry is not None and time.time() < entry["fresh_until"]:
+            return entry["value"], None
+        if entry is None:
+            value = upstream_flight.do(
+                (self.namespace, key), self._revalidate, key, ttl, fetch, *args
+            )
+            return value, None
+
+        future = _get_refresh_pool().submit(
+            contextvars.Context().run,
+            self._background_refresh,
+            key,
+            ttl,
+            fetch,
+            *args,
+        )
+        try:
+            value = future.result(timeout=self._revalidate_wait())
+        except Exception:
+            # Slow (timed out waiting) or failed: fall back to the stale copy.
+            value = None
+        if value is not None and not _is_error(value):
+            return value, None
+        return entry["value"], time.time() - entry["fetched_at"]
+
+    async def get_or_revalidate_async(
+        self,
+        lat: float,
+        lng: float,
+        fetch: Callable[..., Awaitable[Any]],
+        *args,
+        bucket: Optional[Union[str, int]] = None,
+        ttl: Optional[float] = None,
+    ) -> Tuple[Any, Optional[float]]:
+        """Async variant of get_or_revalidate() for coroutine fetch functions."""
+        key = self.key(lat, lng, bucket)
+        entry = self._entry(key)
+        if entry is not None and time.time() < entry["fresh_until"]:
+            return entry["value"], None
+        if entry is None:
+            value = await upstream_flight.do_async(
+                (self.namespace, key), self._revalidate_async, key, ttl, fetch, *args
+            )
+            return value, None
+
+        # A fresh context, so the refresh is not bound by the caller's deadline.
+        task = asyncio.get_running_loop().create_task(
+            self._background_refresh_async(key, ttl, fetch, *args),
+            context=contextvars.Context(),
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_forget_task)
+        done, _ = await asyncio.wait({task}, timeout=self._revalidate_wait())
+        if task in done and task.exception() is None:
+            value = task.result()
+            if not _is_error(value):
+                return value, None
+        return entry["value"], time.time() - entry["fetched_at"]
+
+    def _entry(self, key: str) -> Optional[dict]:
+        entry = self.cache.get(key)
+        # Ignore anything not written by _store_entry (e.g. an older format).
+        if isinstance(entry, dict) and "fresh_until" in entry:
+            return entry
+        return None
+
+    def _store_entry(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        now = time.time()
+        fresh_for = self.ttl if ttl is None else ttl
+        entry = {"value": value, "fetched_at": now, "fresh_until": now + fresh_for}
+        self.cache.set(key, entry, fresh_for + self.stale_ttl)
+
+    def _revalidate_wait(self) -> float:
+        wait = env_float("LOCUS_REVALIDATE_WAIT", 1.0)
+        left = deadline.remaining()
+        return wait if left is None else max(0.0, min(wait, left))
+
+    def _revalidate(
+        self, key: str, ttl: Optional[float], fetch: Callable[..., Any], *args
+    ) -> Any:
+        value = fetch(*args)
+        if not _is_error(value):
+            self._store_entry(key, value, ttl)
+        return value
+
+    async def _revalidate_async(
+        self, key: str, ttl: Optional[float], fetch: Callable[..., Awaitable[Any]], *args
+    ) -> Any:
+        value = await fetch(*args)
+        if not _is_error(value):
+            self._store_entry(key, value, ttl)
+        return value
+
+    def _background_refresh(
+        self, key: str, ttl: Optional[float], fetch: Callable[..., Any], *args
+    ) -> Any:
+        with deadline.deadline(deadline.get_tool_budget()), rate_limit.bulk():
+            return upstream_flight.do(
+                (self.namespace, key), self._revalidate, key, ttl, fetch, *args
+            )
+
+    async def _background_refresh_async(
+        self, key: str, ttl: Optional[float], fetch: Callable[..., Awaitable[Any]], *args
+    ) -> Any:
+        with deadline.deadline(deadline.get_tool_budget()), rate_limit.bulk():
+            return await upstream_flight.do_async(
+                (self.namespace, key), self._revalidate_async, key, ttl, fetch, *args
+            )
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+def _forget_task(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled():
+        # Mark the exception as retrieved; the stale value was already served.
+        task.exception()
@@ -0,0 +1,271 @@
+"""
+In-process spatial index of transit stations.
+
+Stations come from two places: every Places "nearby transit station"
+response, which is also persisted in a TwoTierCache so the index survives
+restarts, and an optional seed file (LOCUS_TRANSIT_STATIONS_PATH).
+
+Stations are held as NumPy arrays sorted by latitude, so a radius query is
+a binary search for the latitude band followed by a vectorized haversine
+over the candidates. A query is answered locally when an earlier complete
+API response covered the whole search circle, or when seed stations lie
+inside it; otherwise the caller falls back to the API and records the
+response. The persisted responses are read on first use, outside the lock,
+so async callers can do that in a worker thread (see load()).
+"""
+
+import csv
+import logging
+import threading
+from typing import Iterable, List, Optional
+import numpy as np
+from .cache import TwoTierCache
+from .polyline import EARTH_RADIUS_M
+
+logger = logging.getLogger(__name__)
+
+# Column names accepted in seed files, including GTFS stops.txt.
+SEED_COLUMNS = {
+    "id": ("id", "place_id", "stop_id"),
+    "name": ("name", "stop_name"),
+    "lat": ("lat", "latitude", "stop_lat"),
+    "lng": ("lng", "lon", "longitude", "stop_lon"),
+}
+
+
+def _distances(
+    lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray
+) -> np.ndarray:
+    """Great-circle distance in meters from one point to many."""
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def read_seed_file(path: str) -> List[dict]:
+    """
+    Reads stations from a CSV file.
+
+    Args:
+        path (str): A CSV with name, lat and lng columns (and optionally id),
+            or a GTFS stops.txt.
+
+    Returns:
+        list[dict]: Station records with "id", "name", "lat" and "lng".
+            Rows without a name or valid coordinates are skipped.
+    """
+    stations = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fields = {
+            name: next((c for c in aliases if c in (reader.fieldnames or [])), None)
+            for name, aliases in SEED_COLUMNS.items()
+        }
+        if not (fields["name"] and fields["lat"] and fields["lng"]):
+            raise ValueError(f"{path} needs name, lat and lng columns")
+        for row in reader:
+            try:
+                lat, lng = float(row[fields["lat"]]), float(row[fields["lng"]])
+            except (TypeError, ValueError):
+                continue
+            name = (row[fields["name"]] or "").strip()
+            if not name:
+                continue
+            station_id = (row[fields["id"]] or "").strip() if fields["id"] else ""
+            stations.append(
+                {
+                    "id": station_id or f"{name}@{lat:.5f},{lng:.5f}",
+                    "name": name,
+                    "lat": lat,
+                    "lng": lng,
+                }
+            )
+    return stations
+
+
+def station_from_place(place: dict) -> Optional[dict]:
+    """Converts a Places API result into a station record."""
+    location = place.get("geometry", {}).get("location", {})
+    if place.get("name") is None or location.get("lat") is None:
+        return None
+    return {
+        "id": place.get("place_id")
+        or f"{place['name']}@{location['lat']:.5f},{location['lng']:.5f}",
+        "name": place["name"],
+        "lat": location["lat"],
+        "lng": location["lng"],
+    }
+
+
+class StationIndex:
+    """Radius queries over known transit stations, with API coverage tracking."""
+
+    def __init__(self, cache: TwoTierCache, seed_path: Optional[str] = None):
+        self.cache = cache
+        self.seed_path = seed_path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._stations = {}
+        self._coverage = []
+        self._arrays = None
+        self._coverage_arrays = None
+        self._stats = {"local_hits": 0, "misses": 0, "responses": 0}
+
+    def query(self, lat: float, lng: float, radius: float) -> Optional[List[dict]]:
+        """
+        Finds the known stations within a radius, if the area has been seen.
+
+        Args:
+            lat (float): Latitude of the center.
+            lng (float): Longitude of the center.
+            radius (float): Search radius in meters.
+
+        Returns:
+            list[dict]: Stations with "name", "distance_m", "lat", "lng" and
+                "id", nearest first; or None if the area is unseen and the
+                API should be asked.
+        """
+        self.load()
+        with self._lock:
+            stations, seeded = self._within(lat, lng, radius)
+            if not (seeded or self._covered(lat, lng, radius)):
+                self._stats["misses"] += 1
+                return None
+            self._stats["local_hits"] += 1
+            return stations
+
+    def add_response(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+        places: Iterable[dict],
+        next_page_token: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Records a nearby transit station response and the circle it covers.
+
+        Args:
+            lat (float): Latitude the search was centered on.
+            lng (float): Longitude the search was centered on.
+            radius (float): The search radius in meters.
+            places (iterable[dict]): The Places API results.
+            next_page_token (str, optional): The response's token for more
+                results. A truncated response covers no circle: results are
+                ranked by prominence, so nearer stations may be on later pages.
+
+        Returns:
+            list[dict]: The stations now known within the radius, as query()
+                returns them.
+        """
+        stations = [s for s in map(station_from_place, places) if s is not None]
+        covered = 0.0 if next_page_token else radius
+        entry = {"lat": lat, "lng": lng, "radius": covered, "stations": stations}
+        self.cache.set(f"{lat:.5f},{lng:.5f},{int(radius)}", entry)
+        self.load()
+        with self._lock:
+            self._add_entry(entry)
+            self._stats["responses"] += 1
+            return self._within(lat, lng, radius)[0]
+
+    def stats(self) -> dict:
+        """Reports query counters and the index size."""
+        with self._lock:
+            return {
+                **self._stats,
+                "stations": len(self._stations),
+                "covered_areas": len(self._coverage),
+            }
+
+    @property
+    def loaded(self) -> bool:
+        """Whether load() has filled the index."""
+        return self._loaded
+
+    def load(self) -> None:
+        """
+        Fills the index from the persisted responses and the seed file, once.
+
+        The disk reads happen outside the lock, so callers on an event loop
+        should run the first call in a worker thread.
+        """
+        if self._loaded:
+            return
+        entries = [
+            entry
+            for _, entry in self.cache.scan("")
+            if isinstance(entry, dict) and "stations" in entry
+        ]
+        seeds = []
+        if self.seed_path:
+            try:
+                seeds = read_seed_file(self.seed_path)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not read transit station seed file: %s", e)
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            for entry in entries:
+                self._add_entry(entry)
+            for station in seeds:
+                self._stations.setdefault(station["id"], {**station, "seed": True})
+            self._arrays = None
+
+    def _add_entry(self, entry: dict) -> None:
+        for station in entry["stations"]:
+            self._stations[station["id"]] = {**station, "seed": False}
+        if entry["radius"] > 0:
+            self._coverage.append((entry["lat"], entry["lng"], entry["radius"]))
+        self._arrays = None
+        self._coverage_arrays = None
+
+    def _index(self) -> dict:
+        """The stations as latitude-sorted arrays, rebuilt after changes."""
+        if self._arrays is None:
+            records = sorted(self._stations.values(), key=lambda s: s["lat"])
+            self._arrays = {
+                "records": records,
+                "lat": np.array([s["lat"] for s in records], dtype=float),
+                "lng": np.array([s["lng"] for s in records], dtype=float),
+                "seed": np.array([s["seed"] for s in records], dtype=bool),
+            }
+        return self._arrays
+
+    def _within(self, lat: float, lng: float, radius: float) -> tuple:
+        """Returns (stations within radius nearest first, any of them seeded)."""
+        index = self._index()
+        if not index["records"]:
+            return [], False
+        band = np.degrees(radius / EARTH_RADIUS_M)
+        lo, hi = np.searchsorted(index["lat"], [lat - band, lat + band + 1e-9])
+        distances = _distances(lat, lng, index["lat"][lo:hi], index["lng"][lo:hi])
+        inside = np.flatnonzero(distances <= radius)
+        inside = inside[np.argsort(distances[inside], kind="stable")]
+        stations = []
+        for i in inside:
+            record = index["records"][lo + i]
+            stations.append(
+                {
+                    "name": record["name"],
+                    "distance_m": int(round(distances[i])),
+                    "lat": record["lat"],
+                    "lng": record["lng"],
+                    "id": record["id"],
+                }
+            )
+        return stations, bool(index["seed"][lo + inside].any())
+
+    def _covered(self, lat: float, lng: float, radius: float) -> bool:
+        """Whether an earlier search circle contains the whole query circle."""
+        if not self._coverage:
+            return False
+        if self._coverage_arrays is None:
+            self._coverage_arrays = np.array(self._coverage, dtype=float)
+        areas = self._coverage_arrays
+        distances = _distances(lat, lng, areas[:, 0], areas[:, 1])
+        return bool((distances + radius <= areas[:, 2]).any())
@@ -0,0 +1,107 @@
+"""
+Time zones of places, for reading the local clock times users give.
+
+A time like "08:30" means 08:30 where the trip happens, not on the server.
+Zones come from the Time Zone API and are cached per geohash cell, since
+zone borders hardly ever move.
+"""
+
+import time
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from . import geohash, http_client
+from .cache import TwoTierCache
+from .env_config import env_bool, env_float
+from .http_client import get_gmaps_client
+from .singleflight import upstream_flight
+
+# Precision 6 cells (about 1.2km x 0.6km) rarely straddle a zone border.
+CELL_PRECISION = 6
+
+_timezone_cache = TwoTierCache(
+    "timezone",
+    ttl=env_float("LOCUS_TIMEZONE_CACHE_TTL", 30 * 24 * 3600),
+    persistent=env_bool("LOCUS_CACHE_PERSIST", True),
+)
+
+
+def get_timezone(lat: float, lng: float, api_key: str) -> Optional[str]:
+    """
+    Gets the IANA time zone of a coordinate (e.g. "Europe/Paris").
+
+    Args:
+        lat (float): Latitude.
+        lng (float): Longitude.
+        api_key (str): Google Maps API key.
+
+    Returns:
+        str: The zone name, or None if the lookup failed.
+    """
+    cell = geohash.encode(lat, lng, CELL_PRECISION)
+    cached = _timezone_cache.get(cell)
+    if cached is not None:
+        return cached
+    try:
+        return upstream_flight.do(
+            ("timezone", cell), _fetch_timezone, cell, lat, lng, api_key
+        )
+    except Exception:
+        return None
+
+
+async def get_timezone_async(lat: float, lng: float, api_key: str) -> Optional[str]:
+    """Async variant of get_timezone(); see it for details."""
+    cell = geohash.encode(lat, lng, CELL_PRECISION)
+    cached = _timezone_cache.get(cell)
+    if cached is not None:
+        return cached
+    try:
+        return await upstream_flight.do_async(
+            ("timezone", cell), _fetch_timezone_async, cell, lat, lng, api_key
+        )
+    except Exception:
+        return None
+
+
+def _fetch_timezone(cell: str, lat: float, lng: float, api_key: str) -> Optional[str]:
+    result = get_gmaps_client(api_key).timezone((lat, lng), int(time.time()))
+    return _store_timezone(cell, result)
+
+
+async def _fetch_timezone_async(
+    cell: str, lat: float, lng: float, api_key: str
+) -> Optional[str]:
+    result = await http_client.amaps_get(
+        "timezone",
+        {"location": f"{lat},{lng}", "timestamp": int(time.time())},
+        api_key,
+    )
+    return _store_timezone(cell, result)
+
+
+def _store_timezone(cell: str, result: dict) -> Optional[str]:
+    zone = result.get("timeZoneId")
+    if zone:
+        _timezone_cache.set(cell, zone)
+    return zone
+
+
+def local_timestamp(moment: datetime, zone: Optional[str]) -> float:
+    """
+    Converts a datetime into Unix time.
+
+    Args:
+        moment (datetime): The time. Naive times are wall-clock times in zone.
+        zone (str, optional): IANA zone name; without one (or if it is
+            unknown), naive times are read in the server's zone.
+
+    Returns:
+        float: Unix time.
+    """
+    if moment.tzinfo is None and zone:
+        try:
+            moment = moment.replace(tzinfo=ZoneInfo(zone))
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return moment.timestamp()
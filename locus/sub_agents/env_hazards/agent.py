@@ -1,6 +1,8 @@
 from google.adk.agents import Agent
 from .prompt import ENV_HAZARDS_PROMPT
-from .tools.air_quality import check_air_quality
+from .tools.air_quality_async import check_air_quality, check_air_quality_bulk
+from .tools.air_quality_series_async import get_air_quality_series
+from .tools.route_exposure_async import check_route_air_quality
 from ...shared_libraries.model_config import get_model_type
 
 env_hazards_agent = Agent(
@@ -8,5 +10,10 @@ env_hazards_agent = Agent(
     model=get_model_type("sub_agent"),
     instruction=ENV_HAZARDS_PROMPT,
     description="Assesses environmental safety and air quality for travel destinations.",
-    tools=[check_air_quality],
+    tools=[
+        check_air_quality,
+        check_air_quality_bulk,
+        get_air_quality_series,
+        check_route_air_quality,
+    ],
 )
@@ -1,8 +1,24 @@
+import contextvars
 import os
-import requests
-from locus.shared_libraries.geocoding import geocode_location
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+import numpy as np
+from locus.shared_libraries import deadline, http_client, rate_limit
+from locus.shared_libraries.env_config import env_float, env_int
+from locus.shared_libraries.geocoding import geocode_location, geocode_locations
+from locus.shared_libraries.spatial_cache import SpatialCache
 
+AIR_QUALITY_URL = "https://airquality.googleapis.com/v1/currentConditions:lookup"
 
+# Current conditions are published hourly, so entries are bucketed by clock
+# hour and roll over when the next hour's data is due.
+AIR_QUALITY_TTL = env_float("LOCUS_AIR_QUALITY_TTL", 3600)
+_air_quality_cache = SpatialCache(
+    "air_quality.current", bucket_seconds=AIR_QUALITY_TTL, ttl=AIR_QUALITY_TTL
+)
+
+
+@deadline.with_deadline()
 def check_air_quality(location: str) -> dict:
     """
     Checks air quality index and pollution levels for a location using Google Air Quality API.
@@ -27,76 +43,229 @@ def check_air_quality(location: str) -> dict:
         lat = geocode_result["lat"]
         lng = geocode_result["lng"]
 
-        # Use Google Air Quality API
-        air_quality_url = (
-            "https://airquality.googleapis.com/v1/currentConditions:lookup"
+        return lookup_air_quality(lat, lng, api_key, location)
+
+    except Exception as e:
+        return air_quality_error(e, location)
+
+
+@deadline.with_deadline()
+def check_air_quality_bulk(locations: List[str]) -> dict:
+    """
+    Checks air quality for several locations at once, e.g. to compare cities.
+
+    Args:
+        locations (list[str]): The cities or locations to check.
+
+    Returns:
+        dict: A dictionary containing:
+            - "locations": one check_air_quality-style result per location,
+              in input order
+            - "ranking": locations ordered from cleanest to most polluted air
+              by Universal AQI (higher is cleaner), where available
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if not locations:
+        return {"error": "No locations were given."}
+
+    unique = list(dict.fromkeys(locations))
+    # Comparing cities is a burst of lookups; let interactive calls go first.
+    with rate_limit.bulk():
+        geocoded = geocode_locations(unique)
+        results = {}
+        with ThreadPoolExecutor(max_workers=bulk_concurrency(unique)) as executor:
+            futures = {
+                location: executor.submit(
+                    contextvars.copy_context().run,
+                    lookup_air_quality,
+                    geocode_result["lat"],
+                    geocode_result["lng"],
+                    api_key,
+                    location,
+                )
+                for location, geocode_result in zip(unique, geocoded)
+                if "error" not in geocode_result
+            }
+            for location, geocode_result in zip(unique, geocoded):
+                if location not in futures:
+                    results[location] = {"error": geocode_result["error"]}
+                    continue
+                try:
+                    results[location] = futures[location].result()
+                except Exception as e:
+                    results[location] = air_quality_error(e, location)
+
+    return bulk_response(locations, results)
+
+
+def lookup_air_quality(lat: float, lng: float, api_key: str, location: str) -> dict:
+    """
+    Gets the parsed current air quality for a coordinate, from cache if fresh.
+
+    Raises:
+        Exception: If the lookup fails or returns no index data.
+    """
+    # Nearby coordinates share a recent result; concurrent misses share one call.
+    air_quality_data = _air_quality_cache.get_or_fetch(
+        lat, lng, fetch_air_quality_conditions, lat, lng, api_key
+    )
+    return parse_air_quality(air_quality_data, location, lat, lng)
+
+
+def air_quality_error(error: Exception, location: str) -> dict:
+    """Builds the tool response for a failed air quality lookup."""
+    if deadline.expired():
+        return deadline.degraded(
+            "Air quality service did not respond within the time budget.",
+            location=location,
+        )
+    return {"error": f"Failed to fetch air quality information: {str(error)}"}
+
+
+def bulk_concurrency(locations: List[str]) -> int:
+    """Number of lookups to run at once (LOCUS_AIR_QUALITY_BULK_CONCURRENCY)."""
+    return max(1, min(env_int("LOCUS_AIR_QUALITY_BULK_CONCURRENCY", 8), len(locations)))
+
+
+def bulk_response(locations: List[str], results: dict) -> dict:
+    """
+    Builds the check_air_quality_bulk() response.
+
+    Args:
+        locations (list[str]): The requested locations, in input order.
+        results (dict): Location -> check_air_quality-style result.
+
+    Returns:
+        dict: "locations" in input order, a "ranking" by Universal AQI and a
+            "summary", plus "degraded" if any lookup ran out of time.
+    """
+    entries = [results[location] for location in locations]
+    scored = {
+        location: result["air_quality"]["aqi_value"]
+        for location, result in results.items()
+        if "error" not in result
+        and result["air_quality"]["index"] == "uaqi"
+        and result["air_quality"]["aqi_value"] is not None
+    }
+    response = {
+        "locations": entries,
+        "ranking": [
+            {
+                "location": location,
+                "aqi_value": aqi,
+                "category": results[location]["air_quality"]["category"],
+            }
+            for location, aqi in sorted(scored.items(), key=lambda item: -item[1])
+        ],
+        "summary": {
+            "locations": len(results),
+            "failed": sum(1 for result in results.values() if "error" in result),
+        },
+    }
+    if any(result.get("degraded") for result in results.values()):
+        response["degraded"] = True
+    return response
+
+
+def worst_aqi(values: np.ndarray, higher_is_better: bool) -> int:
+    """
+    Position of the worst AQI among values, ignoring NaN.
+
+    Universal AQI runs from 0 (worst) to 100 (best); local indexes the other
+    way, so callers pass higher_is_better=True only for "uaqi" values.
+    """
+    return int(np.nanargmin(values) if higher_is_better else np.nanargmax(values))
+
+
+def parse_air_quality(
+    air_quality_data: dict, location: str, lat: float, lng: float
+) -> dict:
+    """
+    Shapes an Air Quality API current conditions payload into the tool response.
+
+    Raises:
+        Exception: If the payload is an API error or has no index data.
+    """
+    if "error" in air_quality_data:
+        raise Exception(
+            f"Air Quality API error: {air_quality_data['error']['message']}"
         )
-        # Use POST with JSON body as required by the API
-        air_quality_payload = {"location": {"latitude": lat, "longitude": lng}}
-        air_quality_params = {"key": api_key}
-
-        air_quality_response = requests.post(
-            air_quality_url,
-            params=air_quality_params,
-            json=air_quality_payload,
-            headers={"Content-Type": "application/json"},
+
+    # Parse air quality data
+    indexes = air_quality_data.get("indexes", [])
+    pollutants = air_quality_data.get("pollutants", [])
+
+    if not indexes:
+        raise Exception("No air quality data available for this location.")
+
+    # Get the main AQI index (usually AQI)
+    main_index = None
+    for index in indexes:
+        if index.get("code") == "uaqi":
+            main_index = index
+            break
+    if not main_index:
+        main_index = indexes[0]  # Use first available index
+
+    # Get pollutant details
+    pollutant_details = []
+    for pollutant in pollutants:
+        pollutant_details.append(
+            {
+                "code": pollutant.get("code"),
+                "display_name": pollutant.get("displayName"),
+                "full_name": pollutant.get("fullName"),
+                "concentration_value": pollutant.get("concentration", {}).get(
+                    "value"
+                ),
+                "concentration_units": pollutant.get("concentration", {}).get(
+                    "units"
+                ),
+            }
         )
-        air_quality_response.raise_for_status()
-        air_quality_data = air_quality_response.json()
-
-        if "error" in air_quality_data:
-            raise Exception(
-                f"Air Quality API error: {air_quality_data['error']['message']}"
-            )
-
-        # Parse air quality data
-        indexes = air_quality_data.get("indexes", [])
-        pollutants = air_quality_data.get("pollutants", [])
-
-        if not indexes:
-            raise Exception("No air quality data available for this location.")
-
-        # Get the main AQI index (usually AQI)
-        main_index = None
-        for index in indexes:
-            if index.get("code") == "uaqi":
-                main_index = index
-                break
-        if not main_index:
-            main_index = indexes[0]  # Use first available index
-
-        # Get pollutant details
-        pollutant_details = []
-        for pollutant in pollutants[:5]:  # Limit to top 5 pollutants
-            pollutant_details.append(
-                {
-                    "code": pollutant.get("code"),
-                    "display_name": pollutant.get("displayName"),
-                    "full_name": pollutant.get("fullName"),
-                    "concentration_value": pollutant.get("concentration", {}).get(
-                        "value"
-                    ),
-                    "concentration_units": pollutant.get("concentration", {}).get(
-                        "units"
-                    ),
-                }
-            )
-
-        return {
-            "location": location,
-            "coordinates": {"lat": lat, "lng": lng},
-            "air_quality": {
-                "index": main_index.get("code"),
-                "display_name": main_index.get("displayName"),
-                "aqi_value": main_index.get("aqi"),
-                "aqi_display": main_index.get("aqiDisplay"),
-                "category": main_index.get("category"),
-                "dominant_pollutant": main_index.get("dominantPollutant"),
-            },
-            "pollutants": pollutant_details,
-            "date_time": air_quality_data.get("dateTime"),
-            "source": "Google Air Quality API",
-        }
 
-    except Exception as e:
-        return {"error": f"Failed to fetch air quality information: {str(e)}"}
+    return {
+        "location": location,
+        "coordinates": {"lat": lat, "lng": lng},
+        "air_quality": {
+            "index": main_index.get("code"),
+            "display_name": main_index.get("displayName"),
+            "aqi_value": main_index.get("aqi"),
+            "aqi_display": main_index.get("aqiDisplay"),
+            "category": main_index.get("category"),
+            "dominant_pollutant": main_index.get("dominantPollutant"),
+        },
+        "pollutants": pollutant_details,
+        "date_time": air_quality_data.get("dateTime"),
+        "source": "Google Air Quality API",
+    }
+
+
+def fetch_air_quality_conditions(lat: float, lng: float, api_key: str) -> dict:
+    """
+    Fetches the raw Air Quality API current conditions for a coordinate.
+
+    Args:
+        lat (float): Latitude.
+        lng (float): Longitude.
+        api_key (str): Google Maps API key.
+
+    Returns:
+        dict: The currentConditions:lookup response body.
+    """
+    # Use POST with JSON body as required by the API
+    air_quality_payload = {"location": {"latitude": lat, "longitude": lng}}
+    air_quality_params = {"key": api_key}
+
+    air_quality_response = http_client.post(
+        AIR_QUALITY_URL,
+        params=air_quality_params,
+        json=air_quality_payload,
+        headers={"Content-Type": "application/json"},
+        idempotent=True,  # Read-only lookup, safe to retry
+    )
+    air_quality_response.raise_for_status()
+    return air_quality_response.json()
@@ -0,0 +1,121 @@
+"""
+Async variant of the air quality tool, registered with the env_hazards agent.
+
+Parsing is shared with the sync version in air_quality.py.
+"""
+
+import asyncio
+import os
+from typing import List
+from locus.shared_libraries import deadline, http_client, rate_limit
+from locus.shared_libraries.geocoding import (
+    geocode_location_async,
+    geocode_locations_async,
+)
+from .air_quality import (
+    AIR_QUALITY_URL,
+    _air_quality_cache,
+    air_quality_error,
+    bulk_concurrency,
+    bulk_response,
+    parse_air_quality,
+)
+
+
+@deadline.with_deadline()
+async def check_air_quality(location: str) -> dict:
+    """
+    Checks air quality index and pollution levels for a location using Google Air Quality API.
+
+    Args:
+        location (str): The city or location to check air quality for.
+
+    Returns:
+        dict: A dictionary containing air quality information.
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        geocode_result = await geocode_location_async(location)
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+
+        lat = geocode_result["lat"]
+        lng = geocode_result["lng"]
+
+        return await lookup_air_quality(lat, lng, api_key, location)
+
+    except Exception as e:
+        return air_quality_error(e, location)
+
+
+@deadline.with_deadline()
+async def check_air_quality_bulk(locations: List[str]) -> dict:
+    """
+    Checks air quality for several locations at once, e.g. to compare cities.
+
+    Args:
+        locations (list[str]): The cities or locations to check.
+
+    Returns:
+        dict: A dictionary containing:
+            - "locations": one check_air_quality-style result per location,
+              in input order
+            - "ranking": locations ordered from cleanest to most polluted air
+              by Universal AQI (higher is cleaner), where available
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if not locations:
+        return {"error": "No locations were given."}
+
+    unique = list(dict.fromkeys(locations))
+    semaphore = asyncio.Semaphore(bulk_concurrency(unique))
+
+    async def check(location: str, geocode_result: dict) -> dict:
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+        async with semaphore:
+            try:
+                return await lookup_air_quality(
+                    geocode_result["lat"], geocode_result["lng"], api_key, location
+                )
+            except Exception as e:
+                return air_quality_error(e, location)
+
+    # Comparing cities is a burst of lookups; let interactive calls go first.
+    with rate_limit.bulk():
+        geocoded = await geocode_locations_async(unique)
+        outcomes = await asyncio.gather(
+            *(check(location, result) for location, result in zip(unique, geocoded))
+        )
+
+    return bulk_response(locations, dict(zip(unique, outcomes)))
+
+
+async def lookup_air_quality(
+    lat: float, lng: float, api_key: str, location: str
+) -> dict:
+    """Async variant of air_quality.lookup_air_quality()."""
+    air_quality_data = await _air_quality_cache.get_or_fetch_async(
+        lat, lng, fetch_air_quality_conditions, lat, lng, api_key
+    )
+    return parse_air_quality(air_quality_data, location, lat, lng)
+
+
+async def fetch_air_quality_conditions(lat: float, lng: float, api_key: str) -> dict:
+    """Fetches the raw Air Quality API current conditions for a coordinate."""
+    air_quality_response = await http_client.apost(
+        AIR_QUALITY_URL,
+        params={"key": api_key},
+        json={"location": {"latitude": lat, "longitude": lng}},
+        headers={"Content-Type": "application/json"},
+        idempotent=True,  # Read-only lookup, safe to retry
+    )
+    air_quality_response.raise_for_status()
+    return air_quality_response.json()
@@ -0,0 +1,491 @@
+"""
+Hourly air quality over a date range, from history and forecast lookups.
+
+Past hours come from history:lookup (up to HISTORY_HOURS back) and the
+current and coming hours from forecast:lookup (up to FORECAST_HOURS ahead).
+Both endpoints are paged; every page is fetched in one pass and kept as
+compact columns (times, AQI, category, dominant pollutant) rather than the
+raw per-hour payloads.
+
+History is cached per geohash cell and UTC date, so overlapping ranges only
+fetch the days not seen before; the whole forecast horizon is cached per
+cell and clock hour. Statistics are computed with NumPy.
+"""
+
+import contextvars
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+import numpy as np
+from locus.shared_libraries import deadline, http_client
+from locus.shared_libraries.env_config import env_float
+from locus.shared_libraries.geocoding import geocode_location
+from locus.shared_libraries.spatial_cache import SpatialCache
+from .air_quality import worst_aqi
+
+FORECAST_URL = "https://airquality.googleapis.com/v1/forecast:lookup"
+HISTORY_URL = "https://airquality.googleapis.com/v1/history:lookup"
+
+# Service limits: history reaches 30 days back, forecasts 96 hours ahead.
+HISTORY_HOURS = 720
+FORECAST_HOURS = 96
+PAGE_SIZE = 72
+
+TIME_FORMAT = "%Y-%m-%dT%H:00Z"
+COLUMNS = ("times", "aqi", "category", "dominant_pollutant")
+
+# A forecast is published hourly and covers the whole horizon.
+_forecast_cache = SpatialCache(
+    "air_quality.forecast",
+    bucket_seconds=env_float("LOCUS_AIR_QUALITY_TTL", 3600),
+    ttl=env_float("LOCUS_AIR_QUALITY_TTL", 3600),
+)
+# Completed days of history do not change; today's is refetched hourly.
+_history_cache = SpatialCache(
+    "air_quality.history",
+    ttl=env_float("LOCUS_AIR_QUALITY_HISTORY_TTL", 30 * 24 * 3600),
+)
+
+
+@deadline.with_deadline()
+def get_air_quality_series(
+    location: str, start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> dict:
+    """
+    Gets hourly air quality for a location over a date range, past or future.
+
+    Args:
+        location (str): The city or location to check air quality for.
+        start_date (str, optional): First day in YYYY-MM-DD format (UTC).
+            Defaults to today. Can be up to 30 days in the past.
+        end_date (str, optional): Last day (inclusive) in YYYY-MM-DD format.
+            Defaults to start_date. Forecasts reach 4 days ahead.
+
+    Returns:
+        dict: A dictionary containing:
+            - "series": hourly AQI and dominant pollutant as arrays, starting
+              at "start" with one entry per hour (null where no data)
+            - "days": per-day mean AQI, worst AQI and the hour it occurs
+            - "summary": mean AQI over the range, the worst and best hours
+              and the hours spent in each AQI category
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        window = series_window(start_date, end_date)
+    except ValueError as e:
+        return {"error": str(e)}
+    history_range, forecast_range = split_window(*window)
+    if not history_range and not forecast_range:
+        return {"error": out_of_range_message()}
+
+    partial = {"location": location}
+    try:
+        geocode_result = geocode_location(location)
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+        lat = geocode_result["lat"]
+        lng = geocode_result["lng"]
+        partial["coordinates"] = {"lat": lat, "lng": lng}
+
+        # History and forecast are independent lookups; run them side by side.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            history = executor.submit(
+                contextvars.copy_context().run,
+                lookup_history,
+                lat,
+                lng,
+                api_key,
+                history_range,
+            )
+            forecast = executor.submit(
+                contextvars.copy_context().run,
+                lookup_forecast,
+                lat,
+                lng,
+                api_key,
+                forecast_range,
+            )
+            parts = [history.result(), forecast.result()]
+
+        return series_response(merge_columns(parts, *window), window, **partial)
+
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Air quality service did not respond within the time budget.",
+                **partial,
+            )
+        return {"error": f"Failed to fetch the air quality series: {str(e)}"}
+
+
+def lookup_history(
+    lat: float, lng: float, api_key: str, history_range: Optional[Tuple]
+) -> List[dict]:
+    """
+    Gets hourly history for a range, one column set per day, from cache if held.
+
+    Days missing from the cache are fetched in a single paged lookup that
+    spans them, then cached per day.
+
+    Args:
+        lat (float): Latitude.
+        lng (float): Longitude.
+        api_key (str): Google Maps API key.
+        history_range (tuple, optional): (start, end) datetimes, or None.
+
+    Returns:
+        list[dict]: Column sets covering the range.
+    """
+    if not history_range:
+        return []
+    days, missing_span = plan_history(lat, lng, history_range)
+    if missing_span:
+        fetched = fetch_series(
+            HISTORY_URL, "hoursInfo", series_body(lat, lng, *missing_span), api_key
+        )
+        days.extend(store_history(lat, lng, fetched, missing_span))
+    return days
+
+
+def lookup_forecast(
+    lat: float, lng: float, api_key: str, forecast_range: Optional[Tuple]
+) -> List[dict]:
+    """
+    Gets the forecast horizon's column set, from cache if fresh.
+
+    Args:
+        lat (float): Latitude.
+        lng (float): Longitude.
+        api_key (str): Google Maps API key.
+        forecast_range (tuple, optional): (start, end) datetimes, or None.
+
+    Returns:
+        list[dict]: The forecast column set, or nothing if not needed.
+    """
+    if not forecast_range:
+        return []
+    start, end = forecast_horizon()
+    return [
+        _forecast_cache.get_or_fetch(
+            lat,
+            lng,
+            fetch_series,
+            FORECAST_URL,
+            "hourlyForecasts",
+            series_body(lat, lng, start, end),
+            api_key,
+        )
+    ]
+
+
+def series_window(
+    start_date: Optional[str], end_date: Optional[str]
+) -> Tuple[datetime, datetime]:
+    """
+    Turns the requested dates into a UTC [start, end) window of whole days.
+
+    Raises:
+        ValueError: If a date is malformed or the range is reversed.
+    """
+    try:
+        start = (
+            datetime.strptime(start_date, "%Y-%m-%d")
+            if start_date
+            else datetime.now(timezone.utc).replace(tzinfo=None)
+        )
+        end = datetime.strptime(end_date, "%Y-%m-%d") if end_date else start
+    except ValueError:
+        raise ValueError("Invalid date format. Please use YYYY-MM-DD.")
+    start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = end.replace(hour=0, minute=0, second=0, microsecond=0)
+    if end < start:
+        raise ValueError("end_date must not be before start_date.")
+    return (
+        start.replace(tzinfo=timezone.utc),
+        (end + timedelta(days=1)).replace(tzinfo=timezone.utc),
+    )
+
+
+def current_hour() -> datetime:
+    return datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def forecast_horizon() -> Tuple[datetime, datetime]:
+    """The [start, end) hours a forecast lookup covers, starting this hour."""
+    start = current_hour()
+    return start, start + timedelta(hours=FORECAST_HOURS)
+
+
+def split_window(start: datetime, end: datetime) -> Tuple[Optional[Tuple], ...]:
+    """
+    Splits a window into the part served by history and the part forecast.
+
+    Hours before the current one are history; the current hour onwards is
+    forecast. Either part is None if the window does not reach it.
+
+    Returns:
+        tuple: (history range, forecast range), each a (start, end) pair.
+    """
+    now = current_hour()
+    history = (max(start, now - timedelta(hours=HISTORY_HOURS)), min(end, now))
+    forecast = (max(start, now), min(end, forecast_horizon()[1]))
+    return (
+        history if history[0] < history[1] else None,
+        forecast if forecast[0] < forecast[1] else None,
+    )
+
+
+def out_of_range_message() -> str:
+    return (
+        "Air quality data is available from 30 days ago up to 4 days ahead. "
+        "Please choose dates in that range."
+    )
+
+
+def series_body(lat: float, lng: float, start: datetime, end: datetime) -> dict:
+    """Builds a history or forecast lookup request for a [start, end) period."""
+    return {
+        "location": {"latitude": lat, "longitude": lng},
+        "period": {
+            "startTime": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            # The period's end hour is included, so stop one hour short.
+            "endTime": (end - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+        "pageSize": PAGE_SIZE,
+    }
+
+
+def fetch_series(url: str, records_key: str, body: dict, api_key: str) -> dict:
+    """
+    Fetches every page of a history or forecast lookup.
+
+    Args:
+        url (str): FORECAST_URL or HISTORY_URL.
+        records_key (str): The response field holding the hourly records.
+        body (dict): The request body from series_body().
+        api_key (str): Google Maps API key.
+
+    Returns:
+        dict: Compact columns of all hours (see compact_hours()).
+    """
+    records, page_token = [], None
+    # Bounded in case the service keeps returning tokens.
+    for _ in range(HISTORY_HOURS // PAGE_SIZE + 2):
+        payload = {**body, "pageToken": page_token} if page_token else body
+        response = http_client.post(
+            url,
+            params={"key": api_key},
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            idempotent=True,  # Read-only lookup, safe to retry
+        )
+        response.raise_for_status()
+        page = response.json()
+        records.extend(page.get(records_key, []))
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            break
+    return compact_hours(records)
+
+
+def compact_hours(records: List[dict]) -> dict:
+    """
+    Reduces hourly records to columns of time, AQI, category and pollutant.
+
+    The Universal AQI is used where present, as in check_air_quality.
+
+    Args:
+        records (list[dict]): hoursInfo or hourlyForecasts entries.
+
+    Returns:
+        dict: "index" (the AQI code) and one list per name in COLUMNS.
+    """
+    columns = {name: [] for name in COLUMNS}
+    codes = Counter()
+    for record in records:
+        indexes = record.get("indexes") or []
+        index = next((i for i in indexes if i.get("code") == "uaqi"), None)
+        index = index or (indexes[0] if indexes else {})
+        try:
+            time = datetime.strptime(record["dateTime"][:13], "%Y-%m-%dT%H")
+        except (KeyError, TypeError, ValueError):
+            continue
+        columns["times"].append(time.strftime(TIME_FORMAT))
+        columns["aqi"].append(index.get("aqi"))
+        columns["category"].append(index.get("category"))
+        columns["dominant_pollutant"].append(index.get("dominantPollutant"))
+        if index.get("code"):
+            codes[index["code"]] += 1
+    columns["index"] = codes.most_common(1)[0][0] if codes else None
+    return columns
+
+
+def plan_history(
+    lat: float, lng: float, history_range: Tuple[datetime, datetime]
+) -> Tuple[List[dict], Optional[Tuple[datetime, datetime]]]:
+    """
+    Splits a history range into cached days and the span still to fetch.
+
+    Returns:
+        tuple: (cached column sets, (start, end) of the smallest span
+            covering every uncached day, or None).
+    """
+    start, end = history_range
+    cached, missing = [], []
+    day = start.replace(hour=0)
+    while day < end:
+        value = _history_cache.get(lat, lng, bucket=day.strftime("%Y-%m-%d"))
+        if value is None:
+            missing.append(day)
+        else:
+            cached.append(value)
+        day += timedelta(days=1)
+    if not missing:
+        return cached, None
+    return cached, (
+        max(start, missing[0]),
+        min(end, missing[-1] + timedelta(days=1)),
+    )
+
+
+def store_history(
+    lat: float, lng: float, columns: dict, span: Tuple[datetime, datetime]
+) -> List[dict]:
+    """
+    Splits fetched history into days and caches the ones that are complete.
+
+    A day is cached for LOCUS_AIR_QUALITY_HISTORY_TTL once it is over, and
+    today's partial day until the current hour ends, when another hour of
+    history is due. Days the fetch only partly covered are not cached.
+
+    Returns:
+        list[dict]: One column set per fetched day.
+    """
+    now = current_hour()
+    dates = np.array([t[:10] for t in columns["times"]])
+    days = []
+    for date in np.unique(dates):
+        rows = np.flatnonzero(dates == date)
+        day = {name: [columns[name][i] for i in rows] for name in COLUMNS}
+        day["index"] = columns["index"]
+        days.append(day)
+        day_start = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        day_end = day_start + timedelta(days=1)
+        if day_start < span[0] or (day_end > span[1] and day_end <= now):
+            continue
+        ttl = None
+        if day_end > now:
+            hour_end = now + timedelta(hours=1)
+            ttl = max((hour_end - datetime.now(timezone.utc)).total_seconds(), 1)
+        _history_cache.set(lat, lng, day, bucket=str(date), ttl=ttl)
+    return days
+
+
+def merge_columns(parts: List[List[dict]], start: datetime, end: datetime) -> dict:
+    """
+    Joins column sets into one time-ordered set clipped to [start, end).
+
+    Earlier parts win where hours overlap, so measured history takes
+    precedence over the forecast.
+    """
+    first, last = start.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)
+    by_time, codes = {}, Counter()
+    for columns in (c for part in parts for c in part):
+        if columns.get("index"):
+            codes[columns["index"]] += 1
+        for row in zip(*(columns[name] for name in COLUMNS)):
+            if first <= row[0] < last:
+                by_time.setdefault(row[0], row)
+    rows = [by_time[t] for t in sorted(by_time)]
+    merged = {name: [row[i] for row in rows] for i, name in enumerate(COLUMNS)}
+    merged["index"] = codes.most_common(1)[0][0] if codes else None
+    return merged
+
+
+def series_response(
+    columns: dict, window: Tuple[datetime, datetime], **partial
+) -> dict:
+    """
+    Builds the get_air_quality_series() response from merged columns.
+
+    Args:
+        columns (dict): Columns from merge_columns().
+        window (tuple): The requested (start, end) window.
+        **partial: Fields included as is (location, coordinates).
+
+    Returns:
+        dict: "series", "days" and "summary", as described on the tool.
+    """
+    higher_is_better = columns["index"] == "uaqi"
+    times = np.array(columns["times"], dtype="datetime64[h]")
+    aqi = np.array(
+        [np.nan if v is None else v for v in columns["aqi"]], dtype=float
+    )
+    response = {
+        **partial,
+        "time_zone": "UTC",
+        "index": columns["index"],
+        "higher_is_better": higher_is_better,
+        "requested": {
+            "start": window[0].strftime(TIME_FORMAT),
+            "end": window[1].strftime(TIME_FORMAT),
+        },
+    }
+    if not times.size or np.isnan(aqi).all():
+        return {**response, "error": "No air quality data available for these dates."}
+
+    # A regular hourly grid, so the series needs no per-hour timestamps.
+    offsets = (times - times[0]).astype(int)
+    grid_aqi = np.full(offsets[-1] + 1, np.nan)
+    grid_aqi[offsets] = aqi
+    grid_pollutant = [None] * (offsets[-1] + 1)
+    for offset, pollutant in zip(offsets, columns["dominant_pollutant"]):
+        grid_pollutant[offset] = pollutant
+    response["series"] = {
+        "start": columns["times"][0],
+        "step_hours": 1,
+        "aqi": [None if np.isnan(v) else int(v) for v in grid_aqi],
+        "dominant_pollutant": grid_pollutant,
+    }
+
+    def hour(i: int) -> dict:
+        return {
+            "time": columns["times"][i],
+            "aqi": columns["aqi"][i],
+            "category": columns["category"][i],
+            "dominant_pollutant": columns["dominant_pollutant"][i],
+        }
+
+    dates = times.astype("datetime64[D]")
+    days, inverse = np.unique(dates, return_inverse=True)
+    valid = ~np.isnan(aqi)
+    counts = np.bincount(inverse, weights=valid, minlength=len(days))
+    sums = np.bincount(
+        inverse, weights=np.where(valid, aqi, 0.0), minlength=len(days)
+    )
+    response["days"] = []
+    for d, day in enumerate(days):
+        rows = np.flatnonzero((inverse == d) & valid)
+        entry = {"date": str(day), "hours": int(counts[d])}
+        if rows.size:
+            worst = rows[worst_aqi(aqi[rows], higher_is_better)]
+            entry["mean_aqi"] = round(float(sums[d] / counts[d]), 1)
+            entry["worst"] = hour(worst)
+        response["days"].append(entry)
+
+    categories = Counter(c for c in columns["category"] if c)
+    worst = worst_aqi(aqi, higher_is_better)
+    best = worst_aqi(aqi, not higher_is_better)
+    response["summary"] = {
+        "hours": int(valid.sum()),
+        "mean_aqi": round(float(np.nanmean(aqi)), 1),
+        "worst_hour": hour(worst),
+        "best_hour": hour(best),
+        "hours_by_category": dict(categories.most_common()),
+    }
+    return response
@@ -0,0 +1,144 @@
+"""
+Async variant of the air quality series tool, registered with the
+env_hazards agent.
+
+Window planning, caching and statistics are shared with the sync version
+in air_quality_series.py.
+"""
+
+import asyncio
+import os
+from typing import List, Optional, Tuple
+from locus.shared_libraries import deadline, http_client
+from locus.shared_libraries.geocoding import geocode_location_async
+from .air_quality_series import (
+    FORECAST_URL,
+    HISTORY_HOURS,
+    HISTORY_URL,
+    PAGE_SIZE,
+    _forecast_cache,
+    compact_hours,
+    forecast_horizon,
+    merge_columns,
+    out_of_range_message,
+    plan_history,
+    series_body,
+    series_response,
+    series_window,
+    split_window,
+    store_history,
+)
+
+
+@deadline.with_deadline()
+async def get_air_quality_series(
+    location: str, start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> dict:
+    """
+    Gets hourly air quality for a location over a date range, past or future.
+
+    Args:
+        location (str): The city or location to check air quality for.
+        start_date (str, optional): First day in YYYY-MM-DD format (UTC).
+            Defaults to today. Can be up to 30 days in the past.
+        end_date (str, optional): Last day (inclusive) in YYYY-MM-DD format.
+            Defaults to start_date. Forecasts reach 4 days ahead.
+
+    Returns:
+        dict: A dictionary containing:
+            - "series": hourly AQI and dominant pollutant as arrays, starting
+              at "start" with one entry per hour (null where no data)
+            - "days": per-day mean AQI, worst AQI and the hour it occurs
+            - "summary": mean AQI over the range, the worst and best hours
+              and the hours spent in each AQI category
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        window = series_window(start_date, end_date)
+    except ValueError as e:
+        return {"error": str(e)}
+    history_range, forecast_range = split_window(*window)
+    if not history_range and not forecast_range:
+        return {"error": out_of_range_message()}
+
+    partial = {"location": location}
+    try:
+        geocode_result = await geocode_location_async(location)
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+        lat = geocode_result["lat"]
+        lng = geocode_result["lng"]
+        partial["coordinates"] = {"lat": lat, "lng": lng}
+
+        parts = await asyncio.gather(
+            lookup_history(lat, lng, api_key, history_range),
+            lookup_forecast(lat, lng, api_key, forecast_range),
+        )
+        return series_response(merge_columns(parts, *window), window, **partial)
+
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Air quality service did not respond within the time budget.",
+                **partial,
+            )
+        return {"error": f"Failed to fetch the air quality series: {str(e)}"}
+
+
+async def lookup_history(
+    lat: float, lng: float, api_key: str, history_range: Optional[Tuple]
+) -> List[dict]:
+    """Async variant of air_quality_series.lookup_history()."""
+    if not history_range:
+        return []
+    days, missing_span = plan_history(lat, lng, history_range)
+    if missing_span:
+        fetched = await fetch_series(
+            HISTORY_URL, "hoursInfo", series_body(lat, lng, *missing_span), api_key
+        )
+        days.extend(store_history(lat, lng, fetched, missing_span))
+    return days
+
+
+async def lookup_forecast(
+    lat: float, lng: float, api_key: str, forecast_range: Optional[Tuple]
+) -> List[dict]:
+    """Async variant of air_quality_series.lookup_forecast()."""
+    if not forecast_range:
+        return []
+    start, end = forecast_horizon()
+    return [
+        await _forecast_cache.get_or_fetch_async(
+            lat,
+            lng,
+            fetch_series,
+            FORECAST_URL,
+            "hourlyForecasts",
+            series_body(lat, lng, start, end),
+            api_key,
+        )
+    ]
+
+
+async def fetch_series(url: str, records_key: str, body: dict, api_key: str) -> dict:
+    """Fetches every page of a history or forecast lookup; see the sync version."""
+    records, page_token = [], None
+    for _ in range(HISTORY_HOURS // PAGE_SIZE + 2):
+        payload = {**body, "pageToken": page_token} if page_token else body
+        response = await http_client.apost(
+            url,
+            params={"key": api_key},
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            idempotent=True,  # Read-only lookup, safe to retry
+        )
+        response.raise_for_status()
+        page = response.json()
+        records.extend(page.get(records_key, []))
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            break
+    return compact_hours(records)
@@ -0,0 +1,262 @@
+"""
+Air quality exposure along a route.
+
+The route's overview polyline is decoded and resampled at a fixed spacing
+(see shared_libraries/polyline.py). Samples are deduplicated by the air
+quality cache's geohash cell, so a route costs at most one lookup per
+distinct cell it crosses, and cells already cached cost none. The lookups
+run concurrently at bulk priority.
+"""
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import numpy as np
+from locus.shared_libraries import deadline, polyline, rate_limit
+from locus.shared_libraries.env_config import env_float, env_int
+from locus.shared_libraries.directions import TRAVEL_MODES, get_directions
+from .air_quality import (
+    _air_quality_cache,
+    air_quality_error,
+    bulk_concurrency,
+    lookup_air_quality,
+    worst_aqi,
+)
+
+
+@deadline.with_deadline()
+def check_route_air_quality(
+    origin: str,
+    destination: str,
+    mode: str = "transit",
+    encoded_polyline: Optional[str] = None,
+) -> dict:
+    """
+    Estimates air quality exposure along a route between two places.
+
+    Args:
+        origin (str): The starting address or place.
+        destination (str): The destination address or place.
+        mode (str, optional): "driving", "walking", "bicycling" or "transit".
+            Defaults to "transit".
+        encoded_polyline (str, optional): A route's overview_polyline
+            "points" string (e.g. from get_local_transport with
+            include_steps). If given, the route is not looked up again.
+
+    Returns:
+        dict: A dictionary containing:
+            - "segments": stretches of the route with the same air quality,
+              with their distance range, AQI and estimated minutes
+            - "summary": route length, distance-weighted AQI, the worst
+              stretch and the distance spent in each AQI category
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if mode not in TRAVEL_MODES:
+        return {"error": f"Unknown travel mode '{mode}'. Use one of {TRAVEL_MODES}."}
+
+    partial = {"origin": origin, "destination": destination, "mode": mode}
+    try:
+        if encoded_polyline:
+            encoded, duration = encoded_polyline, None
+        else:
+            routes = get_directions(origin, destination, api_key, mode)
+            if not routes:
+                return {
+                    "error": f"No {mode} route found from {origin} to {destination}."
+                }
+            encoded, duration = route_geometry(routes[0])
+
+        plan = plan_route_samples(encoded)
+        with rate_limit.bulk(), ThreadPoolExecutor(
+            max_workers=bulk_concurrency(plan["cells"])
+        ) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    lookup_air_quality,
+                    lat,
+                    lng,
+                    api_key,
+                    destination,
+                )
+                for lat, lng in plan["cell_points"]
+            ]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(air_quality_error(e, destination))
+
+        return {**partial, **exposure_response(plan, results, duration)}
+
+    except ValueError as e:
+        return {"error": f"Could not read the route geometry: {str(e)}"}
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Route air quality did not complete within the time budget.",
+                **partial,
+            )
+        return {"error": f"Failed to check air quality along the route: {str(e)}"}
+
+
+def route_geometry(route: dict) -> tuple:
+    """
+    Extracts the encoded overview polyline and total duration of a route.
+
+    Args:
+        route (dict): One Directions API route.
+
+    Returns:
+        tuple: (encoded polyline, duration in seconds or None).
+    """
+    encoded = route.get("overview_polyline", {}).get("points")
+    if not encoded:
+        raise ValueError("the route has no overview polyline")
+    durations = [leg.get("duration", {}).get("value") for leg in route.get("legs", [])]
+    duration = sum(durations) if durations and None not in durations else None
+    return encoded, duration
+
+
+def plan_route_samples(encoded: str) -> dict:
+    """
+    Decodes a route and picks the air quality lookups that cover it.
+
+    Samples are LOCUS_ROUTE_SAMPLE_METERS apart, stretched on long routes so
+    there are at most LOCUS_ROUTE_MAX_SAMPLES of them, and grouped by geohash
+    cell.
+
+    Args:
+        encoded (str): The encoded overview polyline.
+
+    Returns:
+        dict: "distances" of the samples along the route (meters), "cells"
+            (distinct geohash cells), "cell_points" (one (lat, lng) per cell)
+            and "sample_cells" (each sample's index into cells).
+
+    Raises:
+        ValueError: If the polyline is invalid or empty.
+    """
+    points = polyline.decode(encoded)
+    if not len(points):
+        raise ValueError("the route polyline is empty")
+    length = float(polyline.segment_lengths(points).sum()) if len(points) > 1 else 0
+    max_samples = max(2, env_int("LOCUS_ROUTE_MAX_SAMPLES", 60))
+    spacing = max(
+        env_float("LOCUS_ROUTE_SAMPLE_METERS", 500), length / (max_samples - 1), 1.0
+    )
+    samples, distances = polyline.resample(points, spacing)
+    sample_cells = [_air_quality_cache.cell(lat, lng) for lat, lng in samples]
+    cells, first, inverse = np.unique(
+        sample_cells, return_index=True, return_inverse=True
+    )
+    return {
+        "distances": distances,
+        "cells": list(cells),
+        "cell_points": [tuple(samples[i]) for i in first],
+        "sample_cells": inverse.reshape(-1),
+    }
+
+
+def exposure_response(
+    plan: dict, results: List[dict], duration: Optional[float]
+) -> dict:
+    """
+    Builds per-segment exposure and the route summary from cell lookups.
+
+    Each stretch between two samples takes the air quality of the cell its
+    first sample lies in; consecutive stretches with the same AQI are merged
+    into one segment.
+
+    Args:
+        plan (dict): The plan from plan_route_samples().
+        results (list[dict]): check_air_quality-style result per cell.
+        duration (float, optional): Route duration in seconds, used to
+            estimate the minutes spent in each segment.
+
+    Returns:
+        dict: "segments", "summary" and, if any lookup ran out of time,
+            "degraded".
+    """
+    distances = plan["distances"]
+    quality = [r.get("air_quality", {}) if "error" not in r else {} for r in results]
+    cell_aqi = np.array(
+        [np.nan if q.get("aqi_value") is None else q["aqi_value"] for q in quality],
+        dtype=float,
+    )
+    index_codes = {q.get("index") for q in quality if q.get("index")}
+    higher_is_better = index_codes == {"uaqi"}
+
+    if len(distances) < 2:
+        stretch_cells = plan["sample_cells"][:1]
+        lengths = np.zeros(1)
+        starts = ends = distances[:1]
+    else:
+        stretch_cells = plan["sample_cells"][:-1]
+        lengths = np.diff(distances)
+        starts, ends = distances[:-1], distances[1:]
+    stretch_aqi = cell_aqi[stretch_cells]
+
+    # Runs of equal AQI (missing values compare equal to each other).
+    key = np.where(np.isnan(stretch_aqi), -1.0, stretch_aqi)
+    run_starts = np.concatenate(([0], np.flatnonzero(key[1:] != key[:-1]) + 1))
+    run_ends = np.append(run_starts[1:], len(key))
+    run_lengths = np.add.reduceat(lengths, run_starts)
+    total = float(distances[-1])
+    minutes_per_meter = duration / 60 / total if duration and total else None
+
+    segments = []
+    for start, end, meters in zip(run_starts, run_ends, run_lengths):
+        q = quality[stretch_cells[start]]
+        segment = {
+            "from_km": round(float(starts[start]) / 1000, 2),
+            "to_km": round(float(ends[end - 1]) / 1000, 2),
+            "aqi_value": q.get("aqi_value"),
+            "category": q.get("category"),
+            "dominant_pollutant": q.get("dominant_pollutant"),
+        }
+        if minutes_per_meter is not None:
+            segment["minutes"] = round(float(meters) * minutes_per_meter, 1)
+        segments.append(segment)
+
+    covered = ~np.isnan(stretch_aqi)
+    summary = {
+        "route_km": round(total / 1000, 2),
+        "samples": len(distances),
+        "cells_looked_up": len(results),
+        "aqi_index": index_codes.pop() if len(index_codes) == 1 else None,
+        "coverage_percent": round(
+            float(lengths[covered].sum() / lengths.sum() * 100)
+            if lengths.sum()
+            else float(covered.all()) * 100,
+            1,
+        ),
+        "distance_weighted_aqi": None,
+        "worst_segment": None,
+        "km_by_category": {},
+    }
+    if covered.any():
+        weights = lengths[covered]
+        summary["distance_weighted_aqi"] = round(
+            float(np.average(stretch_aqi[covered], weights=weights))
+            if weights.sum()
+            else float(stretch_aqi[covered].mean()),
+            1,
+        )
+        run_aqi = np.array([s["aqi_value"] for s in segments], dtype=float)
+        summary["worst_segment"] = segments[worst_aqi(run_aqi, higher_is_better)]
+        for segment, meters in zip(segments, run_lengths):
+            if segment["category"] is not None:
+                km = summary["km_by_category"].get(segment["category"], 0.0)
+                summary["km_by_category"][segment["category"]] = round(
+                    km + float(meters) / 1000, 2
+                )
+
+    response = {"segments": segments, "summary": summary}
+    if any(r.get("degraded") for r in results):
+        response["degraded"] = True
+    return response
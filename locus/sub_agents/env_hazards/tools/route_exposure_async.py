@@ -0,0 +1,88 @@
+"""
+Async variant of the route air quality tool, registered with the env_hazards
+agent.
+
+Route sampling and the exposure summary are shared with the sync version in
+route_exposure.py.
+"""
+
+import asyncio
+import os
+from typing import Optional
+from locus.shared_libraries import deadline, rate_limit
+from locus.shared_libraries.directions import TRAVEL_MODES, get_directions_async
+from .air_quality import air_quality_error, bulk_concurrency
+from .air_quality_async import lookup_air_quality
+from .route_exposure import exposure_response, plan_route_samples, route_geometry
+
+
+@deadline.with_deadline()
+async def check_route_air_quality(
+    origin: str,
+    destination: str,
+    mode: str = "transit",
+    encoded_polyline: Optional[str] = None,
+) -> dict:
+    """
+    Estimates air quality exposure along a route between two places.
+
+    Args:
+        origin (str): The starting address or place.
+        destination (str): The destination address or place.
+        mode (str, optional): "driving", "walking", "bicycling" or "transit".
+            Defaults to "transit".
+        encoded_polyline (str, optional): A route's overview_polyline
+            "points" string (e.g. from get_local_transport with
+            include_steps). If given, the route is not looked up again.
+
+    Returns:
+        dict: A dictionary containing:
+            - "segments": stretches of the route with the same air quality,
+              with their distance range, AQI and estimated minutes
+            - "summary": route length, distance-weighted AQI, the worst
+              stretch and the distance spent in each AQI category
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if mode not in TRAVEL_MODES:
+        return {"error": f"Unknown travel mode '{mode}'. Use one of {TRAVEL_MODES}."}
+
+    partial = {"origin": origin, "destination": destination, "mode": mode}
+    try:
+        if encoded_polyline:
+            encoded, duration = encoded_polyline, None
+        else:
+            routes = await get_directions_async(origin, destination, api_key, mode)
+            if not routes:
+                return {
+                    "error": f"No {mode} route found from {origin} to {destination}."
+                }
+            encoded, duration = route_geometry(routes[0])
+
+        plan = plan_route_samples(encoded)
+        semaphore = asyncio.Semaphore(bulk_concurrency(plan["cells"]))
+
+        async def check(lat: float, lng: float) -> dict:
+            async with semaphore:
+                try:
+                    return await lookup_air_quality(lat, lng, api_key, destination)
+                except Exception as e:
+                    return air_quality_error(e, destination)
+
+        with rate_limit.bulk():
+            results = await asyncio.gather(
+                *(check(lat, lng) for lat, lng in plan["cell_points"])
+            )
+
+        return {**partial, **exposure_response(plan, results, duration)}
+
+    except ValueError as e:
+        return {"error": f"Could not read the route geometry: {str(e)}"}
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Route air quality did not complete within the time budget.",
+                **partial,
+            )
+        return {"error": f"Failed to check air quality along the route: {str(e)}"}
@@ -1,7 +1,8 @@
 from google.adk.agents import Agent
 from google.adk.tools import AgentTool
 from .prompt import EXPLORER_PROMPT
-from .tools.suggestions import suggest_experiences
+from .tools.suggestions_async import suggest_experiences
+from ..navigator.tools.place_details_async import get_place_details
 from ..search.agent import search_agent
 from ...shared_libraries.model_config import get_model_type
 
@@ -13,5 +14,5 @@ explorer_agent = Agent(
     model=get_model_type("sub_agent"),
     instruction=EXPLORER_PROMPT,
     description="Suggests experiences, attractions, and activities based on user preferences, travel context, and current conditions.",
-    tools=[suggest_experiences, search_tool],
+    tools=[suggest_experiences, get_place_details, search_tool],
 )
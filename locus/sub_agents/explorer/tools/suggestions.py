@@ -1,9 +1,11 @@
 import os
-import googlemaps
 from typing import Optional
+from locus.shared_libraries import deadline
 from locus.shared_libraries.geocoding import geocode_location
+from locus.shared_libraries.http_client import get_gmaps_client
 
 
+@deadline.with_deadline()
 def suggest_experiences(
     location: str, 
     preferences: Optional[str] = None, 
@@ -24,7 +26,7 @@ def suggest_experiences(
     if not api_key:
         return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
 
-    gmaps = googlemaps.Client(key=api_key)
+    gmaps = get_gmaps_client(api_key)
 
     try:
         # Geocode the location using shared utility
@@ -36,55 +38,95 @@ def suggest_experiences(
         lng = geocode_result["lng"]
 
         # Determine place types based on preferences and weather
-        place_types = []
-        if preferences:
-            pref_lower = preferences.lower()
-            if "adventure" in pref_lower or "active" in pref_lower or "outdoor" in pref_lower:
-                place_types = ["amusement_park", "park", "campground", "hiking_area"]
-            elif "relax" in pref_lower or "calm" in pref_lower or "peaceful" in pref_lower:
-                place_types = ["park", "cafe", "spa", "library"]
-            elif "culture" in pref_lower or "art" in pref_lower or "history" in pref_lower:
-                place_types = ["museum", "art_gallery", "historical_site", "church"]
-            elif "food" in pref_lower or "dining" in pref_lower or "restaurant" in pref_lower:
-                place_types = ["restaurant", "cafe", "bar", "food"]
-            elif "shop" in pref_lower or "shopping" in pref_lower:
-                place_types = ["shopping_mall", "store", "market"]
-            elif "nightlife" in pref_lower or "night" in pref_lower or "party" in pref_lower:
-                place_types = ["night_club", "bar", "casino"]
-            elif "family" in pref_lower or "kids" in pref_lower:
-                place_types = ["amusement_park", "zoo", "aquarium", "park"]
-            else:
-                place_types = ["tourist_attraction", "point_of_interest"]
-        elif weather:
-            if weather.lower() in ["sunny", "clear", "nice"]:
-                place_types = ["park", "beach", "outdoor_activity", "hiking_area"]
-            elif weather.lower() in ["rainy", "wet", "cold"]:
-                place_types = ["museum", "movie_theater", "shopping_mall", "cafe"]
-            else:
-                place_types = ["tourist_attraction", "point_of_interest"]
-        else:
-            place_types = ["tourist_attraction", "point_of_interest"]
+        place_types = select_place_types(preferences, weather)
 
         experiences = []
+        timed_out = False
         for place_type in place_types[
             :2
         ]:  # Limit to 2 types to avoid too many API calls
-            places_result = gmaps.places_nearby(
-                location=(lat, lng),
-                radius=10000,  # 10km radius
-                type=place_type,
-            )
+            try:
+                places_result = gmaps.places_nearby(
+                    location=(lat, lng),
+                    radius=10000,  # 10km radius
+                    type=place_type,
+                )
+            except Exception:
+                if not deadline.expired():
+                    raise
+                timed_out = True
+                break
             for place in places_result.get("results", [])[:3]:  # 3 per type
-                name = place.get("name", "Unknown")
-                rating = place.get("rating", "N/A")
-                experiences.append(f"{name} (Rating: {rating})")
+                experiences.append(format_experience(place))
 
         if not experiences:
+            if timed_out:
+                return deadline.degraded(
+                    "Places service did not respond within the time budget."
+                )
             return {
                 "message": f"No specific experiences found for {location} with the given criteria."
             }
 
-        return {"experiences": experiences[:5]}  # Limit to 5 suggestions
+        result = {"experiences": experiences[:5]}  # Limit to 5 suggestions
+        if timed_out:
+            # Some place types were skipped once the time budget ran out.
+            result["degraded"] = True
+        return result
 
     except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Places service did not respond within the time budget."
+            )
         return {"error": str(e)}
+
+
+def select_place_types(
+    preferences: Optional[str] = None, weather: Optional[str] = None
+) -> list:
+    """
+    Chooses Places API types to search based on preferences or weather.
+
+    Args:
+        preferences (str, optional): What the user is looking for.
+        weather (str, optional): The current weather conditions.
+
+    Returns:
+        list: Place types, most relevant first.
+    """
+    if preferences:
+        pref_lower = preferences.lower()
+        if "adventure" in pref_lower or "active" in pref_lower or "outdoor" in pref_lower:
+            place_types = ["amusement_park", "park", "campground", "hiking_area"]
+        elif "relax" in pref_lower or "calm" in pref_lower or "peaceful" in pref_lower:
+            place_types = ["park", "cafe", "spa", "library"]
+        elif "culture" in pref_lower or "art" in pref_lower or "history" in pref_lower:
+            place_types = ["museum", "art_gallery", "historical_site", "church"]
+        elif "food" in pref_lower or "dining" in pref_lower or "restaurant" in pref_lower:
+            place_types = ["restaurant", "cafe", "bar", "food"]
+        elif "shop" in pref_lower or "shopping" in pref_lower:
+            place_types = ["shopping_mall", "store", "market"]
+        elif "nightlife" in pref_lower or "night" in pref_lower or "party" in pref_lower:
+            place_types = ["night_club", "bar", "casino"]
+        elif "family" in pref_lower or "kids" in pref_lower:
+            place_types = ["amusement_park", "zoo", "aquarium", "park"]
+        else:
+            place_types = ["tourist_attraction", "point_of_interest"]
+    elif weather:
+        if weather.lower() in ["sunny", "clear", "nice"]:
+            place_types = ["park", "beach", "outdoor_activity", "hiking_area"]
+        elif weather.lower() in ["rainy", "wet", "cold"]:
+            place_types = ["museum", "movie_theater", "shopping_mall", "cafe"]
+        else:
+            place_types = ["tourist_attraction", "point_of_interest"]
+    else:
+        place_types = ["tourist_attraction", "point_of_interest"]
+    return place_types
+
+
+def format_experience(place: dict) -> str:
+    """Formats a Places API result as a short experience suggestion."""
+    name = place.get("name", "Unknown")
+    rating = place.get("rating", "N/A")
+    return f"{name} (Rating: {rating}, place_id: {place.get('place_id')})"
@@ -0,0 +1,91 @@
+"""
+Async variant of suggest_experiences, registered with the explorer agent.
+
+Calls the Places web service directly over the shared async HTTP client,
+since the googlemaps library only offers a blocking client.
+"""
+
+import asyncio
+import os
+from typing import Optional
+from locus.shared_libraries import deadline, http_client
+from locus.shared_libraries.geocoding import geocode_location_async
+from .suggestions import format_experience, select_place_types
+
+
+@deadline.with_deadline()
+async def suggest_experiences(
+    location: str,
+    preferences: Optional[str] = None,
+    weather: Optional[str] = None
+) -> dict:
+    """
+    Suggests experiences based on location, user preferences, or weather using Google Places API.
+
+    Args:
+        location (str): The location to find experiences.
+        preferences (str, optional): What the user is looking for (e.g., "adventure activities", "cultural sites", "relaxation", "nightlife", "family-friendly").
+        weather (str, optional): The current weather conditions (e.g., "sunny", "rainy").
+
+    Returns:
+        dict: A dictionary containing a list of suggested experiences.
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        geocode_result = await geocode_location_async(location)
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+
+        lat = geocode_result["lat"]
+        lng = geocode_result["lng"]
+
+        place_types = select_place_types(preferences, weather)
+
+        # Limit to 2 types to avoid too many API calls; both are fetched at once.
+        responses = await asyncio.gather(
+            *(
+                http_client.amaps_get(
+                    "place/nearbysearch",
+                    {"location": f"{lat},{lng}", "radius": 10000, "type": place_type},
+                    api_key,
+                )
+                for place_type in place_types[:2]
+            ),
+            return_exceptions=True,
+        )
+
+        experiences = []
+        timed_out = False
+        for places_result in responses:
+            if isinstance(places_result, Exception):
+                if not deadline.expired():
+                    raise places_result
+                timed_out = True
+                continue
+            for place in places_result.get("results", [])[:3]:  # 3 per type
+                experiences.append(format_experience(place))
+
+        if not experiences:
+            if timed_out:
+                return deadline.degraded(
+                    "Places service did not respond within the time budget."
+                )
+            return {
+                "message": f"No specific experiences found for {location} with the given criteria."
+            }
+
+        result = {"experiences": experiences[:5]}  # Limit to 5 suggestions
+        if timed_out:
+            # Some place types were skipped once the time budget ran out.
+            result["degraded"] = True
+        return result
+
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Places service did not respond within the time budget."
+            )
+        return {"error": str(e)}
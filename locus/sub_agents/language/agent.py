@@ -1,8 +1,8 @@
 from google.adk.agents import Agent
 from .prompt import LANGUAGE_PROMPT
-from .tools.translator import translate_text
-from .tools.phrasebook import generate_phrasebook
-from .tools.speech_translator import speech_translation_guide
+from .tools.translator_async import translate_text
+from .tools.phrasebook_async import generate_phrasebook
+from .tools.speech_translator_async import speech_translation_guide
 from ...shared_libraries.model_config import get_model_type
 
 language_agent = Agent(
@@ -1,8 +1,9 @@
 import os
-import requests
 from typing import Optional
+from locus.shared_libraries import deadline, http_client, rate_limit
 
 
+@deadline.with_deadline()
 def generate_phrasebook(destination: str, context: Optional[str] = None) -> dict:
     """
     Generates a customized phrasebook for travelers based on destination and context.
@@ -18,6 +19,45 @@ def generate_phrasebook(destination: str, context: Optional[str] = None) -> dict
     if not api_key:
         return {"error": "GOOGLE_CLOUD_TRANSLATION_API_KEY not found in .env file."}
 
+    selected_categories = select_phrase_categories(context)
+
+    # Get local language for destination
+    local_language = get_destination_language(destination)
+    if not local_language:
+        return {"error": f"Could not determine primary language for {destination}"}
+
+    phrasebook = {}
+
+    # A phrasebook is a burst of translations; let interactive calls go first.
+    with rate_limit.bulk():
+        for category, phrases in selected_categories.items():
+            translations = [
+                translate_phrase(phrase, local_language, api_key) for phrase in phrases
+            ]
+            phrasebook[category] = build_phrase_entries(phrases, translations)
+
+    result = {
+        "destination": destination,
+        "local_language": local_language,
+        "phrasebook": phrasebook,
+        "cultural_tips": get_cultural_tips(destination),
+    }
+    if deadline.expired():
+        # Phrases still untranslated when the time budget ran out are left out.
+        result["degraded"] = True
+    return result
+
+
+def select_phrase_categories(context: Optional[str] = None) -> dict:
+    """
+    Selects the phrase categories to include in a phrasebook.
+
+    Args:
+        context (str, optional): Specific context like "restaurant" or "emergency".
+
+    Returns:
+        dict: Mapping of category name to English phrases.
+    """
     # Define essential phrase categories
     categories = {
         "greetings": [
@@ -79,36 +119,33 @@ def generate_phrasebook(destination: str, context: Optional[str] = None) -> dict
             "emergency": categories["emergency"],
         }
 
-    # Get local language for destination
-    local_language = get_destination_language(destination)
-    if not local_language:
-        return {"error": f"Could not determine primary language for {destination}"}
+    return selected_categories
 
-    phrasebook = {}
 
-    for category, phrases in selected_categories.items():
-        translated_phrases = []
-        for phrase in phrases:
-            translation = translate_phrase(phrase, local_language, api_key)
-            if translation:
-                translated_phrases.append(
-                    {
-                        "english": phrase,
-                        "local": translation["translated_text"],
-                        "pronunciation": generate_pronunciation_guide(
-                            translation["translated_text"]
-                        ),
-                    }
-                )
-
-        phrasebook[category] = translated_phrases
-
-    return {
-        "destination": destination,
-        "local_language": local_language,
-        "phrasebook": phrasebook,
-        "cultural_tips": get_cultural_tips(destination),
-    }
+def build_phrase_entries(phrases: list, translations: list) -> list:
+    """
+    Pairs English phrases with their translations, skipping failed ones.
+
+    Args:
+        phrases (list): English phrases.
+        translations (list): translate_phrase() results, one per phrase.
+
+    Returns:
+        list: Phrase entries with english, local and pronunciation fields.
+    """
+    translated_phrases = []
+    for phrase, translation in zip(phrases, translations):
+        if translation:
+            translated_phrases.append(
+                {
+                    "english": phrase,
+                    "local": translation["translated_text"],
+                    "pronunciation": generate_pronunciation_guide(
+                        translation["translated_text"]
+                    ),
+                }
+            )
+    return translated_phrases
 
 
 def get_destination_language(destination: str) -> Optional[str]:
@@ -203,7 +240,7 @@ def translate_phrase(text: str, target_language: str, api_key: str) -> Optional[
         url = "https://translation.googleapis.com/language/translate/v2"
         params = {"q": text, "target": target_language, "key": api_key}
 
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -0,0 +1,94 @@
+"""
+Async variant of the phrasebook tool, registered with the language agent.
+
+Every phrase in the phrasebook is translated concurrently instead of one
+request after another.
+"""
+
+import asyncio
+import os
+from typing import Optional
+from locus.shared_libraries import deadline, rate_limit
+from .phrasebook import (
+    build_phrase_entries,
+    get_cultural_tips,
+    get_destination_language,
+    select_phrase_categories,
+)
+from .translator_async import request_translation
+
+
+@deadline.with_deadline()
+async def generate_phrasebook(destination: str, context: Optional[str] = None) -> dict:
+    """
+    Generates a customized phrasebook for travelers based on destination and context.
+
+    Args:
+        destination (str): The travel destination (city/country).
+        context (str, optional): Specific context like "restaurant", "transportation", "emergency", etc.
+
+    Returns:
+        dict: A dictionary containing categorized phrases with translations and pronunciations.
+    """
+    api_key = os.getenv("GOOGLE_CLOUD_TRANSLATION_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_CLOUD_TRANSLATION_API_KEY not found in .env file."}
+
+    selected_categories = select_phrase_categories(context)
+
+    # Get local language for destination
+    local_language = get_destination_language(destination)
+    if not local_language:
+        return {"error": f"Could not determine primary language for {destination}"}
+
+    # A phrasebook is a burst of translations; let interactive calls go first.
+    with rate_limit.bulk():
+        category_translations = await asyncio.gather(
+            *(
+                asyncio.gather(
+                    *(translate_phrase(p, local_language, api_key) for p in phrases)
+                )
+                for phrases in selected_categories.values()
+            )
+        )
+
+    phrasebook = {}
+    for (category, phrases), translations in zip(
+        selected_categories.items(), category_translations
+    ):
+        phrasebook[category] = build_phrase_entries(phrases, translations)
+
+    result = {
+        "destination": destination,
+        "local_language": local_language,
+        "phrasebook": phrasebook,
+        "cultural_tips": get_cultural_tips(destination),
+    }
+    if deadline.expired():
+        # Phrases still untranslated when the time budget ran out are left out.
+        result["degraded"] = True
+    return result
+
+
+async def translate_phrase(
+    text: str, target_language: str, api_key: str
+) -> Optional[dict]:
+    """
+    Translates a single phrase using Google Translate API.
+
+    Args:
+        text (str): Text to translate.
+        target_language (str): Target language code.
+        api_key (str): Google Cloud API key.
+
+    Returns:
+        dict: Translation result or None if failed.
+    """
+    try:
+        translation = await request_translation(text, target_language, api_key)
+        return {
+            "translated_text": translation["translatedText"],
+            "source_language": translation.get("detectedSourceLanguage", "en"),
+        }
+    except Exception:
+        return None
@@ -1,8 +1,22 @@
 import os
-import requests
 from typing import Optional
-
-
+from locus.shared_libraries import deadline, http_client, rate_limit
+
+EMERGENCY_PHRASES = [
+    "Help!",
+    "I need a doctor",
+    "Call the police",
+    "Where is the hospital?",
+    "I've been robbed",
+    "I lost my passport",
+    "I don't speak the language",
+    "I need medicine",
+    "I'm allergic to...",
+    "Fire!",
+]
+
+
+@deadline.with_deadline()
 def speech_translation_guide(
     source_language: str, target_language: str, context: Optional[str] = None
 ) -> dict:
@@ -25,21 +39,16 @@ def speech_translation_guide(
     common_phrases = get_common_phrases(context or "general", source_language)
 
     # Translate key phrases
-    translated_phrases = []
-    for phrase in common_phrases[:10]:  # Limit to 10 phrases
-        translation = translate_phrase(phrase, target_language, api_key)
-        if translation:
-            translated_phrases.append(
-                {
-                    "source": phrase,
-                    "target": translation["translated_text"],
-                    "pronunciation": generate_simple_pronunciation(
-                        translation["translated_text"]
-                    ),
-                }
-            )
-
-    return {
+    key_phrases = common_phrases[:10]  # Limit to 10 phrases
+    # Emergency phrases below keep interactive priority; these can wait.
+    with rate_limit.bulk():
+        translations = [
+            translate_phrase(phrase, target_language, api_key)
+            for phrase in key_phrases
+        ]
+    translated_phrases = build_essential_phrases(key_phrases, translations)
+
+    result = {
         "language_pair": f"{source_language} → {target_language}",
         "context": context or "general",
         "essential_phrases": translated_phrases,
@@ -51,6 +60,36 @@ def speech_translation_guide(
             source_language, target_language, api_key
         ),
     }
+    if deadline.expired():
+        # Phrases still untranslated when the time budget ran out are left out.
+        result["degraded"] = True
+    return result
+
+
+def build_essential_phrases(phrases: list, translations: list) -> list:
+    """
+    Pairs source phrases with their translations, skipping failed ones.
+
+    Args:
+        phrases (list): Source phrases.
+        translations (list): translate_phrase() results, one per phrase.
+
+    Returns:
+        list: Phrase entries with source, target and pronunciation fields.
+    """
+    translated_phrases = []
+    for phrase, translation in zip(phrases, translations):
+        if translation:
+            translated_phrases.append(
+                {
+                    "source": phrase,
+                    "target": translation["translated_text"],
+                    "pronunciation": generate_simple_pronunciation(
+                        translation["translated_text"]
+                    ),
+                }
+            )
+    return translated_phrases
 
 
 def get_common_phrases(context: str, language: str) -> list:
@@ -138,7 +177,7 @@ def translate_phrase(text: str, target_language: str, api_key: str) -> Optional[
         url = "https://translation.googleapis.com/language/translate/v2"
         params = {"q": text, "target": target_language, "key": api_key}
 
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -266,22 +305,25 @@ def get_emergency_phrases(source_lang: str, target_lang: str, api_key: str) -> l
     Returns:
         list: Emergency phrases with translations.
     """
-    emergency_phrases = [
-        "Help!",
-        "I need a doctor",
-        "Call the police",
-        "Where is the hospital?",
-        "I've been robbed",
-        "I lost my passport",
-        "I don't speak the language",
-        "I need medicine",
-        "I'm allergic to...",
-        "Fire!",
+    translations = [
+        translate_phrase(phrase, target_lang, api_key) for phrase in EMERGENCY_PHRASES
     ]
+    return build_emergency_entries(EMERGENCY_PHRASES, translations)
+
+
+def build_emergency_entries(phrases: list, translations: list) -> list:
+    """
+    Pairs emergency phrases with their translations, skipping failed ones.
+
+    Args:
+        phrases (list): English emergency phrases.
+        translations (list): translate_phrase() results, one per phrase.
 
+    Returns:
+        list: Emergency phrase entries.
+    """
     translated_emergencies = []
-    for phrase in emergency_phrases:
-        translation = translate_phrase(phrase, target_lang, api_key)
+    for phrase, translation in zip(phrases, translations):
         if translation:
             translated_emergencies.append(
                 {
@@ -0,0 +1,128 @@
+"""
+Async variant of the speech translation guide, registered with the language
+agent. Essential and emergency phrases are translated concurrently.
+"""
+
+import asyncio
+import os
+from typing import Optional
+from locus.shared_libraries import deadline, rate_limit
+from .speech_translator import (
+    EMERGENCY_PHRASES,
+    build_emergency_entries,
+    build_essential_phrases,
+    get_common_phrases,
+    get_speech_translation_tips,
+    get_translation_apps,
+)
+from .translator_async import request_translation
+
+
+@deadline.with_deadline()
+async def speech_translation_guide(
+    source_language: str, target_language: str, context: Optional[str] = None
+) -> dict:
+    """
+    Provides guidance for real-time speech translation and communication.
+
+    Args:
+        source_language (str): Source language code (e.g., 'en').
+        target_language (str): Target language code (e.g., 'es').
+        context (str, optional): Communication context (e.g., 'restaurant', 'emergency').
+
+    Returns:
+        dict: Speech translation guidance and tips.
+    """
+    api_key = os.getenv("GOOGLE_CLOUD_TRANSLATION_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_CLOUD_TRANSLATION_API_KEY not found in .env file."}
+
+    # Get common phrases for the context
+    common_phrases = get_common_phrases(context or "general", source_language)
+    key_phrases = common_phrases[:10]  # Limit to 10 phrases
+
+    translations, emergency_phrases = await asyncio.gather(
+        translate_phrases_bulk(key_phrases, target_language, api_key),
+        get_emergency_phrases(source_language, target_language, api_key),
+    )
+
+    result = {
+        "language_pair": f"{source_language} → {target_language}",
+        "context": context or "general",
+        "essential_phrases": build_essential_phrases(key_phrases, translations),
+        "communication_tips": get_speech_translation_tips(
+            source_language, target_language
+        ),
+        "apps_recommendations": get_translation_apps(),
+        "emergency_phrases": emergency_phrases,
+    }
+    if deadline.expired():
+        # Phrases still untranslated when the time budget ran out are left out.
+        result["degraded"] = True
+    return result
+
+
+async def translate_phrases_bulk(
+    phrases: list, target_language: str, api_key: str
+) -> list:
+    """
+    Translates phrases concurrently at bulk rate-limit priority.
+
+    Emergency phrases keep interactive priority; these can wait.
+
+    Args:
+        phrases (list): Phrases to translate.
+        target_language (str): Target language code.
+        api_key (str): Google Cloud API key.
+
+    Returns:
+        list: translate_phrase() results, one per phrase.
+    """
+    with rate_limit.bulk():
+        return await asyncio.gather(
+            *(translate_phrase(p, target_language, api_key) for p in phrases)
+        )
+
+
+async def translate_phrase(
+    text: str, target_language: str, api_key: str
+) -> Optional[dict]:
+    """
+    Translates a phrase using Google Translate API.
+
+    Args:
+        text (str): Text to translate.
+        target_language (str): Target language code.
+        api_key (str): Google Cloud API key.
+
+    Returns:
+        dict: Translation result or None.
+    """
+    try:
+        translation = await request_translation(text, target_language, api_key)
+        return {
+            "translated_text": translation["translatedText"],
+            "source_language": translation.get("detectedSourceLanguage", "auto"),
+        }
+    except Exception:
+        return None
+
+
+async def get_emergency_phrases(
+    source_lang: str, target_lang: str, api_key: str
+) -> list:
+    """
+    Gets emergency phrases translated between languages.
+
+    Args:
+        source_lang (str): Source language code.
+        target_lang (str): Target language code.
+        api_key (str): Google Cloud API key.
+
+    Returns:
+        list: Emergency phrases with translations.
+    """
+    translations = await asyncio.gather(
+        *(translate_phrase(p, target_lang, api_key) for p in EMERGENCY_PHRASES)
+    )
+    return build_emergency_entries(EMERGENCY_PHRASES, translations)
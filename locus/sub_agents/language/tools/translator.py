@@ -1,7 +1,8 @@
 import os
-import requests
+from locus.shared_libraries import deadline, http_client
 
 
+@deadline.with_deadline()
 def translate_text(text: str, target_language: str) -> dict:
     """
     Translates text using Google Cloud Translation API.
@@ -21,7 +22,7 @@ def translate_text(text: str, target_language: str) -> dict:
     params = {"q": text, "target": target_language, "key": api_key}
 
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -31,4 +32,8 @@ def translate_text(text: str, target_language: str) -> dict:
             "source_language": translation.get("detectedSourceLanguage", "Unknown"),
         }
     except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Translation service did not respond within the time budget."
+            )
         return {"error": str(e)}
@@ -0,0 +1,57 @@
+"""
+Async variant of the translation tool, registered with the language agent.
+"""
+
+import os
+from locus.shared_libraries import deadline, http_client
+
+TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+
+
+@deadline.with_deadline()
+async def translate_text(text: str, target_language: str) -> dict:
+    """
+    Translates text using Google Cloud Translation API.
+
+    Args:
+        text (str): The text to translate.
+        target_language (str): The language code to translate to (e.g., 'es' for Spanish).
+
+    Returns:
+        dict: A dictionary containing the translated text.
+    """
+    api_key = os.getenv("GOOGLE_CLOUD_TRANSLATION_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_CLOUD_TRANSLATION_API_KEY not found in .env file."}
+
+    try:
+        translation = await request_translation(text, target_language, api_key)
+        return {
+            "translated_text": translation["translatedText"],
+            "source_language": translation.get("detectedSourceLanguage", "Unknown"),
+        }
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Translation service did not respond within the time budget."
+            )
+        return {"error": str(e)}
+
+
+async def request_translation(text: str, target_language: str, api_key: str) -> dict:
+    """
+    Requests one translation from the Translation API.
+
+    Args:
+        text (str): Text to translate.
+        target_language (str): Target language code.
+        api_key (str): Google Cloud API key.
+
+    Returns:
+        dict: The raw translation object (translatedText, detectedSourceLanguage).
+    """
+    params = {"q": text, "target": target_language, "key": api_key}
+    response = await http_client.aget(TRANSLATE_URL, params=params)
+    response.raise_for_status()
+    data = response.json()
+    return data["data"]["translations"][0]
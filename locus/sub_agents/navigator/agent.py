@@ -2,8 +2,10 @@ from google.adk.agents import Agent
 from google.adk.tools import AgentTool
 from locus.sub_agents.search.agent import search_agent
 from .prompt import NAVIGATOR_PROMPT
-from .tools.transport import get_local_transport
-from .tools.places_search import search_places
+from .tools.transport_async import get_local_transport
+from .tools.places_search_async import search_places
+from .tools.itinerary_async import optimize_itinerary
+from .tools.place_details_async import get_place_details
 from ...shared_libraries.model_config import get_model_type
 
 search_tool = AgentTool(agent=search_agent)
@@ -17,6 +19,8 @@ def create_navigator_agent():
         tools=[
             get_local_transport,
             search_places,
+            get_place_details,
+            optimize_itinerary,
             search_tool,
         ],
     )
@@ -0,0 +1,306 @@
+"""
+Multi-stop itinerary optimization.
+
+The pairwise travel times between the stops come from the batched, cached
+Distance Matrix lookup (see shared_libraries/distance_matrix.py), and the
+visiting order from the local-search heuristic in route_solver.py.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+import numpy as np
+from locus.shared_libraries import deadline
+from locus.shared_libraries.cache import normalize_location_key
+from locus.shared_libraries.directions import TRAVEL_MODES
+from locus.shared_libraries.distance_matrix import get_travel_matrix
+from locus.shared_libraries.env_config import env_int
+from locus.shared_libraries.geocoding import geocode_location
+from locus.shared_libraries.timezones import get_timezone
+from . import route_solver
+
+
+@deadline.with_deadline()
+def optimize_itinerary(
+    places: List[str],
+    mode: str = "transit",
+    start: Optional[str] = None,
+    return_to_start: bool = False,
+    start_time: str = "09:00",
+    visit_minutes: int = 60,
+    time_windows: Optional[List[str]] = None,
+) -> dict:
+    """
+    Orders a list of places into the quickest route for a day of visits.
+
+    Args:
+        places (list[str]): The places to visit (e.g. sights, with the city).
+        mode (str, optional): "transit", "walking", "driving" or "bicycling".
+            Defaults to "transit".
+        start (str, optional): Where the day starts, e.g. the hotel. Defaults
+            to the first place.
+        return_to_start (bool, optional): End the day back at the start.
+            Defaults to False.
+        start_time (str, optional): Departure time as HH:MM, local to the
+            start, on the next day it falls on. Defaults to "09:00".
+        visit_minutes (int, optional): Time spent at each place. Defaults
+            to 60.
+        time_windows (list[str], optional): One entry per place, "HH:MM-HH:MM"
+            for when it can be visited (e.g. opening hours), or "" if any
+            time is fine.
+
+    Returns:
+        dict: A dictionary containing:
+            - "stops": the places in visiting order, with travel time and
+              distance from the previous stop and arrival/departure times
+            - "summary": total travel time and distance, finish time, the
+              time saved over the given order and any stops reached late
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if mode not in TRAVEL_MODES:
+        return {"error": f"Unknown travel mode '{mode}'. Use one of {TRAVEL_MODES}."}
+    try:
+        plan = plan_itinerary(places, start, start_time, visit_minutes, time_windows)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        located = geocode_location(plan["locations"][0])
+        if "error" not in located:
+            plan = schedule_day(
+                plan, get_timezone(located["lat"], located["lng"], api_key)
+            )
+        matrix = get_travel_matrix(
+            plan["locations"], api_key, mode, departure_time=plan["departure"]
+        )
+        return itinerary_response(plan, matrix, mode, return_to_start)
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Maps service did not respond within the time budget.", mode=mode
+            )
+        return {"error": f"Failed to optimize the itinerary: {str(e)}"}
+
+
+def parse_clock(value: str) -> float:
+    """Parses HH:MM into seconds of the day."""
+    try:
+        parsed = datetime.strptime(value.strip(), "%H:%M")
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid time '{value}'. Please use HH:MM format.")
+    return parsed.hour * 3600.0 + parsed.minute * 60.0
+
+
+def format_clock(seconds: float) -> str:
+    """Formats seconds of the day as HH:MM, marking times past midnight."""
+    minutes = int(round(seconds / 60))
+    days, minutes = divmod(minutes, 24 * 60)
+    clock = f"{minutes // 60:02d}:{minutes % 60:02d}"
+    return clock + (f" (+{days}d)" if days else "")
+
+
+def next_departure(
+    start_time: float, zone: Optional[str] = None, now: Optional[float] = None
+) -> float:
+    """
+    Unix time of the next clock time start_time (seconds of the day).
+
+    Today if that time is still ahead, otherwise tomorrow, so the travel
+    matrix is looked up for the day actually being planned.
+
+    Args:
+        start_time (float): Seconds of the day.
+        zone (str, optional): IANA zone the clock time is in. Defaults to
+            the server's zone.
+        now (float, optional): Unix time to count from. Defaults to now.
+    """
+    now = time.time() if now is None else now
+    tz = ZoneInfo(zone) if zone else None
+    day = datetime.fromtimestamp(now, tz).date()
+    clock = (datetime.min + timedelta(seconds=start_time)).time()
+    departure = datetime.combine(day, clock, tz).timestamp()
+    if departure < now:
+        departure = datetime.combine(day + timedelta(days=1), clock, tz).timestamp()
+    return departure
+
+
+def schedule_day(plan: dict, zone: Optional[str]) -> dict:
+    """Places a plan on the next day its start_time falls on, in zone."""
+    return dict(
+        plan, zone=zone, departure=next_departure(plan["start_time"], zone)
+    )
+
+
+def plan_itinerary(
+    places: List[str],
+    start: Optional[str],
+    start_time: str,
+    visit_minutes: int,
+    time_windows: Optional[List[str]],
+) -> dict:
+    """
+    Validates the request and lays out the stops for the solver.
+
+    Duplicate places (ignoring case and punctuation) are visited once.
+
+    Returns:
+        dict: "locations" (the start first, then the places), "windows"
+            ((n, 2) seconds of the day, NaN where open), "service" (seconds
+            spent at each location), "visit_start" (whether the first
+            location is a place to visit rather than a given start),
+            "start_time" (seconds of the day), and "zone" and "departure"
+            (the Unix time of start_time on the planned day; in the
+            server's zone until schedule_day() is given the start's zone).
+
+    Raises:
+        ValueError: If the request is malformed or too large.
+    """
+    if time_windows is not None and len(time_windows) != len(places):
+        raise ValueError("time_windows needs one entry per place ('' for none).")
+    windows = time_windows or [""] * len(places)
+    stops = {}
+    for place, window in zip(places, windows):
+        if place and place.strip():
+            stops.setdefault(normalize_location_key(place) or place, (place, window))
+    start_key = normalize_location_key(start) if start else None
+    stops.pop(start_key, None)
+    locations = ([start] if start else []) + [place for place, _ in stops.values()]
+    bounds = ([""] if start else []) + [window for _, window in stops.values()]
+
+    max_stops = env_int("LOCUS_ITINERARY_MAX_STOPS", 40)
+    if len(locations) < 2:
+        raise ValueError("Give at least two distinct places (or a start and a place).")
+    if len(locations) > max_stops:
+        raise ValueError(f"At most {max_stops} stops can be optimized at once.")
+
+    parsed = np.full((len(locations), 2), np.nan)
+    for i, window in enumerate(bounds):
+        if window and window.strip():
+            try:
+                opens, closes = window.split("-")
+            except ValueError:
+                raise ValueError(f"Invalid time window '{window}'. Use HH:MM-HH:MM.")
+            parsed[i] = parse_clock(opens), parse_clock(closes)
+    service = np.full(len(locations), max(visit_minutes, 0) * 60.0)
+    if start:
+        service[0] = 0.0
+    start_seconds = parse_clock(start_time)
+    return {
+        "locations": locations,
+        "windows": parsed,
+        "service": service,
+        "visit_start": not start,
+        "start_time": start_seconds,
+        "zone": None,
+        "departure": next_departure(start_seconds),
+    }
+
+
+def itinerary_response(
+    plan: dict, matrix: dict, mode: str, return_to_start: bool
+) -> dict:
+    """
+    Solves the visiting order and builds the optimize_itinerary() response.
+
+    Args:
+        plan (dict): The plan from plan_itinerary().
+        matrix (dict): The travel matrix from get_travel_matrix().
+        mode (str): The travel mode.
+        return_to_start (bool): Whether the route returns to the start.
+
+    Returns:
+        dict: "stops", "summary" and, if some travel times could not be
+            fetched, "degraded".
+    """
+    locations, windows = plan["locations"], plan["windows"]
+    seconds, meters = matrix["seconds"], matrix["meters"]
+    started = time.perf_counter()
+    solution = route_solver.solve(
+        seconds, plan["service"], windows, plan["start_time"], return_to_start
+    )
+    solver_ms = (time.perf_counter() - started) * 1000
+    baseline, _ = route_solver.evaluate(
+        np.arange(len(locations))[None, :],
+        np.where(np.isfinite(seconds), seconds, route_solver.UNREACHABLE_SECONDS),
+        plan["service"],
+        None,
+        plan["start_time"],
+        return_to_start,
+    )
+    # Legs without a route are timed as instant and reported separately.
+    legs = route_solver.schedule(
+        solution["order"],
+        np.where(np.isfinite(seconds), seconds, 0.0),
+        plan["service"],
+        windows,
+        plan["start_time"],
+        return_to_start,
+    )
+
+    def window_text(i: int) -> Optional[str]:
+        if np.isnan(windows[i]).all():
+            return None
+        return "-".join(format_clock(t) if not np.isnan(t) else "" for t in windows[i])
+
+    # The first entry is the visit at the first location, if it is a place.
+    visit, legs = legs[0], legs[1:]
+    stops, unreachable = [], []
+    for leg in ([visit] if plan["visit_start"] else []) + legs:
+        a, b = leg["from"], leg["to"]
+        stop = {"place": locations[b]}
+        if a is not None:
+            routed = bool(np.isfinite(seconds[a, b]))
+            if not routed:
+                unreachable.append(f"{locations[a]} -> {locations[b]}")
+            stop["travel_min"] = round(leg["travel"] / 60, 1) if routed else None
+            stop["distance_km"] = (
+                round(float(meters[a, b]) / 1000, 2)
+                if np.isfinite(meters[a, b])
+                else None
+            )
+        stop["arrive"] = format_clock(leg["arrive"])
+        if leg["wait"] > 0:
+            stop["wait_min"] = round(leg["wait"] / 60, 1)
+        # Arriving back at the start is not a visit, so its window is moot.
+        if window_text(b) and not (return_to_start and leg is legs[-1]):
+            stop["window"] = window_text(b)
+        if leg["late"] > 0:
+            stop["late_min"] = round(leg["late"] / 60, 1)
+        stop["depart"] = format_clock(leg["depart"])
+        stops.append(stop)
+
+    distances = [float(meters[leg["from"], leg["to"]]) for leg in legs]
+    summary = {
+        "stops": len(locations) - (0 if plan["visit_start"] else 1),
+        "travel_min": round(sum(leg["travel"] for leg in legs) / 60, 1),
+        "distance_km": round(sum(d for d in distances if np.isfinite(d)) / 1000, 2),
+        "date": datetime.fromtimestamp(
+            plan["departure"], ZoneInfo(plan["zone"]) if plan["zone"] else None
+        ).strftime("%Y-%m-%d"),
+        "start": format_clock(plan["start_time"]),
+        "finish": format_clock(legs[-1]["depart"]) if legs else None,
+        "saved_min_vs_given_order": round(
+            max(float(baseline[0]) - solution["travel_seconds"], 0.0) / 60, 1
+        )
+        if baseline[0] < route_solver.UNREACHABLE_SECONDS and not unreachable
+        else None,
+        "late_stops": [s["place"] for s in stops if s.get("late_min")],
+        "matrix_requests": matrix["requests"],
+        "solver_ms": round(solver_ms, 1),
+    }
+    response = {
+        "mode": mode,
+        "start": locations[0],
+        "return_to_start": return_to_start,
+        "stops": stops,
+        "summary": summary,
+    }
+    if unreachable:
+        response["unreachable_legs"] = unreachable
+    if np.isnan(seconds).any():
+        response["degraded"] = True
+    return response
@@ -0,0 +1,81 @@
+"""
+Async variant of the itinerary optimizer, registered with the navigator
+agent.
+
+Validation, solving and the response are shared with the sync version in
+itinerary.py.
+"""
+
+import os
+from typing import List, Optional
+from locus.shared_libraries import deadline
+from locus.shared_libraries.directions import TRAVEL_MODES
+from locus.shared_libraries.distance_matrix import get_travel_matrix_async
+from locus.shared_libraries.geocoding import geocode_location_async
+from locus.shared_libraries.timezones import get_timezone_async
+from .itinerary import itinerary_response, plan_itinerary, schedule_day
+
+
+@deadline.with_deadline()
+async def optimize_itinerary(
+    places: List[str],
+    mode: str = "transit",
+    start: Optional[str] = None,
+    return_to_start: bool = False,
+    start_time: str = "09:00",
+    visit_minutes: int = 60,
+    time_windows: Optional[List[str]] = None,
+) -> dict:
+    """
+    Orders a list of places into the quickest route for a day of visits.
+
+    Args:
+        places (list[str]): The places to visit (e.g. sights, with the city).
+        mode (str, optional): "transit", "walking", "driving" or "bicycling".
+            Defaults to "transit".
+        start (str, optional): Where the day starts, e.g. the hotel. Defaults
+            to the first place.
+        return_to_start (bool, optional): End the day back at the start.
+            Defaults to False.
+        start_time (str, optional): Departure time as HH:MM, local to the
+            start, on the next day it falls on. Defaults to "09:00".
+        visit_minutes (int, optional): Time spent at each place. Defaults
+            to 60.
+        time_windows (list[str], optional): One entry per place, "HH:MM-HH:MM"
+            for when it can be visited (e.g. opening hours), or "" if any
+            time is fine.
+
+    Returns:
+        dict: A dictionary containing:
+            - "stops": the places in visiting order, with travel time and
+              distance from the previous stop and arrival/departure times
+            - "summary": total travel time and distance, finish time, the
+              time saved over the given order and any stops reached late
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if mode not in TRAVEL_MODES:
+        return {"error": f"Unknown travel mode '{mode}'. Use one of {TRAVEL_MODES}."}
+    try:
+        plan = plan_itinerary(places, start, start_time, visit_minutes, time_windows)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        located = await geocode_location_async(plan["locations"][0])
+        if "error" not in located:
+            plan = schedule_day(
+                plan,
+                await get_timezone_async(located["lat"], located["lng"], api_key),
+            )
+        matrix = await get_travel_matrix_async(
+            plan["locations"], api_key, mode, departure_time=plan["departure"]
+        )
+        return itinerary_response(plan, matrix, mode, return_to_start)
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Maps service did not respond within the time budget.", mode=mode
+            )
+        return {"error": f"Failed to optimize the itinerary: {str(e)}"}
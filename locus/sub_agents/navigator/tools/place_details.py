@@ -0,0 +1,77 @@
+"""
+Details of a known place (opening hours, phone number, website, ...).
+
+Lookups go through the per-field place_id cache in
+shared_libraries/place_details.py, so a follow-up question about a place
+that search_places or suggest_experiences already surfaced only fetches
+the fields that are not cached yet.
+"""
+
+import os
+from typing import List, Optional
+from locus.shared_libraries import deadline
+from locus.shared_libraries.place_details import (
+    DEFAULT_FIELDS,
+    FIELDS,
+    get_place_fields,
+)
+
+
+@deadline.with_deadline()
+def get_place_details(place_id: str, fields: Optional[List[str]] = None) -> dict:
+    """
+    Gets details of a place by its place_id.
+
+    Args:
+        place_id (str): The place_id returned by search_places or
+            suggest_experiences.
+        fields (list[str], optional): What to look up, any of "name",
+            "address", "location", "types", "maps_url", "phone",
+            "international_phone", "website", "rating", "ratings_count",
+            "price_level", "summary", "hours" and "business_status".
+            Defaults to name, address, phone, website, rating and hours.
+
+    Returns:
+        dict: The place_id and the requested fields (None where the place
+            has no such detail).
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    try:
+        fields = plan_fields(fields)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        return details_response(place_id, get_place_fields(place_id, fields, api_key))
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Places service did not respond within the time budget."
+            )
+        return {"error": f"Failed to get place details: {str(e)}"}
+
+
+def plan_fields(fields: Optional[List[str]]) -> List[str]:
+    """
+    Validates the requested fields, dropping duplicates.
+
+    Raises:
+        ValueError: If a field is unknown.
+    """
+    fields = [field.strip().lower() for field in fields or DEFAULT_FIELDS]
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown place detail(s) {unknown}. Use any of {sorted(FIELDS)}."
+        )
+    return list(dict.fromkeys(fields))
+
+
+def details_response(place_id: str, values: dict) -> dict:
+    """Builds the get_place_details() response."""
+    if "error" in values:
+        return values
+    fetched = values.pop("fetched")
+    return {"place_id": place_id, **values, "from_cache": not fetched}
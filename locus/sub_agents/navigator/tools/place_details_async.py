@@ -0,0 +1,52 @@
+"""
+Async variant of get_place_details, registered with the navigator and
+explorer agents.
+
+Field validation and the response are shared with the sync version in
+place_details.py.
+"""
+
+import os
+from typing import List, Optional
+from locus.shared_libraries import deadline
+from locus.shared_libraries.place_details import get_place_fields_async
+from .place_details import details_response, plan_fields
+
+
+@deadline.with_deadline()
+async def get_place_details(
+    place_id: str, fields: Optional[List[str]] = None
+) -> dict:
+    """
+    Gets details of a place by its place_id.
+
+    Args:
+        place_id (str): The place_id returned by search_places or
+            suggest_experiences.
+        fields (list[str], optional): What to look up, any of "name",
+            "address", "location", "types", "maps_url", "phone",
+            "international_phone", "website", "rating", "ratings_count",
+            "price_level", "summary", "hours" and "business_status".
+            Defaults to name, address, phone, website, rating and hours.
+
+    Returns:
+        dict: The place_id and the requested fields (None where the place
+            has no such detail).
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    try:
+        fields = plan_fields(fields)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        values = await get_place_fields_async(place_id, fields, api_key)
+        return details_response(place_id, values)
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Places service did not respond within the time budget."
+            )
+        return {"error": f"Failed to get place details: {str(e)}"}
@@ -1,44 +1,279 @@
+"""
+Places text search, streamed page by page.
+
+A text search returns up to 20 results per page and up to MAX_PAGES pages,
+linked by a next_page_token that only becomes valid a couple of seconds
+after it is issued. iter_places() follows the pages lazily, so a search
+that has collected enough results (after the client-side filters) stops
+without fetching, or waiting for, the next page. Pages are cached per
+query, location, radius and type, so repeating a search costs nothing;
+tokens expire long before cached pages do, though, so a stale cached token
+ends the pagination instead of being sent.
+"""
+
+import logging
 import os
+import time
+from typing import Iterator, List, Optional, Tuple
 import googlemaps
-from typing import Optional
+from locus.shared_libraries import deadline
+from locus.shared_libraries.cache import TwoTierCache, normalize_location_key
+from locus.shared_libraries.env_config import env_bool, env_float
+from locus.shared_libraries.geocoding import geocode_location
+from locus.shared_libraries.http_client import get_gmaps_client
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGES = 3
+DEFAULT_RADIUS_M = 50000
 
+# Short-lived, since pages carry "open now".
+_places_cache = TwoTierCache(
+    "places_search",
+    ttl=env_float("LOCUS_PLACES_SEARCH_TTL", 900),
+    persistent=env_bool("LOCUS_CACHE_PERSIST", True),
+)
 
-def search_places(query: str, location: Optional[str] = None) -> dict:
+
+@deadline.with_deadline()
+def search_places(
+    query: str,
+    location: Optional[str] = None,
+    max_results: int = 10,
+    min_rating: Optional[float] = None,
+    place_type: Optional[str] = None,
+    open_now: bool = False,
+    radius_meters: Optional[int] = None,
+) -> dict:
     """
     Searches for places using Google Places API.
 
     Args:
         query (str): The search query for places (e.g., "YC office", "restaurants").
         location (str, optional): The location to search around (e.g., "San Francisco, CA").
+        max_results (int, optional): How many places to return. Defaults to 10.
+        min_rating (float, optional): Only places rated at least this (1-5).
+        place_type (str, optional): Only places of this type (e.g., "cafe").
+        open_now (bool, optional): Only places open right now.
+        radius_meters (int, optional): Search radius around the location.
+            Defaults to 50km.
 
     Returns:
-        dict: A dictionary containing place search results.
+        dict: A dictionary containing place search results, and whether
+            more matching places may be available.
     """
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
     if not api_key:
         return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
 
-    gmaps = googlemaps.Client(key=api_key)
+    gmaps = get_gmaps_client(api_key)
 
     try:
-        # Use Places API text search
-        places_result = gmaps.places(
-            query=query, location=location, radius=50000
-        )  # 50km radius
-
-        results = []
-        for place in places_result.get("results", []):
-            result = {
-                "name": place.get("name"),
-                "address": place.get("formatted_address"),
-                "location": place.get("geometry", {}).get("location"),
-                "place_id": place.get("place_id"),
-                "rating": place.get("rating"),
-                "types": place.get("types", []),
-            }
-            results.append(result)
-
-        return {"places": results}
+        geocode_result = geocode_location(location) if location else None
+        search = plan_search(query, location, geocode_result, radius_meters, place_type)
+        filters = {
+            "min_rating": min_rating,
+            "place_type": place_type,
+            "open_now": open_now,
+        }
+
+        places, more, skipped = [], False, 0
+        for place, more in iter_places(gmaps, search):
+            if not matches(place, **filters):
+                skipped += 1
+                continue
+            places.append(place)
+            if len(places) >= max_results:
+                break
+        else:
+            more = False
+
+        return search_response(places, more, skipped)
 
     except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Places service did not respond within the time budget."
+            )
         return {"error": str(e)}
+
+
+def plan_search(
+    query: str,
+    location: Optional[str],
+    geocode_result: Optional[dict],
+    radius_meters: Optional[int],
+    place_type: Optional[str] = None,
+) -> dict:
+    """
+    Builds the text search request and its cache key.
+
+    The Places API wants coordinates, so the location is geocoded; if that
+    fails, it is folded into the query text instead. A place type is sent
+    upstream too, so pages are not spent on places matches() would drop.
+
+    Returns:
+        dict: "params" for the text search and the cache "key" prefix.
+    """
+    params = {"query": query}
+    if geocode_result and "error" not in geocode_result:
+        params["location"] = f"{geocode_result['lat']:.6f},{geocode_result['lng']:.6f}"
+        params["radius"] = int(radius_meters or DEFAULT_RADIUS_M)
+    elif location:
+        params["query"] = f"{query} in {location}"
+    if place_type:
+        params["type"] = place_type
+    key = "|".join(
+        (
+            normalize_location_key(params["query"]) or params["query"],
+            params.get("location", ""),
+            str(params.get("radius", "")),
+            params.get("type", ""),
+        )
+    )
+    return {"params": params, "key": key}
+
+
+def page_entry(places_result: dict) -> dict:
+    """Reduces a text search page to its formatted results and next token."""
+    return {
+        "results": [format_place(place) for place in places_result.get("results", [])],
+        "next_page_token": places_result.get("next_page_token"),
+        "issued_at": time.time(),
+    }
+
+
+def token_wait(issued_at: Optional[float]) -> Optional[float]:
+    """
+    Seconds until a next_page_token can be used.
+
+    Tokens become valid LOCUS_PLACES_PAGE_TOKEN_DELAY seconds after they are
+    issued.
+
+    Returns:
+        float: Seconds to wait, or None if that would overrun the deadline.
+    """
+    delay = env_float("LOCUS_PLACES_PAGE_TOKEN_DELAY", 2.0)
+    wait = max((issued_at or 0) + delay - time.time(), 0.0)
+    left = deadline.remaining()
+    if left is not None and wait + 1.0 > left:
+        return None
+    return wait
+
+
+def next_token(search: dict, page: int, entry: dict) -> tuple:
+    """
+    The token for the page after a cached one, and when it was issued.
+
+    A token older than LOCUS_PLACES_PAGE_TOKEN_TTL is dropped unless the
+    page it points to is cached as well, since the service would reject it.
+
+    Returns:
+        tuple: (token or None, issued_at).
+    """
+    token, issued_at = entry.get("next_page_token"), entry.get("issued_at")
+    ttl = env_float("LOCUS_PLACES_PAGE_TOKEN_TTL", 120)
+    if token and time.time() - (issued_at or 0) > ttl:
+        if _places_cache.get(f"{search['key']}|{page + 1}") is None:
+            return None, issued_at
+    return token, issued_at
+
+
+def iter_places(
+    gmaps: googlemaps.Client, search: dict
+) -> Iterator[Tuple[dict, bool]]:
+    """
+    Yields the results of a text search, fetching pages only as needed.
+
+    Args:
+        gmaps (googlemaps.Client): The Maps client.
+        search (dict): The search from plan_search().
+
+    Yields:
+        tuple: (formatted place, whether more results may follow).
+    """
+    token, issued_at = None, None
+    for page in range(MAX_PAGES):
+        if page and not token:
+            return
+        key = f"{search['key']}|{page}"
+        entry = _places_cache.get(key)
+        if entry is None:
+            if not page:
+                entry = page_entry(gmaps.places(**search["params"]))
+            else:
+                entry = fetch_next_page(gmaps, token, issued_at)
+                if entry is None:
+                    return
+            _places_cache.set(key, entry)
+        token, issued_at = next_token(search, page, entry)
+        results = entry["results"]
+        has_next = bool(token) and page < MAX_PAGES - 1
+        for i, place in enumerate(results):
+            yield place, i < len(results) - 1 or has_next
+
+
+def fetch_next_page(
+    gmaps: googlemaps.Client, token: str, issued_at: Optional[float]
+) -> Optional[dict]:
+    """
+    Fetches the page a next_page_token points to, once the token is valid.
+
+    A token the service still rejects is retried once after the activation
+    delay. Failures end the pagination rather than the search.
+
+    Returns:
+        dict: The page entry, or None if it could not be fetched in time.
+    """
+    for attempt in range(2):
+        wait = token_wait(issued_at if not attempt else time.time())
+        if wait is None:
+            return None
+        time.sleep(wait)
+        try:
+            return page_entry(gmaps.places(page_token=token))
+        except googlemaps.exceptions.ApiError as e:
+            if e.status != "INVALID_REQUEST":
+                logger.debug("Places pagination stopped: %s", e)
+                return None
+        except Exception as e:
+            logger.debug("Places pagination stopped: %s", e)
+            return None
+    return None
+
+
+def matches(
+    place: dict,
+    min_rating: Optional[float] = None,
+    place_type: Optional[str] = None,
+    open_now: bool = False,
+) -> bool:
+    """Applies the client-side filters to a formatted place."""
+    if min_rating is not None and (place.get("rating") or 0) < min_rating:
+        return False
+    if place_type and place_type not in (place.get("types") or []):
+        return False
+    if open_now and place.get("open_now") is not True:
+        return False
+    return True
+
+
+def search_response(places: List[dict], more: bool, skipped: int) -> dict:
+    """Builds the search_places() response."""
+    response = {"places": places, "more_available": more}
+    if skipped:
+        response["filtered_out"] = skipped
+    return response
+
+
+def format_place(place: dict) -> dict:
+    """Projects a Places API result onto the fields returned to the agent."""
+    return {
+        "name": place.get("name"),
+        "address": place.get("formatted_address"),
+        "location": place.get("geometry", {}).get("location"),
+        "place_id": place.get("place_id"),
+        "rating": place.get("rating"),
+        "types": place.get("types", []),
+        "open_now": place.get("opening_hours", {}).get("open_now"),
+    }
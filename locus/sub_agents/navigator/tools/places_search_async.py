@@ -0,0 +1,147 @@
+"""
+Async variant of search_places, registered with the navigator agent.
+
+Calls the Places web service directly over the shared async HTTP client,
+since the googlemaps library only offers a blocking client. Waiting for a
+page token to become valid is an asyncio sleep, so other work carries on
+meanwhile. Search planning, filtering and the page cache are shared with
+the sync version in places_search.py.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import AsyncIterator, Optional, Tuple
+import googlemaps
+from locus.shared_libraries import deadline, http_client
+from locus.shared_libraries.geocoding import geocode_location_async
+from .places_search import (
+    MAX_PAGES,
+    _places_cache,
+    matches,
+    next_token,
+    page_entry,
+    plan_search,
+    search_response,
+    token_wait,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@deadline.with_deadline()
+async def search_places(
+    query: str,
+    location: Optional[str] = None,
+    max_results: int = 10,
+    min_rating: Optional[float] = None,
+    place_type: Optional[str] = None,
+    open_now: bool = False,
+    radius_meters: Optional[int] = None,
+) -> dict:
+    """
+    Searches for places using Google Places API.
+
+    Args:
+        query (str): The search query for places (e.g., "YC office", "restaurants").
+        location (str, optional): The location to search around (e.g., "San Francisco, CA").
+        max_results (int, optional): How many places to return. Defaults to 10.
+        min_rating (float, optional): Only places rated at least this (1-5).
+        place_type (str, optional): Only places of this type (e.g., "cafe").
+        open_now (bool, optional): Only places open right now.
+        radius_meters (int, optional): Search radius around the location.
+            Defaults to 50km.
+
+    Returns:
+        dict: A dictionary containing place search results, and whether
+            more matching places may be available.
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        geocode_result = await geocode_location_async(location) if location else None
+        search = plan_search(query, location, geocode_result, radius_meters, place_type)
+        filters = {
+            "min_rating": min_rating,
+            "place_type": place_type,
+            "open_now": open_now,
+        }
+
+        places, more, skipped = [], False, 0
+        pages = iter_places(search, api_key)
+        try:
+            async for place, more in pages:
+                if not matches(place, **filters):
+                    skipped += 1
+                    continue
+                places.append(place)
+                if len(places) >= max_results:
+                    break
+            else:
+                more = False
+        finally:
+            await pages.aclose()
+
+        return search_response(places, more, skipped)
+
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Places service did not respond within the time budget."
+            )
+        return {"error": str(e)}
+
+
+async def iter_places(search: dict, api_key: str) -> AsyncIterator[Tuple[dict, bool]]:
+    """Async variant of places_search.iter_places()."""
+    token, issued_at = None, None
+    for page in range(MAX_PAGES):
+        if page and not token:
+            return
+        key = f"{search['key']}|{page}"
+        entry = _places_cache.get(key)
+        if entry is None:
+            if not page:
+                entry = page_entry(
+                    await http_client.amaps_get(
+                        "place/textsearch", search["params"], api_key
+                    )
+                )
+            else:
+                entry = await fetch_next_page(token, issued_at, api_key)
+                if entry is None:
+                    return
+            _places_cache.set(key, entry)
+        token, issued_at = next_token(search, page, entry)
+        results = entry["results"]
+        has_next = bool(token) and page < MAX_PAGES - 1
+        for i, place in enumerate(results):
+            yield place, i < len(results) - 1 or has_next
+
+
+async def fetch_next_page(
+    token: str, issued_at: Optional[float], api_key: str
+) -> Optional[dict]:
+    """Async variant of places_search.fetch_next_page()."""
+    for attempt in range(2):
+        wait = token_wait(issued_at if not attempt else time.time())
+        if wait is None:
+            return None
+        await asyncio.sleep(wait)
+        try:
+            return page_entry(
+                await http_client.amaps_get(
+                    "place/textsearch", {"pagetoken": token}, api_key
+                )
+            )
+        except googlemaps.exceptions.ApiError as e:
+            if e.status != "INVALID_REQUEST":
+                logger.debug("Places pagination stopped: %s", e)
+                return None
+        except Exception as e:
+            logger.debug("Places pagination stopped: %s", e)
+            return None
+    return None
@@ -0,0 +1,243 @@
+"""
+Visiting-order heuristic for a multi-stop day, with optional time windows.
+
+Stop 0 is the fixed start; when the day starts at a place to visit, it
+has a service time and time window like any other stop. The route is
+built by nearest neighbor and then improved by steepest-descent local
+search over 2-opt (segment reversal) and Or-opt (moving a run of 1-3
+stops elsewhere) moves.
+
+Every move of a neighborhood is a fixed permutation of route positions,
+so the moves for a route length are built once as an index array. Each
+search step applies all of them to the current order at once and scores
+the resulting candidates in a single vectorized pass: travel time is a
+gather over the matrix, and time windows are a column-by-column schedule
+simulation across all candidates. 25+ stops solve in milliseconds.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+
+# Seconds of travel a second of lateness costs, so windows dominate.
+LATENESS_PENALTY = 100.0
+# Stand-in for pairs without a route, so sums stay finite.
+UNREACHABLE_SECONDS = 1e7
+MAX_ITERATIONS = 1000
+
+
+@lru_cache(maxsize=32)
+def _moves(length: int) -> np.ndarray:
+    """
+    Position permutations for every 2-opt and Or-opt move on a route.
+
+    Position 0 (the start) never moves.
+
+    Returns:
+        np.ndarray: (moves, length) array; row m lists the positions the
+            candidate route takes its stops from.
+    """
+    base = list(range(length))
+    moves = set()
+    for i in range(1, length - 1):
+        for k in range(i + 1, length):
+            moves.add(tuple(base[:i] + base[i : k + 1][::-1] + base[k + 1 :]))
+    for size in (1, 2, 3):
+        for i in range(1, length - size + 1):
+            segment = base[i : i + size]
+            rest = base[:i] + base[i + size :]
+            for j in range(1, len(rest) + 1):
+                moves.add(tuple(rest[:j] + segment + rest[j:]))
+    moves.discard(tuple(base))
+    if not moves:
+        return np.empty((0, length), dtype=np.intp)
+    return np.array(sorted(moves), dtype=np.intp)
+
+
+def start_visit(
+    windows: Optional[np.ndarray], start_time: float
+) -> Tuple[float, float]:
+    """
+    When the visit at stop 0 begins, and how late that is.
+
+    Returns:
+        tuple: (begin, lateness) in seconds; begin waits for the window of
+            stop 0 to open.
+    """
+    if windows is None:
+        return start_time, 0.0
+    earliest, latest = windows[0]
+    begin = max(start_time, earliest) if not np.isnan(earliest) else start_time
+    late = max(begin - latest, 0.0) if not np.isnan(latest) else 0.0
+    return begin, late
+
+
+def evaluate(
+    orders: np.ndarray,
+    seconds: np.ndarray,
+    service: np.ndarray,
+    windows: Optional[np.ndarray],
+    start_time: float,
+    closed: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scores candidate routes.
+
+    Args:
+        orders (np.ndarray): (m, n) stop orders, each starting with stop 0.
+        seconds (np.ndarray): (n, n) travel times.
+        service (np.ndarray): (n,) time spent at each stop.
+        windows (np.ndarray, optional): (n, 2) earliest and latest arrival,
+            in seconds of the day, NaN where a stop has none.
+        start_time (float): Departure from the start, in seconds of the day.
+        closed (bool): Whether the route returns to the start.
+
+    Returns:
+        tuple: (travel seconds, lateness seconds) per candidate.
+    """
+    legs = seconds[orders[:, :-1], orders[:, 1:]]
+    if closed:
+        legs = np.column_stack((legs, seconds[orders[:, -1], orders[:, 0]]))
+    travel = legs.sum(axis=1)
+    if windows is None:
+        return travel, np.zeros(len(orders))
+
+    # Walk the schedule one stop at a time, across all candidates at once.
+    begin, late = start_visit(windows, start_time)
+    clock = np.full(len(orders), begin + service[0])
+    late = np.full(len(orders), late)
+    for position in range(1, orders.shape[1]):
+        stops = orders[:, position]
+        clock = clock + legs[:, position - 1]
+        clock = np.fmax(clock, windows[stops, 0])
+        late += np.nan_to_num(np.maximum(clock - windows[stops, 1], 0.0))
+        clock = clock + service[stops]
+    return travel, late
+
+
+def nearest_neighbor(seconds: np.ndarray) -> np.ndarray:
+    """Builds a route from stop 0 by always going to the closest unvisited stop."""
+    n = len(seconds)
+    order = [0]
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, seconds[order[-1]])
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        visited[nxt] = True
+    return np.array(order, dtype=np.intp)
+
+
+def solve(
+    seconds: np.ndarray,
+    service: Optional[np.ndarray] = None,
+    windows: Optional[np.ndarray] = None,
+    start_time: float = 0.0,
+    closed: bool = False,
+) -> dict:
+    """
+    Finds a good visiting order.
+
+    Args:
+        seconds (np.ndarray): (n, n) travel times; stop 0 is the start.
+            inf or NaN marks pairs without a route.
+        service (np.ndarray, optional): (n,) time spent at each stop.
+        windows (np.ndarray, optional): (n, 2) earliest/latest arrival in
+            seconds of the day, NaN where open.
+        start_time (float, optional): Departure time in seconds of the day.
+        closed (bool, optional): Return to the start at the end.
+
+    Returns:
+        dict: "order" (stop indices from 0), "travel_seconds",
+            "late_seconds" and "iterations".
+    """
+    n = len(seconds)
+    seconds = np.where(np.isfinite(seconds), seconds, UNREACHABLE_SECONDS)
+    service = np.zeros(n) if service is None else np.asarray(service, dtype=float)
+    if windows is not None and np.isnan(windows).all():
+        windows = None
+
+    order = nearest_neighbor(seconds)
+    travel, late = evaluate(
+        order[None, :], seconds, service, windows, start_time, closed
+    )
+    best = float(travel[0] + LATENESS_PENALTY * late[0])
+    moves = _moves(n)
+    iterations = 0
+    while len(moves) and iterations < MAX_ITERATIONS:
+        candidates = order[moves]
+        travel, late = evaluate(
+            candidates, seconds, service, windows, start_time, closed
+        )
+        scores = travel + LATENESS_PENALTY * late
+        pick = int(np.argmin(scores))
+        if scores[pick] >= best - 1e-6:
+            break
+        order, best = candidates[pick], float(scores[pick])
+        iterations += 1
+
+    travel, late = evaluate(
+        order[None, :], seconds, service, windows, start_time, closed
+    )
+    return {
+        "order": order.tolist(),
+        "travel_seconds": float(travel[0]),
+        "late_seconds": float(late[0]),
+        "iterations": iterations,
+    }
+
+
+def schedule(
+    order: List[int],
+    seconds: np.ndarray,
+    service: np.ndarray,
+    windows: Optional[np.ndarray],
+    start_time: float,
+    closed: bool,
+) -> List[dict]:
+    """
+    Times each leg of a route.
+
+    Returns:
+        list[dict]: Per leg, "from" and "to" stop indices, "travel" seconds
+            and the "arrive", "wait", "late" and "depart" times in seconds of
+            the day. The first entry is the visit at stop 0, with "from" None.
+    """
+    stops = list(order) + ([order[0]] if closed else [])
+    begin, late = start_visit(windows, start_time)
+    clock = begin + float(service[stops[0]])
+    legs = [
+        {
+            "from": None,
+            "to": stops[0],
+            "travel": 0.0,
+            "arrive": start_time,
+            "wait": begin - start_time,
+            "late": late,
+            "depart": clock,
+        }
+    ]
+    for leg, (a, b) in enumerate(zip(stops[:-1], stops[1:])):
+        travel = float(seconds[a, b])
+        arrive = clock + travel
+        # No visit, so no window either, when back at the start.
+        returning = closed and leg == len(stops) - 2
+        earliest, latest = (
+            (np.nan, np.nan) if windows is None or returning else windows[b]
+        )
+        begin = max(arrive, earliest) if not np.isnan(earliest) else arrive
+        late = max(begin - latest, 0.0) if not np.isnan(latest) else 0.0
+        clock = begin + (0.0 if returning else float(service[b]))
+        legs.append(
+            {
+                "from": a,
+                "to": b,
+                "travel": travel,
+                "arrive": arrive,
+                "wait": begin - arrive,
+                "late": late,
+                "depart": clock,
+            }
+        )
+    return legs
@@ -1,10 +1,43 @@
 import os
-import googlemaps
+import time
 from datetime import datetime
-from locus.shared_libraries.geocoding import geocode_location
+from typing import List, Optional
+from locus.shared_libraries import deadline, raptor
+from locus.shared_libraries.cache import TwoTierCache
+from locus.shared_libraries.directions import (
+    TRAVEL_MODES,
+    get_directions,
+    project_routes,
+)
+from locus.shared_libraries.geocoding import geocode_location, lookup_known_location
+from locus.shared_libraries.env_config import env_bool, env_float, env_int
+from locus.shared_libraries.gtfs import get_timetables, timetables_covering
+from locus.shared_libraries.http_client import get_gmaps_client
+from locus.shared_libraries.station_index import StationIndex
+from locus.shared_libraries.timezones import get_timezone, local_timestamp
 
+STATION_RADIUS_M = 1000
 
-def get_local_transport(destination: str, origin: str = "") -> dict:
+# Station sets change rarely, so nearby-station responses are kept for long
+# and searches inside an area already seen are answered locally.
+_station_index = StationIndex(
+    TwoTierCache(
+        "transit_stations",
+        ttl=env_float("LOCUS_TRANSIT_STATION_TTL", 30 * 24 * 3600),
+        persistent=env_bool("LOCUS_CACHE_PERSIST", True),
+    ),
+    seed_path=os.getenv("LOCUS_TRANSIT_STATIONS_PATH"),
+)
+
+
+@deadline.with_deadline()
+def get_local_transport(
+    destination: str,
+    origin: str = "",
+    mode: str = "transit",
+    departure_time: Optional[str] = None,
+    include_steps: bool = False,
+) -> dict:
     """
     Provides local transport information using Google Maps Directions API.
 
@@ -12,15 +45,29 @@ def get_local_transport(destination: str, origin: str = "") -> dict:
         destination (str): The destination address or landmark.
         origin (str, optional): The starting address. If not provided,
                                 it will search for public transit routes.
+        mode (str, optional): "transit", "driving", "walking" or "bicycling".
+            Defaults to "transit".
+        departure_time (str, optional): When to leave, as YYYY-MM-DDTHH:MM
+            in the origin's local time. Defaults to now.
+        include_steps (bool, optional): Add turn-by-turn steps and the route
+            polyline. Defaults to False; only ask for them when needed.
 
     Returns:
-        dict: A dictionary containing transport information.
+        dict: A dictionary containing transport information: for each route,
+            its duration, distance, departure and arrival times, fare,
+            transit lines, number of transfers and walking minutes.
     """
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
     if not api_key:
         return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if mode not in TRAVEL_MODES:
+        return {"error": f"Unknown travel mode '{mode}'. Use one of {TRAVEL_MODES}."}
+    try:
+        departure = parse_departure_time(departure_time)
+    except ValueError as e:
+        return {"error": str(e)}
 
-    gmaps = googlemaps.Client(key=api_key)
+    gmaps = get_gmaps_client(api_key)
 
     if not origin:
         # If no origin is specified, find public transit stations near the destination
@@ -33,26 +80,196 @@ def get_local_transport(destination: str, origin: str = "") -> dict:
             lat = geocode_result["lat"]
             lng = geocode_result["lng"]
 
-            places_result = gmaps.places_nearby(
-                location=(lat, lng), radius=1000, type="transit_station"
-            )
-
-            stations = [place["name"] for place in places_result.get("results", [])]
-            if not stations:
-                return {
-                    "message": f"No major public transport stations found near {destination}."
-                }
+            stations = _station_index.query(lat, lng, STATION_RADIUS_M)
+            if stations is None:
+                places_result = gmaps.places_nearby(
+                    location=(lat, lng),
+                    radius=STATION_RADIUS_M,
+                    type="transit_station",
+                )
+                stations = _station_index.add_response(
+                    lat,
+                    lng,
+                    STATION_RADIUS_M,
+                    places_result.get("results", []),
+                    places_result.get("next_page_token"),
+                )
 
-            return {"transit_stations_nearby": stations}
+            return nearby_stations_response(destination, stations)
 
         except Exception as e:
+            if deadline.expired():
+                return deadline.degraded(
+                    "Maps service did not respond within the time budget."
+                )
             return {"error": str(e)}
 
     try:
-        now = datetime.now()
-        directions_result = gmaps.directions(
-            origin, destination, mode="transit", departure_time=now
+        # Cities with a downloaded GTFS feed are routed locally once it has
+        # loaded; until then get_timetables() is empty.
+        if mode == "transit" and may_route_locally(origin, destination):
+            local = local_transit_response(
+                geocode_location(origin),
+                geocode_location(destination),
+                departure,
+                include_steps,
+            )
+            if local:
+                return local
+        routes = get_directions(
+            origin,
+            destination,
+            api_key,
+            mode,
+            departure_timestamp(departure, origin, api_key),
         )
-        return directions_result
+        if not routes:
+            return {"error": f"No {mode} route found from {origin} to {destination}."}
+        return project_routes(routes, mode, include_steps)
     except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Maps service did not respond within the time budget."
+            )
         return {"error": str(e)}
+
+
+def nearby_stations_response(destination: str, stations: List[dict]) -> dict:
+    """Builds the response listing the transit stations near a destination."""
+    if not stations:
+        return {
+            "message": f"No major public transport stations found near {destination}."
+        }
+    return {
+        "transit_stations_nearby": [
+            {"name": station["name"], "distance_m": station["distance_m"]}
+            for station in stations
+        ]
+    }
+
+
+def may_route_locally(origin: str, destination: str) -> bool:
+    """
+    Whether a transit trip is worth planning on the offline timetables.
+
+    Ends that resolve without a network call (gazetteer or geocode cache)
+    are checked against each timetable's area, so trips in cities without a
+    feed go straight to the Directions API instead of being geocoded first.
+
+    Args:
+        origin (str): The starting address or place.
+        destination (str): The destination address or place.
+
+    Returns:
+        bool: False if no timetable is loaded or an end is known to lie
+            outside all of them.
+    """
+    if not get_timetables():
+        return False
+    for place in (origin, destination):
+        known = lookup_known_location(place)
+        if known is not None and "error" not in known:
+            if not timetables_covering(known["lat"], known["lng"]):
+                return False
+    return True
+
+
+def local_transit_response(
+    origin_geocode: dict,
+    destination_geocode: dict,
+    departure: Optional[datetime],
+    include_steps: bool,
+) -> Optional[dict]:
+    """
+    Plans a transit trip on the offline GTFS timetables (LOCUS_GTFS_FEEDS).
+
+    Args:
+        origin_geocode (dict): geocode_location() result for the origin.
+        destination_geocode (dict): geocode_location() result for the
+            destination.
+        departure (datetime, optional): When to leave; naive times are
+            local to the timetable. Defaults to now.
+        include_steps (bool): Add the legs as plain-text steps.
+
+    Returns:
+        dict: A response shaped like project_routes(), plus its "source",
+            or None if no timetable has a journey between the two places.
+    """
+    if "error" in origin_geocode or "error" in destination_geocode:
+        return None
+    origin_point = (origin_geocode["lat"], origin_geocode["lng"])
+    destination_point = (destination_geocode["lat"], destination_geocode["lng"])
+    for timetable in timetables_covering(*origin_point):
+        if not timetable.covers(*destination_point):
+            continue
+        journeys = raptor.plan_journeys(
+            timetable,
+            origin_point,
+            destination_point,
+            time.time()
+            if departure is None
+            else local_timestamp(departure, timetable.timezone),
+        )
+        if journeys:
+            return {
+                "origin": origin_geocode.get("formatted_address"),
+                "destination": destination_geocode.get("formatted_address"),
+                "mode": "transit",
+                "routes": [
+                    raptor.project_journey(timetable, journey, include_steps)
+                    for journey in journeys[: env_int("LOCUS_DIRECTIONS_MAX_ROUTES", 3)]
+                ],
+                "source": f"offline timetable ({timetable.name})",
+            }
+    return None
+
+
+def parse_departure_time(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parses a departure time.
+
+    Args:
+        value (str, optional): An ISO 8601 date and time, e.g.
+            "2025-06-14T08:30". Without a UTC offset it is a local time at
+            the origin (see departure_timestamp()).
+
+    Returns:
+        datetime: The time, naive unless it had an offset, or None to leave
+            now.
+
+    Raises:
+        ValueError: If the time cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(
+            "Invalid departure_time. Please use YYYY-MM-DDTHH:MM format."
+        )
+
+
+def departure_timestamp(
+    departure: Optional[datetime], origin: str, api_key: str
+) -> Optional[float]:
+    """
+    Converts a departure time into Unix time in the origin's time zone.
+
+    Args:
+        departure (datetime, optional): From parse_departure_time().
+        origin (str): The starting address or place.
+        api_key (str): Google Maps API key.
+
+    Returns:
+        float: Unix time, or None to leave now. If the origin's zone cannot
+            be found, naive times are read in the server's zone.
+    """
+    if departure is None:
+        return None
+    zone = None
+    if departure.tzinfo is None:
+        located = geocode_location(origin)
+        if "error" not in located:
+            zone = get_timezone(located["lat"], located["lng"], api_key)
+    return local_timestamp(departure, zone)
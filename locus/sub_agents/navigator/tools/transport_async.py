@@ -0,0 +1,149 @@
+"""
+Async variant of get_local_transport, registered with the navigator agent.
+
+Calls the Places and Directions web services directly over the shared async
+HTTP client, since the googlemaps library only offers a blocking client.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Optional
+from locus.shared_libraries import deadline, http_client
+from locus.shared_libraries.directions import (
+    TRAVEL_MODES,
+    get_directions_async,
+    project_routes,
+)
+from locus.shared_libraries.geocoding import geocode_location_async
+from locus.shared_libraries.timezones import get_timezone_async, local_timestamp
+from .transport import (
+    STATION_RADIUS_M,
+    _station_index,
+    local_transit_response,
+    may_route_locally,
+    nearby_stations_response,
+    parse_departure_time,
+)
+
+
+@deadline.with_deadline()
+async def get_local_transport(
+    destination: str,
+    origin: str = "",
+    mode: str = "transit",
+    departure_time: Optional[str] = None,
+    include_steps: bool = False,
+) -> dict:
+    """
+    Provides local transport information using Google Maps Directions API.
+
+    Args:
+        destination (str): The destination address or landmark.
+        origin (str, optional): The starting address. If not provided,
+                                it will search for public transit routes.
+        mode (str, optional): "transit", "driving", "walking" or "bicycling".
+            Defaults to "transit".
+        departure_time (str, optional): When to leave, as YYYY-MM-DDTHH:MM
+            in the origin's local time. Defaults to now.
+        include_steps (bool, optional): Add turn-by-turn steps and the route
+            polyline. Defaults to False; only ask for them when needed.
+
+    Returns:
+        dict: A dictionary containing transport information: for each route,
+            its duration, distance, departure and arrival times, fare,
+            transit lines, number of transfers and walking minutes.
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+    if mode not in TRAVEL_MODES:
+        return {"error": f"Unknown travel mode '{mode}'. Use one of {TRAVEL_MODES}."}
+    try:
+        departure = parse_departure_time(departure_time)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    if not origin:
+        # If no origin is specified, find public transit stations near the destination
+        try:
+            geocode_result = await geocode_location_async(destination)
+            if "error" in geocode_result:
+                return {"error": geocode_result["error"]}
+
+            lat = geocode_result["lat"]
+            lng = geocode_result["lng"]
+
+            if not _station_index.loaded:
+                # The first use reads the persisted responses from disk.
+                await asyncio.to_thread(_station_index.load)
+            stations = _station_index.query(lat, lng, STATION_RADIUS_M)
+            if stations is None:
+                places_result = await http_client.amaps_get(
+                    "place/nearbysearch",
+                    {
+                        "location": f"{lat},{lng}",
+                        "radius": STATION_RADIUS_M,
+                        "type": "transit_station",
+                    },
+                    api_key,
+                )
+                stations = _station_index.add_response(
+                    lat,
+                    lng,
+                    STATION_RADIUS_M,
+                    places_result.get("results", []),
+                    places_result.get("next_page_token"),
+                )
+
+            return nearby_stations_response(destination, stations)
+
+        except Exception as e:
+            if deadline.expired():
+                return deadline.degraded(
+                    "Maps service did not respond within the time budget."
+                )
+            return {"error": str(e)}
+
+    try:
+        # Cities with a downloaded GTFS feed are routed locally once it has
+        # loaded; until then get_timetables() is empty.
+        if mode == "transit" and may_route_locally(origin, destination):
+            origin_geocode, destination_geocode = await asyncio.gather(
+                geocode_location_async(origin), geocode_location_async(destination)
+            )
+            local = local_transit_response(
+                origin_geocode, destination_geocode, departure, include_steps
+            )
+            if local:
+                return local
+        routes = await get_directions_async(
+            origin,
+            destination,
+            api_key,
+            mode,
+            await departure_timestamp(departure, origin, api_key),
+        )
+        if not routes:
+            return {"error": f"No {mode} route found from {origin} to {destination}."}
+        return project_routes(routes, mode, include_steps)
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Maps service did not respond within the time budget."
+            )
+        return {"error": str(e)}
+
+
+async def departure_timestamp(
+    departure: Optional[datetime], origin: str, api_key: str
+) -> Optional[float]:
+    """Async variant of transport.departure_timestamp(); see it for details."""
+    if departure is None:
+        return None
+    zone = None
+    if departure.tzinfo is None:
+        located = await geocode_location_async(origin)
+        if "error" not in located:
+            zone = await get_timezone_async(located["lat"], located["lng"], api_key)
+    return local_timestamp(departure, zone)
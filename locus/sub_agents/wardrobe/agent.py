@@ -1,12 +1,10 @@
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 from .prompt import WARDROBE_PROMPT
-from .tools.query_tools import (
+from .tools.async_tools import (
     get_outfits_for_event,
     get_outfit_details,
     list_wardrobe_items,
-)
-from .tools.crud_tools import (
     create_wardrobe_item,
     update_wardrobe_item,
     delete_wardrobe_item,
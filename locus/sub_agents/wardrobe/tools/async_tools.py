@@ -0,0 +1,32 @@
+"""
+Async variants of the wardrobe tools, registered with the wardrobe agent.
+
+The wardrobe database is accessed through the synchronous SQLAlchemy engine
+in db_utils, so each tool runs in a worker thread rather than blocking the
+agent's event loop. The wrappers keep the name, signature and docstring of
+the sync tool so the tool schema the model sees is unchanged.
+"""
+
+import asyncio
+import functools
+from typing import Callable
+from . import crud_tools, query_tools
+
+
+def _in_thread(func: Callable) -> Callable:
+    """Wraps a blocking tool function as a coroutine run via asyncio.to_thread."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+get_outfits_for_event = _in_thread(query_tools.get_outfits_for_event)
+get_outfit_details = _in_thread(query_tools.get_outfit_details)
+list_wardrobe_items = _in_thread(query_tools.list_wardrobe_items)
+create_wardrobe_item = _in_thread(crud_tools.create_wardrobe_item)
+update_wardrobe_item = _in_thread(crud_tools.update_wardrobe_item)
+delete_wardrobe_item = _in_thread(crud_tools.delete_wardrobe_item)
+mark_item_worn = _in_thread(crud_tools.mark_item_worn)
@@ -2,7 +2,10 @@ from google.adk.agents import Agent
 from google.adk.tools import AgentTool
 from locus.sub_agents.search.agent import search_agent
 from .prompt import WEATHER_PROMPT
-from .tools.weather import get_weather
+from .tools.climate_normals import get_climate_normals
+from .tools.weather_async import get_weather
+from .tools.weather_bulk_async import get_weather_bulk
+from .tools.weather_history_async import get_weather_history
 from ...shared_libraries.model_config import get_model_type
 
 search_tool = AgentTool(agent=search_agent)
@@ -12,5 +15,11 @@ weather_agent = Agent(
     model=get_model_type("sub_agent"),
     instruction=WEATHER_PROMPT,
     description="Provides weather information and forecasts to help with travel planning and safety.",
-    tools=[get_weather, search_tool],
+    tools=[
+        get_weather,
+        get_weather_bulk,
+        get_weather_history,
+        get_climate_normals,
+        search_tool,
+    ],
 )
@@ -0,0 +1,296 @@
+"""
+Monthly climate normals for gazetteer cities.
+
+Seasonal questions ("what's Tokyo like in April") are answered from a
+precomputed table instead of live API calls. The table is a single
+float32 .npy array of shape (gazetteer rows, 12 months, len(FIELDS)), opened
+memory-mapped so a lookup is an index into shared pages. Rows without
+data are NaN.
+
+The table is built offline from the daily history already in the weather
+history cache (see get_weather_history), never from made-up values:
+
+    python -m locus.sub_agents.weather.tools.climate_normals
+
+Rebuild it whenever more history has been cached; running servers pick up
+a rebuilt table when they restart.
+"""
+
+import argparse
+import calendar
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Optional
+import numpy as np
+from locus.shared_libraries.cache import get_cache_dir
+from locus.shared_libraries.env_config import env_int
+from locus.shared_libraries.gazetteer import Gazetteer, get_gazetteer
+from .history_stats import aggregate_days, hourly_columns
+from .weather import celsius_to_fahrenheit
+from .weather_cache import history_cache
+
+FIELDS = (
+    "min_temp_celsius",
+    "max_temp_celsius",
+    "mean_temp_celsius",
+    "precipitation_mm",
+    "humidity_percent",
+    "sample_days",
+)
+
+# Average month lengths, used to turn mean daily precipitation into a
+# monthly total.
+MONTH_DAYS = np.array([31, 28.25, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+_lock = threading.Lock()
+_normals = None
+
+
+def get_climate_normals(location: str, month: Optional[str] = None) -> dict:
+    """
+    Gets typical monthly weather (climate normals) for a destination city.
+
+    Use this for seasonal questions such as "what's Tokyo like in April"
+    rather than for a specific date.
+
+    Args:
+        location (str): The city (e.g., "Tokyo, Japan").
+        month (str, optional): Month name ("April"), abbreviation ("Apr") or
+            number ("4"). Omit it to get all twelve months.
+
+    Returns:
+        dict: A dictionary containing, per month, the average daily low and
+            high, mean temperature (Celsius and Fahrenheit), typical monthly
+            precipitation, mean humidity and the number of days of history
+            behind the figures.
+    """
+    months = list(range(1, 13))
+    if month:
+        number = parse_month(month)
+        if number is None:
+            return {"error": f"Unknown month '{month}'. Use a name like 'April'."}
+        months = [number]
+
+    gazetteer = get_gazetteer()
+    row = gazetteer.find_row(location) if gazetteer is not None else None
+    if row is None or gazetteer.entry(row)["kind"] != "city":
+        return {"error": f"No climate normals are available for {location}."}
+
+    normals = load_climate_normals(gazetteer)
+    if normals is None:
+        return {"error": "Climate normals have not been built on this server."}
+
+    entries = [
+        entry
+        for entry in (month_entry(normals[row, m - 1], m) for m in months)
+        if entry is not None
+    ]
+    if not entries:
+        return {
+            "error": f"No climate normals are available for {location} "
+            f"in {calendar.month_name[months[0]] if month else 'any month'}."
+        }
+    return {
+        "location": gazetteer.address(row),
+        "coordinates": {
+            "lat": float(gazetteer.lat[row]),
+            "lng": float(gazetteer.lng[row]),
+        },
+        "climate_normals": entries,
+    }
+
+
+def parse_month(month: str) -> Optional[int]:
+    """Parses a month name, abbreviation or number into 1-12, or None."""
+    text = str(month).strip().casefold()
+    if text.isdigit():
+        number = int(text)
+        return number if 1 <= number <= 12 else None
+    for number in range(1, 13):
+        if text in (
+            calendar.month_name[number].casefold(),
+            calendar.month_abbr[number].casefold(),
+        ):
+            return number
+    return None
+
+
+def month_entry(values: np.ndarray, month: int) -> Optional[dict]:
+    """
+    Shapes one row of the table into a tool response entry.
+
+    Args:
+        values (np.ndarray): The FIELDS values for one city and month.
+        month (int): The month number (1-12).
+
+    Returns:
+        dict: The month's normals, or None if the month has no data.
+    """
+    data = dict(zip(FIELDS, values.tolist()))
+    if np.isnan(data["sample_days"]) or not data["sample_days"]:
+        return None
+    entry = {"month": calendar.month_name[month]}
+    for name in FIELDS[:-1]:
+        value = data[name]
+        entry[name] = None if np.isnan(value) else round(value, 1)
+    for name in ("min_temp", "max_temp", "mean_temp"):
+        entry[f"{name}_fahrenheit"] = celsius_to_fahrenheit(entry[f"{name}_celsius"])
+    entry["sample_days"] = int(data["sample_days"])
+    return entry
+
+
+def climate_normals_path(gazetteer: Gazetteer) -> str:
+    """
+    Gets where the table for a compiled gazetteer is stored.
+
+    Rows follow the gazetteer's row order, so the default file name carries
+    the gazetteer's source digest.
+
+    Returns:
+        str: LOCUS_CLIMATE_NORMALS_PATH, or a file in the cache directory.
+    """
+    configured = os.getenv("LOCUS_CLIMATE_NORMALS_PATH")
+    if configured:
+        return os.path.expanduser(configured)
+    digest = os.path.basename(gazetteer.directory).rsplit("-", 1)[-1]
+    return os.path.join(get_cache_dir(), f"climate-normals-{digest}.npy")
+
+
+def load_climate_normals(gazetteer: Gazetteer) -> Optional[np.ndarray]:
+    """
+    Opens the climate normals table memory-mapped.
+
+    Returns:
+        np.ndarray: The (rows, 12, len(FIELDS)) table, or None if it has not
+            been built or does not match the gazetteer.
+    """
+    global _normals
+    if _normals is None:
+        with _lock:
+            if _normals is None:
+                try:
+                    table = np.load(climate_normals_path(gazetteer), mmap_mode="r")
+                except (OSError, ValueError):
+                    return None
+                if table.shape != (len(gazetteer), 12, len(FIELDS)):
+                    return None
+                _normals = table.view(np.ndarray)
+    return _normals
+
+
+def monthly_normals(payloads: dict) -> np.ndarray:
+    """
+    Computes one city's monthly normals from its cached daily history.
+
+    Args:
+        payloads (dict): Date (YYYY-MM-DD) -> history:lookup payload.
+
+    Returns:
+        np.ndarray: A (12, len(FIELDS)) array, NaN where a month has no data.
+    """
+    dates, day_columns = [], []
+    for date, payload in payloads.items():
+        hours = payload.get("history", {}).get("hours", [])
+        try:
+            month = datetime.strptime(date, "%Y-%m-%d").month
+        except ValueError:
+            continue
+        if hours:
+            dates.append(month - 1)
+            day_columns.append(hourly_columns(hours))
+
+    table = np.full((12, len(FIELDS)), np.nan, dtype=np.float32)
+    if not day_columns:
+        return table
+    months = np.array(dates)
+    daily = aggregate_days(day_columns)["daily"]
+
+    def monthly_mean(values: np.ndarray) -> tuple:
+        valid = ~np.isnan(values)
+        sums = np.bincount(months[valid], weights=values[valid], minlength=12)
+        counts = np.bincount(months[valid], minlength=12)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan), counts
+
+    for index, name in enumerate(FIELDS[:3]):
+        table[:, index] = monthly_mean(daily[name])[0]
+    rain, _ = monthly_mean(daily["precipitation_mm"])
+    table[:, 3] = rain * MONTH_DAYS
+    table[:, 4] = monthly_mean(daily["humidity_percent"])[0]
+    table[:, 5] = monthly_mean(daily["mean_temp_celsius"])[1]
+    return table
+
+
+def build_climate_normals(
+    output: Optional[str] = None, min_days: Optional[int] = None
+) -> dict:
+    """
+    Builds the climate normals table from the weather history cache.
+
+    Args:
+        output (str, optional): Where to write the table. Defaults to
+            climate_normals_path().
+        min_days (int, optional): Days of history a month needs before it is
+            reported. Defaults to LOCUS_CLIMATE_NORMALS_MIN_DAYS.
+
+    Returns:
+        dict: "path" of the table, plus counts of "cities" and city "months"
+            with data.
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        raise RuntimeError("The gazetteer is disabled or could not be built.")
+    if min_days is None:
+        min_days = env_int("LOCUS_CLIMATE_NORMALS_MIN_DAYS", 5)
+    output = output or climate_normals_path(gazetteer)
+
+    table = np.full((len(gazetteer), 12, len(FIELDS)), np.nan, dtype=np.float32)
+    cities = months = 0
+    for row in range(len(gazetteer)):
+        if gazetteer.entry(row)["kind"] != "city":
+            continue
+        lat, lng = float(gazetteer.lat[row]), float(gazetteer.lng[row])
+        normals = monthly_normals(dict(history_cache.cell_entries(lat, lng)))
+        normals[normals[:, -1] < min_days] = np.nan
+        table[row] = normals
+        filled = int((normals[:, -1] > 0).sum())
+        cities += bool(filled)
+        months += filled
+
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    fd, staging = tempfile.mkstemp(
+        prefix=".climate-normals-", suffix=".npy", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, table)
+        os.replace(staging, output)
+    except OSError:
+        os.unlink(staging)
+        raise
+    return {"path": output, "cities": cities, "months": months}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the climate normals table from cached weather history."
+    )
+    parser.add_argument("--output", help="Where to write the table.")
+    parser.add_argument(
+        "--min-days",
+        type=int,
+        help="Days of history a month needs before it is reported.",
+    )
+    args = parser.parse_args()
+    result = build_climate_normals(args.output, args.min_days)
+    print(
+        f"Wrote {result['path']}: {result['months']} months of normals "
+        f"for {result['cities']} cities."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+NumPy aggregation of hourly weather history.
+
+Hourly history:lookup records are parsed once into float columns, with NaN
+where a value is missing. Days are then stacked into (days, hours) matrices
+so daily and range statistics come from one vectorized pass per column
+instead of a Python loop per record.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+import numpy as np
+
+# Column name -> path to the value inside an hourly record.
+HOURLY_FIELDS = {
+    "temperature_celsius": ("temperature", "degrees"),
+    "humidity_percent": ("relativeHumidity",),
+    "precipitation_mm": ("precipitation", "amount"),
+    "wind_speed_mps": ("wind", "speed", "value"),
+    "cloudiness_percent": ("cloudCover", "percentage"),
+}
+
+# Daily precipitation at or above this counts as a wet day.
+WET_DAY_MM = 1.0
+
+
+def _field(record: dict, path: tuple) -> float:
+    value = record
+    for name in path:
+        if not isinstance(value, dict):
+            return np.nan
+        value = value.get(name)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _hour_of_day(timestamp: Optional[str]) -> float:
+    """Fractional hour of day from an ISO 8601 timestamp, or NaN."""
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return np.nan
+    return parsed.hour + parsed.minute / 60
+
+
+def hourly_columns(hours: List[dict]) -> dict:
+    """
+    Parses hourly history records into NumPy columns.
+
+    Args:
+        hours (list): The "hours" records of a history:lookup payload.
+
+    Returns:
+        dict: "hour" (fractional hour of day) and one float array per
+            HOURLY_FIELDS entry, all of length len(hours), NaN where missing.
+    """
+    columns = {
+        "hour": np.array([_hour_of_day(h.get("timestamp")) for h in hours], float)
+    }
+    for name, path in HOURLY_FIELDS.items():
+        columns[name] = np.array([_field(h, path) for h in hours], float)
+    return columns
+
+
+def midday_index(hour: np.ndarray) -> int:
+    """
+    Picks the record closest to 12:00 from an hour-of-day column.
+
+    Args:
+        hour (np.ndarray): The "hour" column from hourly_columns().
+
+    Returns:
+        int: Index of the record nearest noon, or the middle record when no
+            timestamp could be parsed.
+    """
+    distance = np.abs(hour - 12.0)
+    if not len(hour) or np.isnan(distance).all():
+        return len(hour) // 2
+    return int(np.nanargmin(distance))
+
+
+def _stack(day_columns: List[dict], name: str) -> np.ndarray:
+    width = max((len(columns[name]) for columns in day_columns), default=0)
+    matrix = np.full((len(day_columns), max(width, 1)), np.nan)
+    for row, columns in enumerate(day_columns):
+        matrix[row, : len(columns[name])] = columns[name]
+    return matrix
+
+
+def _row_mean(matrix: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    totals = np.where(np.isnan(matrix), 0.0, matrix).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+
+def _percentiles(values: np.ndarray, percentiles: tuple) -> dict:
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return {f"p{p}": None for p in percentiles}
+    return {
+        f"p{p}": round(float(v), 1)
+        for p, v in zip(percentiles, np.percentile(values, percentiles))
+    }
+
+
+def to_json(values: np.ndarray) -> list:
+    """Converts a float array to a JSON-friendly list, NaN -> None, rounded to 0.1."""
+    return [None if np.isnan(v) else round(float(v), 1) for v in values]
+
+
+def aggregate_days(day_columns: List[dict]) -> dict:
+    """
+    Computes daily and range statistics for a run of days.
+
+    Args:
+        day_columns (list): hourly_columns() for each day, in date order.
+            A day without data is an empty hourly_columns([]).
+
+    Returns:
+        dict: "daily" maps statistic name -> array with one value per day
+            (NaN for days without data), and "summary" holds range-wide
+            values ready for JSON.
+    """
+    temps = _stack(day_columns, "temperature_celsius")
+    rain = _stack(day_columns, "precipitation_mm")
+    humidity = _stack(day_columns, "humidity_percent")
+    wind = _stack(day_columns, "wind_speed_mps")
+
+    temp_counts = (~np.isnan(temps)).sum(axis=1)
+    rain_counts = (~np.isnan(rain)).sum(axis=1)
+    # fmin/fmax skip NaN and give NaN for an all-NaN row, without warnings.
+    daily = {
+        "min_temp_celsius": np.fmin.reduce(temps, axis=1),
+        "max_temp_celsius": np.fmax.reduce(temps, axis=1),
+        "mean_temp_celsius": _row_mean(temps, temp_counts),
+        "precipitation_mm": np.where(
+            rain_counts > 0, np.where(np.isnan(rain), 0.0, rain).sum(axis=1), np.nan
+        ),
+        "humidity_percent": _row_mean(humidity, (~np.isnan(humidity)).sum(axis=1)),
+        "max_wind_speed_mps": np.fmax.reduce(wind, axis=1),
+    }
+
+    valid_temps = temps[~np.isnan(temps)]
+    daily_rain = daily["precipitation_mm"]
+    rain_days = daily_rain[~np.isnan(daily_rain)]
+    summary = {
+        "days_with_data": int((temp_counts > 0).sum()),
+        "min_temp_celsius": round(float(valid_temps.min()), 1)
+        if valid_temps.size
+        else None,
+        "max_temp_celsius": round(float(valid_temps.max()), 1)
+        if valid_temps.size
+        else None,
+        "mean_temp_celsius": round(float(valid_temps.mean()), 1)
+        if valid_temps.size
+        else None,
+        "temperature_percentiles_celsius": _percentiles(valid_temps, (10, 50, 90)),
+        "total_precipitation_mm": round(float(rain_days.sum()), 1)
+        if rain_days.size
+        else None,
+        "wet_days": int((rain_days >= WET_DAY_MM).sum()),
+        "daily_precipitation_percentiles_mm": _percentiles(daily_rain, (50, 90)),
+    }
+    return {"daily": daily, "summary": summary}
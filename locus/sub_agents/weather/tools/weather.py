@@ -1,10 +1,27 @@
 import os
-import requests
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+from locus.shared_libraries import deadline, http_client
 from locus.shared_libraries.geocoding import geocode_location
+from locus.shared_libraries.timezones import get_timezone
+from .history_stats import aggregate_days, hourly_columns, midday_index
+from .weather_cache import (
+    PARTIAL_HISTORY_TTL,
+    current_cache,
+    forecast_cache,
+    history_cache,
+)
 
+CURRENT_CONDITIONS_URL = "https://weather.googleapis.com/v1/currentConditions:lookup"
+FORECAST_URL = "https://weather.googleapis.com/v1/forecast/days:lookup"
+HISTORY_URL = "https://weather.googleapis.com/v1/history:lookup"
+# The Weather API serves up to 10 days of daily forecasts.
+FORECAST_DAYS = 10
 
+
+@deadline.with_deadline()
 def get_weather(
     location: str, days_ahead: Optional[int] = 0, specific_date: Optional[str] = None
 ) -> dict:
@@ -24,6 +41,7 @@ def get_weather(
     if not api_key:
         return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
 
+    partial = {"location": location}
     try:
         # Geocode the location using shared utility
         geocode_result = geocode_location(location)
@@ -32,53 +50,130 @@ def get_weather(
 
         lat = geocode_result["lat"]
         lng = geocode_result["lng"]
+        partial["coordinates"] = {"lat": lat, "lng": lng}
 
         # Use Google Maps Weather API for weather data
-        if specific_date:
-            # Historical weather data
-            try:
-                target_date = datetime.strptime(specific_date, "%Y-%m-%d")
-                today = datetime.now()
-
-                if target_date.date() == today.date():
-                    # Today - use current conditions
-                    return get_current_weather(lat, lng, api_key, location)
-                elif target_date > today:
-                    # Future date - use forecast
-                    days_diff = (target_date - today).days
-                    return get_forecast_weather(lat, lng, api_key, location, days_diff)
-                else:
-                    # Past date - use historical data
-                    return get_historical_weather(
-                        lat, lng, api_key, location, specific_date
-                    )
-            except ValueError:
-                return {"error": "Invalid date format. Please use YYYY-MM-DD format."}
-
-        elif days_ahead == 0:
-            # Current weather
-            return get_current_weather(lat, lng, api_key, location)
-        else:
-            # Forecast
-            return get_forecast_weather(lat, lng, api_key, location, days_ahead)
+        try:
+            lookup, argument = plan_weather_request(days_ahead, specific_date)
+        except ValueError:
+            return {"error": "Invalid date format. Please use YYYY-MM-DD format."}
+
+        return run_weather_lookup(lookup, argument, lat, lng, api_key, location)
 
     except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Weather service did not respond within the time budget.", **partial
+            )
         return {"error": f"Failed to fetch weather information: {str(e)}"}
 
 
+def plan_weather_request(
+    days_ahead: Optional[int] = 0, specific_date: Optional[str] = None
+) -> tuple:
+    """
+    Decides which Weather API lookup answers a get_weather request.
+
+    Args:
+        days_ahead (int, optional): Number of days ahead from today.
+        specific_date (str, optional): Specific date in YYYY-MM-DD format.
+
+    Dates are compared as calendar dates, so "tomorrow" is always one day
+    ahead regardless of the time of day.
+
+    Returns:
+        tuple: ("current", None), ("forecast", date) or ("history", date),
+            with dates in YYYY-MM-DD format.
+
+    Raises:
+        ValueError: If specific_date is not in YYYY-MM-DD format.
+    """
+    today = datetime.now().date()
+    if specific_date:
+        target_date = datetime.strptime(specific_date, "%Y-%m-%d").date()
+
+        if target_date == today:
+            # Today - use current conditions
+            return "current", None
+        elif target_date > today:
+            # Future date - use forecast
+            return "forecast", specific_date
+        else:
+            # Past date - use historical data
+            return "history", specific_date
+
+    if not days_ahead:
+        return "current", None
+    return "forecast", (today + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
+
+
+def run_weather_lookup(
+    lookup: str,
+    argument: Optional[str],
+    lat: float,
+    lng: float,
+    api_key: str,
+    location: str,
+) -> dict:
+    """
+    Runs one lookup planned by plan_weather_request().
+
+    Args:
+        lookup (str): "current", "forecast" or "history".
+        argument (str, optional): The date for forecast and history lookups.
+        lat (float): Latitude.
+        lng (float): Longitude.
+        api_key (str): Google Maps API key.
+        location (str): The location name for the response.
+
+    Returns:
+        dict: The weather response for the lookup.
+    """
+    if lookup == "current":
+        return get_current_weather(lat, lng, api_key, location)
+    elif lookup == "forecast":
+        return get_forecast_weather(lat, lng, api_key, location, argument)
+    else:
+        return get_historical_weather(lat, lng, api_key, location, argument)
+
+
 def get_current_weather(lat: float, lng: float, api_key: str, location: str) -> dict:
     """Get current weather conditions using Google Maps Weather API."""
-    weather_url = "https://weather.googleapis.com/v1/currentConditions:lookup"
-    weather_params = {
-        "key": api_key,
-        "location.latitude": lat,
-        "location.longitude": lng,
-    }
+    # Nearby coordinates share a recent result; concurrent misses share one call.
+    weather_data, age = current_cache.get_or_revalidate(
+        lat,
+        lng,
+        fetch_current_conditions,
+        lat,
+        lng,
+        api_key,
+        bucket=datetime.now().strftime("%Y-%m-%d"),
+    )
 
-    weather_response = requests.get(weather_url, params=weather_params)
-    weather_response.raise_for_status()
-    weather_data = weather_response.json()
+    return mark_stale(parse_current_conditions(weather_data, lat, lng, location), age)
+
+
+def mark_stale(result: dict, age: Optional[float]) -> dict:
+    """
+    Flags a response built from stale cached data.
 
+    Args:
+        result (dict): The tool response.
+        age (float, optional): Seconds since the data was fetched, or None if fresh.
+
+    Returns:
+        dict: The same response, with "stale" and "data_age_minutes" when stale.
+    """
+    if age is not None and "error" not in result:
+        result["stale"] = True
+        result["data_age_minutes"] = round(age / 60)
+    return result
+
+
+def parse_current_conditions(
+    weather_data: dict, lat: float, lng: float, location: str
+) -> dict:
+    """Shape a currentConditions:lookup payload into the tool response."""
     if "error" in weather_data:
         return {"error": f"Weather API error: {weather_data['error']['message']}"}
 
@@ -126,19 +221,168 @@ def get_current_weather(lat: float, lng: float, api_key: str, location: str) ->
     }
 
 
+def fetch_current_conditions(lat: float, lng: float, api_key: str) -> dict:
+    """Fetch the raw currentConditions:lookup payload for a coordinate."""
+    weather_params = {
+        "key": api_key,
+        "location.latitude": lat,
+        "location.longitude": lng,
+    }
+
+    weather_response = http_client.get(CURRENT_CONDITIONS_URL, params=weather_params)
+    weather_response.raise_for_status()
+    return weather_response.json()
+
+
 def get_forecast_weather(
-    lat: float, lng: float, api_key: str, location: str, days_ahead: int
+    lat: float, lng: float, api_key: str, location: str, target_date: str
 ) -> dict:
-    """Get weather forecast - Google Maps Weather API only provides current conditions."""
-    target_date = (datetime.now() + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
+    """Get the daily forecast for a date using Google Maps Weather API."""
+    # One call covers the whole forecast horizon, so every date question for
+    # this cell today is answered from the same cached series.
+    series, age = forecast_cache.get_or_revalidate(
+        lat,
+        lng,
+        fetch_forecast,
+        lat,
+        lng,
+        api_key,
+        bucket=datetime.now().strftime("%Y-%m-%d"),
+    )
+    return mark_stale(forecast_for_date(series, target_date, lat, lng, location), age)
+
+
+def fetch_forecast(lat: float, lng: float, api_key: str) -> dict:
+    """Fetch the full daily forecast horizon for a coordinate as a compact series."""
+    weather_response = http_client.get(
+        FORECAST_URL,
+        params={
+            "key": api_key,
+            "location.latitude": lat,
+            "location.longitude": lng,
+            "days": FORECAST_DAYS,
+            "pageSize": FORECAST_DAYS,  # The whole horizon in a single page
+        },
+    )
+    weather_response.raise_for_status()
+    return compact_forecast(weather_response.json())
+
+
+def compact_forecast(forecast_data: dict) -> dict:
+    """
+    Reduces a forecast/days:lookup payload to the fields the tool reports.
+
+    Args:
+        forecast_data (dict): The forecast/days:lookup response body.
+
+    Returns:
+        dict: {"time_zone": str, "days": [...]}, one entry per forecast date
+            in YYYY-MM-DD order.
+    """
+
+    def daypart(part: dict) -> dict:
+        condition = part.get("weatherCondition", {})
+        precipitation = part.get("precipitation", {})
+        return {
+            "description": condition.get("description", {}).get("text"),
+            "main_condition": condition.get("type"),
+            "precipitation_probability": precipitation.get("probability", {}).get(
+                "percent"
+            ),
+            "precipitation_mm": precipitation.get("qpf", {}).get("quantity"),
+            "thunderstorm_probability": part.get("thunderstormProbability"),
+            "humidity_percent": part.get("relativeHumidity"),
+            "wind_speed_mps": round(
+                part.get("wind", {}).get("speed", {}).get("value") / 3.6, 1
+            )
+            if part.get("wind", {}).get("speed", {}).get("value") is not None
+            else None,  # Convert km/h to m/s
+            "wind_direction_degrees": part.get("wind", {})
+            .get("direction", {})
+            .get("degrees"),
+            "cloudiness_percent": part.get("cloudCover"),
+            "uv_index": part.get("uvIndex"),
+        }
+
+    days = []
+    for day in forecast_data.get("forecastDays", []):
+        display = day.get("displayDate", {})
+        if not display:
+            continue
+        days.append(
+            {
+                "date": "{year:04d}-{month:02d}-{day:02d}".format(**display),
+                "max_temperature_celsius": day.get("maxTemperature", {}).get(
+                    "degrees"
+                ),
+                "min_temperature_celsius": day.get("minTemperature", {}).get(
+                    "degrees"
+                ),
+                "feels_like_max_celsius": day.get("feelsLikeMaxTemperature", {}).get(
+                    "degrees"
+                ),
+                "feels_like_min_celsius": day.get("feelsLikeMinTemperature", {}).get(
+                    "degrees"
+                ),
+                "sunrise": day.get("sunEvents", {}).get("sunriseTime"),
+                "sunset": day.get("sunEvents", {}).get("sunsetTime"),
+                "daytime": daypart(day.get("daytimeForecast", {})),
+                "nighttime": daypart(day.get("nighttimeForecast", {})),
+            }
+        )
+    return {
+        "time_zone": forecast_data.get("timeZone", {}).get("id"),
+        "days": days,
+    }
+
+
+def forecast_for_date(
+    series: dict, target_date: str, lat: float, lng: float, location: str
+) -> dict:
+    """
+    Answers a forecast question for one date from a cached forecast series.
+
+    Args:
+        series (dict): A compact_forecast() series.
+        target_date (str): The date in YYYY-MM-DD format (location-local).
+        lat (float): Latitude.
+        lng (float): Longitude.
+        location (str): The location name for the response.
+
+    Returns:
+        dict: The forecast for the date, or a message if the date is outside
+            the forecast horizon.
+    """
+    days_ahead = (
+        datetime.strptime(target_date, "%Y-%m-%d").date() - datetime.now().date()
+    ).days
+    days = series.get("days", [])
+    day = next((d for d in days if d["date"] == target_date), None)
+    if day is None:
+        horizon = f"{days[0]['date']} to {days[-1]['date']}" if days else "no dates"
+        return {
+            "location": location,
+            "coordinates": {"lat": lat, "lng": lng},
+            "forecast_date": target_date,
+            "days_ahead": days_ahead,
+            "message": f"No forecast available for {target_date}. The forecast covers {horizon}.",
+        }
 
     return {
         "location": location,
         "coordinates": {"lat": lat, "lng": lng},
         "forecast_date": target_date,
         "days_ahead": days_ahead,
-        "note": "Google Maps Weather API only provides current weather conditions. Forecast data is not available through this API.",
-        "message": f"Unable to provide forecast for {target_date}. Consider using a dedicated weather service for future weather predictions.",
+        "time_zone": series.get("time_zone"),
+        "forecast": {
+            **day,
+            "max_temperature_fahrenheit": celsius_to_fahrenheit(
+                day["max_temperature_celsius"]
+            ),
+            "min_temperature_fahrenheit": celsius_to_fahrenheit(
+                day["min_temperature_celsius"]
+            ),
+        },
     }
 
 
@@ -146,19 +390,25 @@ def get_historical_weather(
     lat: float, lng: float, api_key: str, location: str, specific_date: str
 ) -> dict:
     """Get historical weather data using Google Maps Weather API."""
-    weather_url = "https://weather.googleapis.com/v1/history:lookup"
-    weather_params = {
-        "key": api_key,
-        "location.latitude": lat,
-        "location.longitude": lng,
-        "timestamp": specific_date + "T12:00:00Z",  # Midday timestamp
-        "hours": 24,  # Get 24 hours of data
-    }
+    # History for a given day never changes, so it is bucketed by date.
+    weather_data = history_cache.get_or_fetch(
+        lat,
+        lng,
+        fetch_history,
+        lat,
+        lng,
+        api_key,
+        specific_date,
+        bucket=specific_date,
+        ttl=history_ttl,
+    )
+    return parse_history(weather_data, lat, lng, location, specific_date)
 
-    weather_response = requests.get(weather_url, params=weather_params)
-    weather_response.raise_for_status()
-    weather_data = weather_response.json()
 
+def parse_history(
+    weather_data: dict, lat: float, lng: float, location: str, specific_date: str
+) -> dict:
+    """Shape a history:lookup payload into the tool response."""
     if "error" in weather_data:
         return {"error": f"Weather API error: {weather_data['error']['message']}"}
 
@@ -167,23 +417,20 @@ def get_historical_weather(
     if not hours:
         return {"error": f"No historical data available for {specific_date}"}
 
-    # Calculate daily aggregates
-    temps = [
-        h.get("temperature", {}).get("degrees") for h in hours if h.get("temperature")
-    ]
-    min_temp = min(temps) if temps else None
-    max_temp = max(temps) if temps else None
-    avg_temp = sum(temps) / len(temps) if temps else None
-
-    # Get midday conditions (closest to noon)
-    midday_hour = None
-    for hour in hours:
-        hour_time = hour.get("timestamp", "")
-        if "12:" in hour_time or "13:" in hour_time:
-            midday_hour = hour
-            break
-    if not midday_hour:
-        midday_hour = hours[len(hours) // 2]  # Middle of available data
+    columns = hourly_columns(hours)
+    stats = aggregate_days([columns])["daily"]
+    min_temp, max_temp, avg_temp, total_precipitation = (
+        None if np.isnan(value) else float(value)
+        for value in (
+            stats["min_temp_celsius"][0],
+            stats["max_temp_celsius"][0],
+            stats["mean_temp_celsius"][0],
+            stats["precipitation_mm"][0],
+        )
+    )
+
+    # Conditions from the record closest to noon
+    midday_hour = hours[midday_index(columns["hour"])]
 
     return {
         "location": location,
@@ -204,6 +451,7 @@ def get_historical_weather(
             "precipitation_amount_mm": midday_hour.get("precipitation", {}).get(
                 "amount"
             ),
+            "precipitation_total_mm": total_precipitation,
             "wind_speed_mps": midday_hour.get("wind", {}).get("speed", {}).get("value")
             if midday_hour.get("wind")
             else None,
@@ -219,6 +467,88 @@ def get_historical_weather(
     }
 
 
+def fetch_history(lat: float, lng: float, api_key: str, specific_date: str) -> dict:
+    """Fetch the history:lookup hours of a date, local to the coordinate."""
+    zone = get_timezone(lat, lng, api_key)
+    weather_params = {
+        "key": api_key,
+        "location.latitude": lat,
+        "location.longitude": lng,
+        "timestamp": history_timestamp(specific_date, zone),
+        "hours": 24,  # Get 24 hours of data
+    }
+
+    weather_response = http_client.get(HISTORY_URL, params=weather_params)
+    weather_response.raise_for_status()
+    return local_day(weather_response.json(), specific_date, zone)
+
+
+def local_day_bounds(specific_date: str, zone: Optional[str]) -> Tuple[float, float]:
+    """Unix times a date starts and ends in zone (UTC if the zone is unknown)."""
+    tz = timezone.utc
+    if zone:
+        try:
+            tz = ZoneInfo(zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    day = datetime.strptime(specific_date, "%Y-%m-%d").date()
+    return (
+        datetime.combine(day, time(), tz).timestamp(),
+        datetime.combine(day + timedelta(days=1), time(), tz).timestamp(),
+    )
+
+
+def history_timestamp(specific_date: str, zone: Optional[str]) -> str:
+    """The local midday of a date, as the UTC timestamp history:lookup takes."""
+    start, end = local_day_bounds(specific_date, zone)
+    midday = datetime.fromtimestamp((start + end) / 2, timezone.utc)
+    return midday.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def local_day(weather_data: dict, specific_date: str, zone: Optional[str]) -> dict:
+    """
+    Keeps the hours of a history:lookup payload that fall on a local date.
+
+    Args:
+        weather_data (dict): The history:lookup payload.
+        specific_date (str): The date (YYYY-MM-DD).
+        zone (str, optional): IANA zone of the location; UTC if unknown.
+
+    Returns:
+        dict: The payload with only that date's hours, and "complete" set
+            when every hour of the date is present.
+    """
+    if "error" in weather_data:
+        return weather_data
+    start, end = local_day_bounds(specific_date, zone)
+    hours, seen = [], set()
+    for hour in weather_data.get("history", {}).get("hours", []):
+        moment = _epoch(hour.get("timestamp"))
+        if moment is not None and start <= moment < end:
+            hours.append(hour)
+            seen.add(moment // 3600)
+    history = dict(weather_data.get("history", {}), hours=hours)
+    # Clock changes make a local day 23 or 25 hours long.
+    complete = len(seen) >= round((end - start) / 3600)
+    return dict(weather_data, history=history, complete=complete)
+
+
+def history_ttl(weather_data: dict) -> Optional[float]:
+    """Cache TTL for a local_day() payload: the default only for a whole day."""
+    return None if weather_data.get("complete") else PARTIAL_HISTORY_TTL
+
+
+def _epoch(timestamp: Optional[str]) -> Optional[float]:
+    """Unix time of an ISO 8601 timestamp (UTC unless it says otherwise)."""
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
 def celsius_to_fahrenheit(celsius: float) -> float:
     """Convert Celsius to Fahrenheit."""
     return round((celsius * 9 / 5) + 32, 1) if celsius is not None else None
@@ -0,0 +1,190 @@
+"""
+Async variants of the weather tools, registered with the weather agent.
+
+Parsing and request planning are shared with the sync versions in
+weather.py, which remain available for scripts.
+"""
+
+import os
+from datetime import datetime
+from typing import Optional
+from locus.shared_libraries import deadline, http_client
+from locus.shared_libraries.geocoding import geocode_location_async
+from locus.shared_libraries.timezones import get_timezone_async
+from .weather import (
+    CURRENT_CONDITIONS_URL,
+    FORECAST_DAYS,
+    FORECAST_URL,
+    HISTORY_URL,
+    compact_forecast,
+    forecast_for_date,
+    history_timestamp,
+    history_ttl,
+    local_day,
+    mark_stale,
+    parse_current_conditions,
+    parse_history,
+    plan_weather_request,
+)
+from .weather_cache import current_cache, forecast_cache, history_cache
+
+
+@deadline.with_deadline()
+async def get_weather(
+    location: str, days_ahead: Optional[int] = 0, specific_date: Optional[str] = None
+) -> dict:
+    """
+    Gets weather information for a location using Google Maps Weather API.
+
+    Args:
+        location (str): The city or location to get weather for.
+        days_ahead (int, optional): Number of days ahead from today (0 = today, 1 = tomorrow, etc.). Defaults to 0.
+        specific_date (str, optional): Specific date in YYYY-MM-DD format for historical/past weather.
+
+    Returns:
+        dict: A dictionary containing weather information.
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    partial = {"location": location}
+    try:
+        geocode_result = await geocode_location_async(location)
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+
+        lat = geocode_result["lat"]
+        lng = geocode_result["lng"]
+        partial["coordinates"] = {"lat": lat, "lng": lng}
+
+        try:
+            lookup, argument = plan_weather_request(days_ahead, specific_date)
+        except ValueError:
+            return {"error": "Invalid date format. Please use YYYY-MM-DD format."}
+
+        return await run_weather_lookup(lookup, argument, lat, lng, api_key, location)
+
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Weather service did not respond within the time budget.", **partial
+            )
+        return {"error": f"Failed to fetch weather information: {str(e)}"}
+
+
+async def run_weather_lookup(
+    lookup: str,
+    argument: Optional[str],
+    lat: float,
+    lng: float,
+    api_key: str,
+    location: str,
+) -> dict:
+    """Async variant of weather.run_weather_lookup()."""
+    if lookup == "current":
+        return await get_current_weather(lat, lng, api_key, location)
+    elif lookup == "forecast":
+        return await get_forecast_weather(lat, lng, api_key, location, argument)
+    else:
+        return await get_historical_weather(lat, lng, api_key, location, argument)
+
+
+async def get_current_weather(
+    lat: float, lng: float, api_key: str, location: str
+) -> dict:
+    """Get current weather conditions using Google Maps Weather API."""
+    weather_data, age = await current_cache.get_or_revalidate_async(
+        lat,
+        lng,
+        fetch_current_conditions,
+        lat,
+        lng,
+        api_key,
+        bucket=datetime.now().strftime("%Y-%m-%d"),
+    )
+    return mark_stale(parse_current_conditions(weather_data, lat, lng, location), age)
+
+
+async def get_forecast_weather(
+    lat: float, lng: float, api_key: str, location: str, target_date: str
+) -> dict:
+    """Get the daily forecast for a date using Google Maps Weather API."""
+    series, age = await forecast_cache.get_or_revalidate_async(
+        lat,
+        lng,
+        fetch_forecast,
+        lat,
+        lng,
+        api_key,
+        bucket=datetime.now().strftime("%Y-%m-%d"),
+    )
+    return mark_stale(forecast_for_date(series, target_date, lat, lng, location), age)
+
+
+async def get_historical_weather(
+    lat: float, lng: float, api_key: str, location: str, specific_date: str
+) -> dict:
+    """Get historical weather data using Google Maps Weather API."""
+    weather_data = await history_cache.get_or_fetch_async(
+        lat,
+        lng,
+        fetch_history,
+        lat,
+        lng,
+        api_key,
+        specific_date,
+        bucket=specific_date,
+        ttl=history_ttl,
+    )
+    return parse_history(weather_data, lat, lng, location, specific_date)
+
+
+async def fetch_current_conditions(lat: float, lng: float, api_key: str) -> dict:
+    """Fetch the raw currentConditions:lookup payload for a coordinate."""
+    weather_response = await http_client.aget(
+        CURRENT_CONDITIONS_URL,
+        params={
+            "key": api_key,
+            "location.latitude": lat,
+            "location.longitude": lng,
+        },
+    )
+    weather_response.raise_for_status()
+    return weather_response.json()
+
+
+async def fetch_forecast(lat: float, lng: float, api_key: str) -> dict:
+    """Fetch the full daily forecast horizon for a coordinate as a compact series."""
+    weather_response = await http_client.aget(
+        FORECAST_URL,
+        params={
+            "key": api_key,
+            "location.latitude": lat,
+            "location.longitude": lng,
+            "days": FORECAST_DAYS,
+            "pageSize": FORECAST_DAYS,
+        },
+    )
+    weather_response.raise_for_status()
+    return compact_forecast(weather_response.json())
+
+
+async def fetch_history(
+    lat: float, lng: float, api_key: str, specific_date: str
+) -> dict:
+    """Fetch the history:lookup hours of a date, local to the coordinate."""
+    zone = await get_timezone_async(lat, lng, api_key)
+    weather_response = await http_client.aget(
+        HISTORY_URL,
+        params={
+            "key": api_key,
+            "location.latitude": lat,
+            "location.longitude": lng,
+            "timestamp": history_timestamp(specific_date, zone),
+            "hours": 24,  # Get 24 hours of data
+        },
+    )
+    weather_response.raise_for_status()
+    return local_day(weather_response.json(), specific_date, zone)
@@ -0,0 +1,193 @@
+"""
+Weather for a whole itinerary in one tool call.
+
+Stops are deduplicated by location and geocoded in one batch. Each
+location's dates are grouped into the lookups they need, and all lookups
+run concurrently. Every forecast date for a location is answered from the
+same cached 10-day series, so a location needs at most one forecast fetch.
+"""
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from locus.shared_libraries import deadline, rate_limit
+from locus.shared_libraries.env_config import env_int
+from locus.shared_libraries.geocoding import geocode_locations
+from .weather import plan_weather_request, run_weather_lookup
+
+
+@deadline.with_deadline()
+def get_weather_bulk(stops: List[dict]) -> dict:
+    """
+    Gets weather for every stop of a trip itinerary in a single call.
+
+    Args:
+        stops (list): The itinerary stops, each a dict like
+            {"location": "Paris, France", "date": "2025-06-14"}. The date is
+            in YYYY-MM-DD format; omit it for current conditions.
+            [location, date] pairs are accepted too.
+
+    Returns:
+        dict: A dictionary containing:
+            - "stops": one get_weather-style result per stop, in input order
+            - "summary": counts of stops, distinct locations, lookups and failures
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        parsed = normalize_stops(stops)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    locations = list(dict.fromkeys(location for location, _ in parsed))
+    # A whole itinerary is a burst of lookups; let interactive calls go first.
+    with rate_limit.bulk():
+        geocoded = dict(zip(locations, geocode_locations(locations)))
+        lookups = plan_bulk_lookups(parsed, geocoded)
+
+        results = {}
+        if lookups:
+            workers = bulk_concurrency(lookups)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    key: executor.submit(
+                        contextvars.copy_context().run,
+                        run_weather_lookup,
+                        *lookup,
+                        api_key,
+                        key[0],
+                    )
+                    for key, lookup in lookups.items()
+                }
+                for key, future in futures.items():
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        results[key] = lookup_error(e)
+
+    return assemble_bulk_results(parsed, geocoded, lookups, results)
+
+
+def normalize_stops(stops: list) -> List[tuple]:
+    """
+    Validates itinerary stops and converts them to (location, date) pairs.
+
+    Args:
+        stops (list): Dicts with "location" and optional "date", or
+            [location, date] pairs.
+
+    Returns:
+        list[tuple]: (location, date or None) per stop, in input order.
+
+    Raises:
+        ValueError: If there are no stops or a stop has no location.
+    """
+    if not stops:
+        raise ValueError("No itinerary stops were given.")
+    parsed = []
+    for index, stop in enumerate(stops):
+        if isinstance(stop, dict):
+            location, date = stop.get("location"), stop.get("date")
+        elif isinstance(stop, (list, tuple)) and 1 <= len(stop) <= 2:
+            location, date = stop[0], stop[1] if len(stop) > 1 else None
+        else:
+            location, date = None, None
+        if not location or not isinstance(location, str):
+            raise ValueError(
+                f"Stop {index + 1} needs a location, e.g. "
+                '{"location": "Paris, France", "date": "YYYY-MM-DD"}.'
+            )
+        parsed.append((location.strip(), date or None))
+    return parsed
+
+
+def plan_bulk_lookups(parsed: List[tuple], geocoded: dict) -> dict:
+    """
+    Groups stops into the distinct weather lookups they need.
+
+    Args:
+        parsed (list[tuple]): (location, date) pairs from normalize_stops().
+        geocoded (dict): Location -> geocode_location() result.
+
+    Returns:
+        dict: (location, lookup, argument) -> (lookup, argument, lat, lng).
+            Stops with an invalid date or a failed geocode are left out.
+    """
+    lookups = {}
+    for location, date in parsed:
+        geocode_result = geocoded[location]
+        if "error" in geocode_result:
+            continue
+        try:
+            lookup, argument = plan_weather_request(0, date)
+        except ValueError:
+            continue
+        lookups.setdefault(
+            (location, lookup, argument),
+            (lookup, argument, geocode_result["lat"], geocode_result["lng"]),
+        )
+    return lookups
+
+
+def bulk_concurrency(lookups: dict) -> int:
+    """Number of lookups to run at once (LOCUS_WEATHER_BULK_CONCURRENCY)."""
+    return max(1, min(env_int("LOCUS_WEATHER_BULK_CONCURRENCY", 8), len(lookups)))
+
+
+def lookup_error(error: Exception) -> dict:
+    """Builds the per-stop result for a lookup that raised."""
+    if deadline.expired():
+        return deadline.degraded(
+            "Weather service did not respond within the time budget."
+        )
+    return {"error": f"Failed to fetch weather information: {str(error)}"}
+
+
+def assemble_bulk_results(
+    parsed: List[tuple], geocoded: dict, lookups: dict, results: dict
+) -> dict:
+    """
+    Builds the get_weather_bulk() response from the lookup results.
+
+    Args:
+        parsed (list[tuple]): (location, date) pairs from normalize_stops().
+        geocoded (dict): Location -> geocode_location() result.
+        lookups (dict): The plan from plan_bulk_lookups().
+        results (dict): Lookup key -> weather result.
+
+    Returns:
+        dict: "stops" in input order plus a "summary".
+    """
+    entries = []
+    for location, date in parsed:
+        entry = {"requested_location": location, "requested_date": date}
+        geocode_result = geocoded[location]
+        if "error" in geocode_result:
+            entry["error"] = geocode_result["error"]
+            entries.append(entry)
+            continue
+        try:
+            key = (location,) + plan_weather_request(0, date)
+        except ValueError:
+            entry["error"] = "Invalid date format. Please use YYYY-MM-DD format."
+            entries.append(entry)
+            continue
+        entry.update(results.get(key, {"error": "Lookup did not run."}))
+        entries.append(entry)
+
+    failed = sum(1 for entry in entries if "error" in entry)
+    response = {
+        "stops": entries,
+        "summary": {
+            "stops": len(entries),
+            "locations": len(geocoded),
+            "lookups": len(lookups),
+            "failed": failed,
+        },
+    }
+    if any(entry.get("degraded") for entry in entries):
+        response["degraded"] = True
+    return response
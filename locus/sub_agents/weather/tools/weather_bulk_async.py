@@ -0,0 +1,68 @@
+"""
+Async variant of the itinerary weather tool, registered with the weather agent.
+
+Stop validation, lookup planning and result assembly are shared with the
+sync version in weather_bulk.py.
+"""
+
+import asyncio
+import os
+from typing import List
+from locus.shared_libraries import deadline, rate_limit
+from locus.shared_libraries.geocoding import geocode_locations_async
+from .weather_async import run_weather_lookup
+from .weather_bulk import (
+    assemble_bulk_results,
+    bulk_concurrency,
+    lookup_error,
+    normalize_stops,
+    plan_bulk_lookups,
+)
+
+
+@deadline.with_deadline()
+async def get_weather_bulk(stops: List[dict]) -> dict:
+    """
+    Gets weather for every stop of a trip itinerary in a single call.
+
+    Args:
+        stops (list): The itinerary stops, each a dict like
+            {"location": "Paris, France", "date": "2025-06-14"}. The date is
+            in YYYY-MM-DD format; omit it for current conditions.
+            [location, date] pairs are accepted too.
+
+    Returns:
+        dict: A dictionary containing:
+            - "stops": one get_weather-style result per stop, in input order
+            - "summary": counts of stops, distinct locations, lookups and failures
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        parsed = normalize_stops(stops)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    locations = list(dict.fromkeys(location for location, _ in parsed))
+    # A whole itinerary is a burst of lookups; let interactive calls go first.
+    with rate_limit.bulk():
+        geocoded = dict(zip(locations, await geocode_locations_async(locations)))
+        lookups = plan_bulk_lookups(parsed, geocoded)
+
+        semaphore = asyncio.Semaphore(bulk_concurrency(lookups))
+
+        async def run(key: tuple, lookup: tuple) -> dict:
+            async with semaphore:
+                try:
+                    return await run_weather_lookup(*lookup, api_key, key[0])
+                except Exception as e:
+                    return lookup_error(e)
+
+        outcomes = await asyncio.gather(
+            *(run(key, lookup) for key, lookup in lookups.items())
+        )
+        results = dict(zip(lookups, outcomes))
+
+    return assemble_bulk_results(parsed, geocoded, lookups, results)
@@ -0,0 +1,28 @@
+"""
+Caches shared by the weather tools and their async variants.
+
+Upstream refreshes current conditions every few minutes, so they are fresh
+for a few minutes per geohash cell and served stale (while a refresh runs)
+for up to an hour. Daily forecasts are issued a few times a day. History
+for a past date never changes, so it is bucketed by date and kept for long.
+"""
+
+from locus.shared_libraries.env_config import env_float
+from locus.shared_libraries.spatial_cache import SpatialCache
+
+current_cache = SpatialCache(
+    "weather.current",
+    ttl=env_float("LOCUS_WEATHER_CURRENT_TTL", 300),
+    stale_ttl=env_float("LOCUS_WEATHER_STALE_TTL", 3600),
+)
+forecast_cache = SpatialCache(
+    "weather.forecast",
+    ttl=env_float("LOCUS_WEATHER_FORECAST_TTL", 3600),
+    stale_ttl=env_float("LOCUS_WEATHER_STALE_TTL", 3600),
+)
+history_cache = SpatialCache(
+    "weather.history", ttl=env_float("LOCUS_WEATHER_HISTORY_TTL", 365 * 24 * 3600)
+)
+# A day still missing hours (today, or one not fully published yet) is only
+# kept briefly, so the rest of it is picked up on a later lookup.
+PARTIAL_HISTORY_TTL = env_float("LOCUS_WEATHER_PARTIAL_HISTORY_TTL", 3600)
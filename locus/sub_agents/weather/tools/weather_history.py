@@ -0,0 +1,207 @@
+"""
+Historical weather over a date range.
+
+Each day's hourly history is fetched concurrently and cached per geohash
+cell and date, so overlapping ranges only fetch the days not seen before.
+The hourly records are aggregated with NumPy (see history_stats.py).
+"""
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List
+from locus.shared_libraries import deadline, rate_limit
+from locus.shared_libraries.env_config import env_int
+from locus.shared_libraries.geocoding import geocode_location
+from .history_stats import aggregate_days, hourly_columns, midday_index, to_json
+from .weather import celsius_to_fahrenheit, fetch_history, history_ttl
+from .weather_cache import history_cache
+
+
+@deadline.with_deadline()
+def get_weather_history(location: str, start_date: str, end_date: str) -> dict:
+    """
+    Gets day-by-day historical weather and range statistics for a location.
+
+    Args:
+        location (str): The city or location to get weather for.
+        start_date (str): First day of the range in YYYY-MM-DD format.
+        end_date (str): Last day of the range (inclusive) in YYYY-MM-DD format.
+            Must be before today.
+
+    Returns:
+        dict: A dictionary containing:
+            - "days": per-day min/max/mean temperature, precipitation,
+              humidity, wind and midday conditions
+            - "summary": range-wide temperatures, percentiles, precipitation
+              total and wet-day count
+            - "missing_dates": days with no data (only if any)
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        dates = history_dates(start_date, end_date)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    partial = {"location": location}
+    try:
+        geocode_result = geocode_location(location)
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+        lat = geocode_result["lat"]
+        lng = geocode_result["lng"]
+        partial["coordinates"] = {"lat": lat, "lng": lng}
+
+        # A range is a burst of lookups; let interactive calls go first.
+        with rate_limit.bulk(), ThreadPoolExecutor(
+            max_workers=history_concurrency(dates)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    history_cache.get_or_fetch,
+                    lat,
+                    lng,
+                    fetch_history,
+                    lat,
+                    lng,
+                    api_key,
+                    date,
+                    bucket=date,
+                    ttl=history_ttl,
+                )
+                for date in dates
+            ]
+            payloads = []
+            for future in futures:
+                try:
+                    payloads.append(future.result())
+                except Exception as e:
+                    payloads.append(e)
+
+        return summarize_history(payloads, dates, lat, lng, location)
+
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Weather service did not respond within the time budget.", **partial
+            )
+        return {"error": f"Failed to fetch weather history: {str(e)}"}
+
+
+def history_dates(start_date: str, end_date: str) -> List[str]:
+    """
+    Validates a history range and lists its dates.
+
+    Args:
+        start_date (str): First day in YYYY-MM-DD format.
+        end_date (str): Last day (inclusive) in YYYY-MM-DD format.
+
+    Returns:
+        list[str]: Every date in the range, in YYYY-MM-DD format.
+
+    Raises:
+        ValueError: If a date is malformed, the range is reversed, reaches
+            today or later, or is longer than LOCUS_WEATHER_HISTORY_MAX_DAYS.
+    """
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError("Invalid date format. Please use YYYY-MM-DD format.")
+    if end < start:
+        raise ValueError("end_date must not be before start_date.")
+    if end >= datetime.now().date():
+        raise ValueError(
+            "History is only available for past dates; use get_weather for "
+            "today and upcoming days."
+        )
+    max_days = env_int("LOCUS_WEATHER_HISTORY_MAX_DAYS", 31)
+    span = (end - start).days + 1
+    if span > max_days:
+        raise ValueError(
+            f"Date range of {span} days is too long; request at most {max_days} days."
+        )
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(span)]
+
+
+def history_concurrency(dates: List[str]) -> int:
+    """Number of days to fetch at once (LOCUS_WEATHER_HISTORY_CONCURRENCY)."""
+    return max(1, min(env_int("LOCUS_WEATHER_HISTORY_CONCURRENCY", 8), len(dates)))
+
+
+def summarize_history(
+    payloads: list, dates: List[str], lat: float, lng: float, location: str
+) -> dict:
+    """
+    Builds the get_weather_history() response from per-day payloads.
+
+    Args:
+        payloads (list): history:lookup payload per date; a day that failed
+            is an error dict or the exception it raised.
+        dates (list[str]): The dates, in YYYY-MM-DD format.
+        lat (float): Latitude.
+        lng (float): Longitude.
+        location (str): The location name for the response.
+
+    Returns:
+        dict: The tool response.
+    """
+    hours_by_day = [
+        payload.get("history", {}).get("hours", [])
+        if isinstance(payload, dict) and "error" not in payload
+        else []
+        for payload in payloads
+    ]
+    day_columns = [hourly_columns(hours) for hours in hours_by_day]
+    stats = aggregate_days(day_columns)
+    daily = {name: to_json(values) for name, values in stats["daily"].items()}
+
+    days, missing = [], []
+    for index, date in enumerate(dates):
+        hours = hours_by_day[index]
+        if not hours:
+            missing.append(date)
+            continue
+        midday = hours[midday_index(day_columns[index]["hour"])]
+        days.append(
+            {
+                "date": date,
+                **{name: values[index] for name, values in daily.items()},
+                "main_condition": midday.get("conditions", {}).get("description"),
+            }
+        )
+
+    if not days:
+        if deadline.expired():
+            return deadline.degraded(
+                "Weather service did not respond within the time budget.",
+                location=location,
+                coordinates={"lat": lat, "lng": lng},
+            )
+        return {
+            "error": f"No historical data available from {dates[0]} to {dates[-1]}"
+        }
+
+    summary = stats["summary"]
+    for name in ("min_temp", "max_temp", "mean_temp"):
+        summary[f"{name}_fahrenheit"] = celsius_to_fahrenheit(
+            summary[f"{name}_celsius"]
+        )
+    response = {
+        "location": location,
+        "coordinates": {"lat": lat, "lng": lng},
+        "start_date": dates[0],
+        "end_date": dates[-1],
+        "days": days,
+        "summary": summary,
+    }
+    if missing:
+        response["missing_dates"] = missing
+        if deadline.expired():
+            response["degraded"] = True
+    return response
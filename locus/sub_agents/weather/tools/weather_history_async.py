@@ -0,0 +1,85 @@
+"""
+Async variant of the weather history range tool, registered with the
+weather agent.
+
+Range validation and aggregation are shared with the sync version in
+weather_history.py.
+"""
+
+import asyncio
+import os
+from locus.shared_libraries import deadline, rate_limit
+from locus.shared_libraries.geocoding import geocode_location_async
+from .weather import history_ttl
+from .weather_async import fetch_history
+from .weather_cache import history_cache
+from .weather_history import history_concurrency, history_dates, summarize_history
+
+
+@deadline.with_deadline()
+async def get_weather_history(location: str, start_date: str, end_date: str) -> dict:
+    """
+    Gets day-by-day historical weather and range statistics for a location.
+
+    Args:
+        location (str): The city or location to get weather for.
+        start_date (str): First day of the range in YYYY-MM-DD format.
+        end_date (str): Last day of the range (inclusive) in YYYY-MM-DD format.
+            Must be before today.
+
+    Returns:
+        dict: A dictionary containing:
+            - "days": per-day min/max/mean temperature, precipitation,
+              humidity, wind and midday conditions
+            - "summary": range-wide temperatures, percentiles, precipitation
+              total and wet-day count
+            - "missing_dates": days with no data (only if any)
+    """
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return {"error": "GOOGLE_MAPS_API_KEY not found in .env file."}
+
+    try:
+        dates = history_dates(start_date, end_date)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    partial = {"location": location}
+    try:
+        geocode_result = await geocode_location_async(location)
+        if "error" in geocode_result:
+            return {"error": geocode_result["error"]}
+        lat = geocode_result["lat"]
+        lng = geocode_result["lng"]
+        partial["coordinates"] = {"lat": lat, "lng": lng}
+
+        semaphore = asyncio.Semaphore(history_concurrency(dates))
+
+        async def fetch_day(date: str) -> dict:
+            async with semaphore:
+                return await history_cache.get_or_fetch_async(
+                    lat,
+                    lng,
+                    fetch_history,
+                    lat,
+                    lng,
+                    api_key,
+                    date,
+                    bucket=date,
+                    ttl=history_ttl,
+                )
+
+        # A range is a burst of lookups; let interactive calls go first.
+        with rate_limit.bulk():
+            payloads = await asyncio.gather(
+                *(fetch_day(date) for date in dates), return_exceptions=True
+            )
+
+        return summarize_history(payloads, dates, lat, lng, location)
+
+    except Exception as e:
+        if deadline.expired():
+            return deadline.degraded(
+                "Weather service did not respond within the time budget.", **partial
+            )
+        return {"error": f"Failed to fetch weather history: {str(e)}"}
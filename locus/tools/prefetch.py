@@ -0,0 +1,234 @@
+"""
+Background prefetch of weather and air quality for the user's trip.
+
+Once the trip's destination and dates are in the ADK session state (see
+trip_context.py), the weather and air quality for them will be asked for
+again and again. The scheduler warms the shared caches for the trip in
+background tasks, so those later tool calls are cache hits and the user
+only waits for the model.
+
+Prefetches run detached from the turn that started them: in a fresh
+context with their own time budget and at bulk rate-limit priority, so
+they never hold up or crowd out interactive calls. A trip is re-warmed at
+most every LOCUS_PREFETCH_INTERVAL seconds.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
+from locus.shared_libraries import deadline, rate_limit
+from locus.shared_libraries.cache import normalize_location_key
+from locus.shared_libraries.env_config import env_float, env_int
+from locus.shared_libraries.geocoding import geocode_location_async
+from locus.sub_agents.env_hazards.tools.air_quality import AIR_QUALITY_TTL
+from locus.sub_agents.env_hazards.tools.air_quality_async import check_air_quality
+from locus.sub_agents.weather.tools.weather import FORECAST_DAYS
+from locus.sub_agents.weather.tools.weather_async import run_weather_lookup
+
+logger = logging.getLogger(__name__)
+
+# Session state key holding the trip context.
+TRIP_STATE_KEY = "trip"
+
+
+def parse_trip(value) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Reads trip legs from the session state value.
+
+    Args:
+        value: A {"destination", "start_date", "end_date"} dict, or a list of
+            them for a multi-city trip. Dates are YYYY-MM-DD and optional.
+
+    Returns:
+        list[tuple]: (destination, start_date, end_date) per valid leg.
+            Legs without a destination are skipped, and malformed dates are
+            treated as missing.
+    """
+    legs = value if isinstance(value, list) else [value]
+    trips = []
+    for leg in legs:
+        if not isinstance(leg, dict) or not isinstance(leg.get("destination"), str):
+            continue
+        dates = []
+        for name in ("start_date", "end_date"):
+            try:
+                dates.append(
+                    datetime.strptime(leg.get(name), "%Y-%m-%d").strftime("%Y-%m-%d")
+                )
+            except (TypeError, ValueError):
+                dates.append(None)
+        start, end = dates
+        trips.append((leg["destination"].strip(), start or end, end or start))
+    return trips
+
+
+def prefetch_lookups(
+    start_date: Optional[str], end_date: Optional[str]
+) -> Set[Tuple[str, Optional[str]]]:
+    """
+    Plans the weather lookups that cover a trip leg.
+
+    Current conditions are warmed for an undated or ongoing trip. Every
+    date inside the forecast horizon is answered by one cached forecast
+    series, so a single forecast lookup covers them all. Dates beyond the
+    horizon or in the past are not prefetched.
+
+    Args:
+        start_date (str, optional): First day in YYYY-MM-DD format.
+        end_date (str, optional): Last day in YYYY-MM-DD format.
+
+    Returns:
+        set: (lookup, argument) pairs for run_weather_lookup().
+    """
+    today = datetime.now().date()
+    if not start_date:
+        return {("current", None)}
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    lookups = set()
+    if start <= today <= end:
+        lookups.add(("current", None))
+    first = max(start, today + timedelta(days=1))
+    if first <= min(end, today + timedelta(days=FORECAST_DAYS - 1)):
+        lookups.add(("forecast", first.strftime("%Y-%m-%d")))
+    return lookups
+
+
+def prefetch_air_quality(start_date: Optional[str], end_date: Optional[str]) -> bool:
+    """
+    Whether to warm current air quality for a trip leg.
+
+    Only current conditions are cached, for LOCUS_AIR_QUALITY_TTL, so they
+    are worth warming for an undated or ongoing trip, or one starting before
+    the cached entry would expire.
+
+    Args:
+        start_date (str, optional): First day in YYYY-MM-DD format.
+        end_date (str, optional): Last day in YYYY-MM-DD format.
+
+    Returns:
+        bool: True if the air quality lookup should be prefetched.
+    """
+    if not start_date:
+        return True
+    now = datetime.now()
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    if start.date() <= now.date() <= end.date():
+        return True
+    return now < start <= now + timedelta(seconds=AIR_QUALITY_TTL)
+
+
+class PrefetchScheduler:
+    """Starts background cache warm-ups for trip legs, at most one per interval."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scheduled = {}
+        self._tasks = set()
+        self._stats = {"scheduled": 0, "warmed": 0, "failed": 0}
+
+    def schedule(self, trip_state) -> int:
+        """
+        Starts prefetches for the legs in a trip state value.
+
+        Does nothing outside a running event loop. Legs warmed within the last
+        LOCUS_PREFETCH_INTERVAL seconds are skipped, as is everything once
+        LOCUS_PREFETCH_MAX_TASKS prefetches are running.
+
+        Args:
+            trip_state: The session state value (see parse_trip()).
+
+        Returns:
+            int: The number of prefetches started.
+        """
+        if not os.getenv("GOOGLE_MAPS_API_KEY"):
+            return 0
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return 0
+        interval = env_float("LOCUS_PREFETCH_INTERVAL", 900)
+        now = time.monotonic()
+        started = 0
+        with self._lock:
+            self._scheduled = {
+                key: at for key, at in self._scheduled.items() if now - at < interval
+            }
+            for destination, start, end in parse_trip(trip_state):
+                key = (normalize_location_key(destination), start, end)
+                if key in self._scheduled:
+                    continue
+                if len(self._tasks) >= env_int("LOCUS_PREFETCH_MAX_TASKS", 4):
+                    break
+                self._scheduled[key] = now
+                # A fresh context, so the prefetch is not bound by the turn's deadline.
+                task = loop.create_task(
+                    self.warm(destination, start, end), context=contextvars.Context()
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._finished)
+                self._stats["scheduled"] += 1
+                started += 1
+        return started
+
+    async def warm(
+        self, destination: str, start_date: Optional[str], end_date: Optional[str]
+    ) -> int:
+        """
+        Warms the weather and air quality caches for one trip leg.
+
+        Args:
+            destination (str): The destination.
+            start_date (str, optional): First day in YYYY-MM-DD format.
+            end_date (str, optional): Last day in YYYY-MM-DD format.
+
+        Returns:
+            int: The number of lookups that came back without an error.
+        """
+        api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+        budget = env_float("LOCUS_PREFETCH_DEADLINE", 30)
+        with deadline.deadline(budget), rate_limit.bulk():
+            geocode_result = await geocode_location_async(destination)
+            if "error" in geocode_result:
+                return 0
+            lat, lng = geocode_result["lat"], geocode_result["lng"]
+            lookups = [
+                run_weather_lookup(lookup, argument, lat, lng, api_key, destination)
+                for lookup, argument in prefetch_lookups(start_date, end_date)
+            ]
+            if prefetch_air_quality(start_date, end_date):
+                lookups.append(check_air_quality(destination))
+            results = await asyncio.gather(*lookups, return_exceptions=True)
+        return sum(1 for r in results if isinstance(r, dict) and "error" not in r)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        with self._lock:
+            self._tasks.discard(task)
+            failed = task.cancelled() or task.exception() is not None
+            self._stats["failed" if failed else "warmed"] += 1
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Trip prefetch failed: %s", task.exception())
+
+    def stats(self) -> dict:
+        """Reports prefetch counters and how many prefetches are running."""
+        with self._lock:
+            return {**self._stats, "running": len(self._tasks)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._scheduled.clear()
+
+
+# Shared scheduler used by the trip context tool and callback.
+prefetcher = PrefetchScheduler()
+
+
+def get_prefetch_stats() -> dict:
+    """Reports the shared scheduler's counters; see PrefetchScheduler.stats()."""
+    return prefetcher.stats()
@@ -0,0 +1,70 @@
+"""
+Trip context kept in the ADK session state.
+
+The root agent records the destination and dates with remember_trip() as
+soon as the user gives them. Every turn, prefetch_trip_context() (the root
+agent's before_agent_callback) hands the stored trip to the prefetch
+scheduler, which keeps the weather and air quality caches warm for it.
+"""
+
+from datetime import datetime
+from typing import Optional
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.tools import ToolContext
+from .prefetch import TRIP_STATE_KEY, parse_trip, prefetcher
+
+
+def remember_trip(
+    destination: str,
+    tool_context: ToolContext,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> dict:
+    """
+    Records the user's trip destination and dates for the rest of the session.
+
+    Call this as soon as the user mentions where and when they are travelling.
+    Call it once per destination of a multi-city trip.
+
+    Args:
+        destination (str): The destination city or place (e.g., "Tokyo, Japan").
+        start_date (str, optional): Arrival date in YYYY-MM-DD format.
+        end_date (str, optional): Departure date in YYYY-MM-DD format.
+
+    Returns:
+        dict: The trip legs now on record.
+    """
+    dates = {}
+    for name, value in (("start_date", start_date), ("end_date", end_date)):
+        if value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                return {"error": f"Invalid {name}. Please use YYYY-MM-DD format."}
+            dates[name] = value
+    if dates.get("start_date") and dates.get("end_date"):
+        if dates["end_date"] < dates["start_date"]:
+            return {"error": "end_date must not be before start_date."}
+
+    leg = {"destination": destination.strip(), **dates}
+    current = tool_context.state.get(TRIP_STATE_KEY) or []
+    legs = current if isinstance(current, list) else [current]
+    # Replace an earlier record of the same destination instead of duplicating it.
+    legs = [
+        existing
+        for existing in legs
+        if not isinstance(existing, dict)
+        or existing.get("destination", "").casefold() != leg["destination"].casefold()
+    ]
+    legs.append(leg)
+    tool_context.state[TRIP_STATE_KEY] = legs
+    prefetcher.schedule([leg])
+    return {"trip": legs}
+
+
+def prefetch_trip_context(callback_context: CallbackContext) -> None:
+    """Schedules cache warm-ups for the trip in the session state, if any."""
+    trip = callback_context.state.get(TRIP_STATE_KEY)
+    if trip and parse_trip(trip):
+        prefetcher.schedule(trip)
+    return None
@@ -0,0 +1,103 @@
+"""
+Tests for the two-tier (memory + SQLite) cache.
+"""
+
+import sqlite3
+import time
+import pytest
+from locus.shared_libraries.cache import TwoTierCache, normalize_location_key
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+def make(path: str, **kwargs) -> TwoTierCache:
+    return TwoTierCache("test.cache", ttl=60, path=path, **kwargs)
+
+
+def test_disk_tier_survives_a_restart(path):
+    make(path).set("paris", {"lat": 48.86})
+    restarted = make(path)
+    assert restarted.get("paris") == {"lat": 48.86}
+    # Promoted to memory on the way.
+    assert restarted.get("paris") == {"lat": 48.86}
+    stats = restarted.stats()
+    assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+    assert restarted.get("rome") is None
+    assert restarted.stats()["misses"] == 1
+
+
+def test_entries_expire(path):
+    cache = make(path)
+    cache.set("soon", 1, ttl=0.01)
+    cache.set("later", 2)
+    time.sleep(0.02)
+    assert cache.get("soon") is None
+    assert make(path).get("soon") is None
+    assert cache.get("later") == 2
+
+
+def test_negative_entries(path):
+    cache = make(path, negative_ttl=0.01)
+    cache.set_negative("atlantis", {"not_found": True})
+    cache.set("paris", 1)
+    assert cache.get("atlantis") == {"not_found": True}
+    assert cache.stats()["negative_hits"] == 1
+    # Scans only see real entries.
+    assert list(cache.scan("")) == [("paris", 1)]
+    time.sleep(0.02)
+    assert cache.get("atlantis") is None
+
+
+def test_memory_tier_is_lru(path):
+    cache = make(path, max_memory_entries=2, persistent=False)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["memory_evictions"] == 1
+
+
+def test_disk_tier_is_pruned_to_its_bound(path):
+    cache = make(path, max_disk_entries=5)
+    for i in range(12):
+        cache.set(f"key{i}", i)
+    assert len(cache.disk) <= 5
+    assert cache.stats()["disk_evictions"] >= 7
+    # The most recent writes are the ones kept.
+    assert make(path).get("key11") == 11
+
+
+def test_delete_and_clear_reach_both_tiers(path):
+    cache = make(path)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    assert make(path).get("a") is None
+    cache.clear()
+    assert cache.get("b") is None
+    assert make(path).get("b") is None
+
+
+def test_disk_errors_fall_back_to_memory(path, monkeypatch):
+    cache = make(path)
+
+    def broken(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    for method in ("get", "set", "delete", "clear", "scan"):
+        monkeypatch.setattr(cache.disk, method, broken)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert list(cache.scan("")) == [("a", 1)]
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.clear()
+
+
+def test_location_keys_ignore_case_spacing_and_punctuation():
+    keys = {normalize_location_key(s) for s in ("Paris, France", "  PARIS,  France. ")}
+    assert keys == {"paris france"}
@@ -0,0 +1,43 @@
+"""
+Tests for how travel matrices are split into Distance Matrix requests.
+"""
+
+import numpy as np
+import pytest
+from locus.shared_libraries import distance_matrix
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(distance_matrix._matrix_cache, "get", lambda key: None)
+
+
+def places(n: int) -> list:
+    return [f"Stop {i}" for i in range(n)]
+
+
+@pytest.mark.parametrize("n, requests", [(2, 1), (10, 1), (25, 7), (30, 10)])
+def test_row_strips(n, requests):
+    seconds, _, tiles = distance_matrix.plan_matrix(places(n), "walking", None)
+    assert len(tiles) == requests
+    covered = np.zeros((n, n), bool)
+    for rows, cols in tiles:
+        assert len(rows) <= 25 and len(cols) <= 25
+        assert len(rows) * len(cols) <= 100
+        covered[np.ix_(rows, cols)] = True
+    assert covered[np.isnan(seconds)].all()
+
+
+def test_cached_pairs_are_not_refetched(monkeypatch):
+    # Everything is cached except the pairs leaving stop 3.
+    element = {"status": "OK", "duration": {"value": 60}, "distance": {"value": 80}}
+    monkeypatch.setattr(
+        distance_matrix, "directions_key", lambda origin, *args: origin
+    )
+    monkeypatch.setattr(
+        distance_matrix._matrix_cache,
+        "get",
+        lambda origin: None if origin == "Stop 3" else element,
+    )
+    _, _, tiles = distance_matrix.plan_matrix(places(25), "walking", None)
+    assert tiles == [([3], [j for j in range(25) if j != 3])]
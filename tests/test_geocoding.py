@@ -0,0 +1,38 @@
+"""
+Tests for how geocode misses are cached and shared between spellings.
+"""
+
+from unittest import mock
+import pytest
+from locus.shared_libraries import geocoding
+from locus.shared_libraries.cache import TwoTierCache
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Makes every Geocoding API call come back with ZERO_RESULTS."""
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIzaFAKE")
+    monkeypatch.setattr(geocoding, "lookup_location", lambda location: None)
+    cache = TwoTierCache("test.geocode", ttl=60, persistent=False)
+    monkeypatch.setattr(geocoding, "_geocode_cache", cache)
+    response = mock.Mock(json=lambda: {"status": "ZERO_RESULTS", "results": []})
+    get = mock.Mock(return_value=response)
+    monkeypatch.setattr(geocoding.http_client, "get", get)
+    return get
+
+
+def test_cached_miss_names_each_callers_spelling(upstream):
+    first = geocoding.geocode_location("Atlantis!")
+    second = geocoding.geocode_location("  atlantis")
+    assert first == {"error": "Could not find location: Atlantis!"}
+    assert second == {"error": "Could not find location:   atlantis"}
+    assert upstream.call_count == 1
+
+
+def test_batch_miss_names_each_spelling(upstream):
+    results = geocoding.geocode_locations(["Atlantis", "ATLANTIS"])
+    assert [r["error"] for r in results] == [
+        "Could not find location: Atlantis",
+        "Could not find location: ATLANTIS",
+    ]
+    assert upstream.call_count == 1
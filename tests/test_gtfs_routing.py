@@ -0,0 +1,189 @@
+"""
+Tests for offline transit routing over the GTFS fixture in data/.
+
+The fixture feed (Europe/Paris) has:
+    - subway A along the equator, Alpha 1 (0, 0) to Alpha 5 (0, 0.04), and
+      bus B north from Beta 1 (next to Alpha 3) to Beta 3 (0.02, 0.02), both
+      on weekdays from 07:00 to 10:00, with Monday 2026-10-19 cancelled;
+    - bus S from Alpha 1 to Alpha 5 at 08:00 on Sundays;
+    - night bus N from Alpha 1 to Alpha 5 at 24:30 on Sundays and 25:30 on
+      Saturdays, i.e. after midnight.
+"""
+
+import os
+import threading
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+import pytest
+from locus.shared_libraries import gtfs, raptor
+from locus.sub_agents.navigator.tools import transport
+
+FEED = os.path.join(os.path.dirname(__file__), "data", "gtfs_small.zip")
+PARIS = ZoneInfo("Europe/Paris")
+ALPHA_1, ALPHA_5, BETA_3 = (0.0, 0.0), (0.0, 0.04), (0.02, 0.02)
+
+
+@pytest.fixture(scope="module")
+def timetable(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("gtfs"))
+    return gtfs.Timetable(gtfs.build_timetable(FEED, directory), name="gtfs_small")
+
+
+def at(value: str) -> float:
+    return datetime.fromisoformat(value).replace(tzinfo=PARIS).timestamp()
+
+
+def plan(timetable, origin, destination, when):
+    journeys = raptor.plan_journeys(timetable, origin, destination, at(when))
+    return [(j, raptor.project_journey(timetable, j)) for j in journeys]
+
+
+def departure(journey: dict) -> datetime:
+    """Local time the first vehicle of a journey leaves."""
+    ride = next(leg for leg in journey["legs"] if leg["mode"] == "TRANSIT")
+    return datetime.fromtimestamp(journey["day_start"] + ride["depart"], PARIS)
+
+
+def test_transfer_journey(timetable):
+    (journey, route), = plan(timetable, ALPHA_1, BETA_3, "2026-10-20T08:03")
+    assert [line["line"] for line in route["lines"]] == ["A", "B"]
+    assert route["transfers"] == 1
+    assert route["lines"][0]["to_stop"] == "Alpha 3"
+    assert route["lines"][1]["from_stop"] == "Beta 1"
+    assert (route["lines"][0]["departs"], route["arrives"]) == ("08:15", "08:31")
+
+
+def test_calendar_dates_removal(timetable):
+    assert plan(timetable, ALPHA_1, ALPHA_5, "2026-10-19T08:03") == []
+    # The same weekday without the exception runs as usual.
+    (_, route), = plan(timetable, ALPHA_1, ALPHA_5, "2026-10-12T08:03")
+    assert route["departs"] == "08:15"
+
+
+def test_previous_day_trip_past_midnight(timetable):
+    # Monday 00:20 catches Sunday's 24:30 night bus.
+    (journey, route), = plan(timetable, ALPHA_1, ALPHA_5, "2026-10-12T00:20")
+    assert route["summary"] == "N"
+    assert (route["departs"], route["arrives"]) == ("00:30", "00:50")
+    assert departure(journey) == datetime(2026, 10, 12, 0, 30, tzinfo=PARIS)
+
+
+@pytest.mark.parametrize("day", ["2026-03-29", "2026-10-25"])
+def test_clock_change_day(timetable, day):
+    (journey, route), = plan(timetable, ALPHA_1, ALPHA_5, f"{day}T07:50")
+    assert route["summary"] == "S"
+    assert departure(journey) == datetime.fromisoformat(f"{day}T08:00").replace(
+        tzinfo=PARIS
+    )
+    assert route["departs"] == "08:00"
+
+
+def test_overnight_trip_into_clock_change_day(timetable):
+    # Saturday's 25:30 bus leaves at 01:30, before the clocks go back at 03:00.
+    (journey, route), = plan(timetable, ALPHA_1, ALPHA_5, "2026-10-25T00:20")
+    assert route["summary"] == "N"
+    assert departure(journey) == datetime(2026, 10, 25, 1, 30, tzinfo=PARIS)
+    assert route["departs"] == "01:30"
+
+
+@pytest.fixture
+def loaded(timetable, monkeypatch):
+    monkeypatch.setattr(gtfs, "_timetables", [timetable])
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIzaFAKE")
+    places = {
+        "Alpha 1": {"lat": 0.0, "lng": 0.0, "formatted_address": "Alpha 1"},
+        "Beta 3": {"lat": 0.02, "lng": 0.02, "formatted_address": "Beta 3"},
+    }
+    monkeypatch.setattr(transport, "geocode_location", places.__getitem__)
+    monkeypatch.setattr(transport, "lookup_known_location", lambda place: None)
+    monkeypatch.setattr(transport, "get_timezone", lambda *args: "Europe/Paris")
+    directions = mock.Mock(return_value=[])
+    monkeypatch.setattr(transport, "get_directions", directions)
+    return directions
+
+
+def test_local_route_skips_directions(loaded):
+    # A naive time is read in the timetable's zone, not the server's.
+    result = transport.get_local_transport(
+        "Beta 3", "Alpha 1", departure_time="2026-10-20T08:03"
+    )
+    assert result["source"] == "offline timetable (gtfs_small)"
+    assert result["routes"][0]["summary"] == "A > B"
+    loaded.assert_not_called()
+
+
+def test_no_local_journey_falls_back_to_directions(loaded):
+    # Directions gets the naive time in the origin's zone.
+    result = transport.get_local_transport(
+        "Beta 3", "Alpha 1", departure_time="2026-10-19T08:03"
+    )
+    loaded.assert_called_once_with(
+        "Alpha 1", "Beta 3", "AIzaFAKE", "transit", at("2026-10-19T08:03")
+    )
+    assert "source" not in result
+
+
+def test_departure_with_offset_skips_the_zone_lookup(loaded, monkeypatch):
+    monkeypatch.setattr(transport, "get_timezone", mock.Mock())
+    transport.get_local_transport(
+        "Beta 3", "Alpha 1", departure_time="2026-10-19T06:03+00:00"
+    )
+    transport.get_timezone.assert_not_called()
+    assert loaded.call_args[0][4] == at("2026-10-19T08:03")
+
+
+def test_bounds_cover_the_stops_and_a_walk_around_them(timetable):
+    assert timetable.covers(*BETA_3)
+    assert timetable.covers(0.0, 0.045)
+    assert not timetable.covers(0.0, 0.06)
+    assert not timetable.covers(35.68, 139.76)
+
+
+def test_place_outside_every_feed_is_not_geocoded(loaded, monkeypatch):
+    monkeypatch.setattr(
+        transport,
+        "lookup_known_location",
+        lambda place: {"lat": 35.68, "lng": 139.76} if place == "Tokyo" else None,
+    )
+    geocode = mock.Mock(side_effect=AssertionError("geocoded"))
+    monkeypatch.setattr(transport, "geocode_location", geocode)
+    transport.get_local_transport("Tokyo", "Alpha 1")
+    geocode.assert_not_called()
+    loaded.assert_called_once_with("Alpha 1", "Tokyo", "AIzaFAKE", "transit", None)
+
+
+def test_timetables_load_in_the_background(monkeypatch, tmp_path):
+    monkeypatch.setenv("LOCUS_GTFS_FEEDS", FEED)
+    monkeypatch.setenv("LOCUS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(gtfs, "_timetables", None)
+    monkeypatch.setattr(gtfs, "_loader", None)
+    release, build = threading.Event(), gtfs.build_timetable
+
+    def slow_build(source):
+        release.wait(10)
+        return build(source)
+
+    monkeypatch.setattr(gtfs, "build_timetable", slow_build)
+    # Requests do not wait for the feeds to compile.
+    assert gtfs.get_timetables() == []
+    release.set()
+    gtfs._loader.join(10)
+    assert [t.name for t in gtfs.get_timetables()] == ["gtfs_small"]
+
+
+def test_broken_feed_is_skipped(monkeypatch, tmp_path):
+    broken = str(tmp_path / "broken.zip")
+    monkeypatch.setenv("LOCUS_GTFS_FEEDS", os.pathsep.join([broken, FEED]))
+    monkeypatch.setenv("LOCUS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(gtfs, "_timetables", None)
+    build = gtfs.build_timetable
+
+    def build_or_fail(source):
+        if source == broken:
+            raise IndexError("list index out of range")
+        return build(source)
+
+    monkeypatch.setattr(gtfs, "build_timetable", build_or_fail)
+    assert [t.name for t in gtfs.load_timetables()] == ["gtfs_small"]
+    assert [t.name for t in gtfs.get_timetables()] == ["gtfs_small"]
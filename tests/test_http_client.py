@@ -0,0 +1,94 @@
+"""
+Tests for the shared HTTP transport's retry layering and breaker bookkeeping.
+"""
+
+import asyncio
+import io
+import httpx
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from locus.shared_libraries import http_client, resilience
+from locus.sub_agents.navigator.tools.place_details import get_place_details
+
+
+@pytest.fixture(autouse=True)
+def fresh(monkeypatch):
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIzaFAKE")
+    monkeypatch.setenv("LOCUS_RETRY_BASE_DELAY", "0")
+    http_client.reset()
+    resilience.reset()
+    yield
+    http_client.reset()
+    resilience.reset()
+
+
+def respond(monkeypatch, status: int, body: bytes = b"{}") -> list:
+    """Makes every send get the given response; returns the sent requests."""
+    sent = []
+
+    def send(self, request, **kwargs):
+        sent.append(request)
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    return sent
+
+
+def test_server_error_reaches_the_tool_with_its_status(monkeypatch):
+    sent = respond(monkeypatch, 503)
+    result = get_place_details("place-503", ["phone"])
+    assert result == {"error": "Failed to get place details: HTTP Error: 503"}
+    # Retried by the adapter only, not again by googlemaps.
+    assert len(sent) == 3
+
+
+def test_over_query_limit_is_not_retried(monkeypatch):
+    sent = respond(monkeypatch, 200, b'{"status": "OVER_QUERY_LIMIT"}')
+    result = get_place_details("place-oql", ["phone"])
+    assert result["error"].endswith("OVER_QUERY_LIMIT")
+    assert len(sent) == 1
+
+
+def test_unexpected_send_error_releases_the_probe(monkeypatch):
+    breaker = resilience.get_breaker("maps.googleapis.com")
+    breaker.half_open_probes = 1
+    breaker._state = resilience.HALF_OPEN
+
+    def send(self, request, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("broken")
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        http_client.get("https://maps.googleapis.com/maps/api/x/json")
+    # The probe slot is free again, so the next call is admitted.
+    breaker.acquire()
+
+
+def test_cancelled_async_send_releases_the_probe(monkeypatch):
+    breaker = resilience.get_breaker("maps.googleapis.com")
+    breaker.half_open_probes = 1
+    breaker._state = resilience.HALF_OPEN
+
+    async def hang(self, request):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", hang)
+
+    async def call():
+        task = asyncio.ensure_future(
+            http_client.aget("https://maps.googleapis.com/maps/api/x/json")
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(call())
+    breaker.acquire()
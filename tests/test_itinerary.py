@@ -0,0 +1,46 @@
+"""
+Tests for when optimize_itinerary() plans the day.
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+from locus.sub_agents.navigator.tools import itinerary
+
+TOKYO = ZoneInfo("Asia/Tokyo")
+
+
+def tokyo(value: str) -> float:
+    return datetime.fromisoformat(value).replace(tzinfo=TOKYO).timestamp()
+
+
+def test_next_departure_is_local_to_the_zone():
+    now = tokyo("2026-10-18T08:00")
+    assert itinerary.next_departure(9 * 3600, "Asia/Tokyo", now) == tokyo(
+        "2026-10-18T09:00"
+    )
+    # Already past 07:00 in Tokyo, whatever the server's clock says.
+    assert itinerary.next_departure(7 * 3600, "Asia/Tokyo", now) == tokyo(
+        "2026-10-19T07:00"
+    )
+
+
+def test_travel_matrix_is_fetched_for_the_local_start(monkeypatch):
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIzaFAKE")
+    monkeypatch.setattr(
+        itinerary, "geocode_location", lambda place: {"lat": 35.7, "lng": 139.7}
+    )
+    monkeypatch.setattr(itinerary, "get_timezone", lambda *args: "Asia/Tokyo")
+    calls = []
+
+    def matrix(places, api_key, mode, departure_time=None):
+        calls.append(departure_time)
+        n = len(places)
+        seconds, meters = np.full((n, n), 600.0), np.full((n, n), 1e3)
+        return {"seconds": seconds, "meters": meters, "requests": 1}
+
+    monkeypatch.setattr(itinerary, "get_travel_matrix", matrix)
+    result = itinerary.optimize_itinerary(["Senso-ji", "Ueno Park"], start_time="09:00")
+    departure = datetime.fromtimestamp(calls[0], TOKYO)
+    assert (departure.hour, departure.minute) == (9, 0)
+    assert result["summary"]["date"] == departure.strftime("%Y-%m-%d")
@@ -0,0 +1,53 @@
+"""
+Tests for the text search request and its cached page tokens.
+"""
+
+import time
+from unittest import mock
+import pytest
+from locus.shared_libraries.cache import TwoTierCache
+from locus.sub_agents.navigator.tools import places_search
+
+PARIS = {"lat": 48.8566, "lng": 2.3522}
+
+
+def result(name: str, kind: str = "cafe") -> dict:
+    return {"name": name, "place_id": name, "types": [kind]}
+
+
+@pytest.fixture
+def gmaps(monkeypatch):
+    cache = TwoTierCache("test.places_search", ttl=900, persistent=False)
+    monkeypatch.setattr(places_search, "_places_cache", cache)
+    monkeypatch.setenv("LOCUS_PLACES_PAGE_TOKEN_DELAY", "0")
+    client = mock.Mock()
+    client.places.side_effect = lambda **params: (
+        {"results": [result("Page 2")]}
+        if "page_token" in params
+        else {"results": [result("Page 1")], "next_page_token": "token"}
+    )
+    return client
+
+
+def search(client, **kwargs) -> list:
+    plan = places_search.plan_search("coffee", "Paris", PARIS, None, **kwargs)
+    return [place["name"] for place, _ in places_search.iter_places(client, plan)]
+
+
+def test_place_type_is_sent_upstream(gmaps):
+    assert search(gmaps, place_type="cafe") == ["Page 1", "Page 2"]
+    assert gmaps.places.call_args_list[0].kwargs["type"] == "cafe"
+    # A search without the type is cached separately.
+    search(gmaps)
+    assert "type" not in gmaps.places.call_args_list[2].kwargs
+
+
+def test_stale_cached_token_ends_the_pages(gmaps, monkeypatch):
+    plan = places_search.plan_search("coffee", "Paris", PARIS, None)
+    entry = places_search.page_entry(gmaps.places(**plan["params"]))
+    entry["issued_at"] = time.time() - 600
+    places_search._places_cache.set(f"{plan['key']}|0", entry)
+    gmaps.places.reset_mock()
+    pages = list(places_search.iter_places(gmaps, plan))
+    assert [(place["name"], more) for place, more in pages] == [("Page 1", False)]
+    gmaps.places.assert_not_called()
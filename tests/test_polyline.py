@@ -0,0 +1,68 @@
+"""
+Tests for the vectorized polyline decoder and path resampling.
+"""
+
+import numpy as np
+import pytest
+from googlemaps.convert import decode_polyline, encode_polyline
+from locus.shared_libraries import polyline
+
+
+def random_path(seed: int, n: int) -> list:
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(scale=0.01, size=(n, 2))
+    path = np.cumsum(steps, axis=0) + [rng.uniform(-80, 80), rng.uniform(-170, 170)]
+    return [(round(lat, 5), round(lng, 5)) for lat, lng in path]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_round_trip_with_googlemaps(seed):
+    path = random_path(seed, 500)
+    encoded = encode_polyline(path)
+    decoded = polyline.decode(encoded)
+    assert decoded.shape == (500, 2)
+    np.testing.assert_allclose(decoded, path, atol=1e-9)
+    expected = [(p["lat"], p["lng"]) for p in decode_polyline(encoded)]
+    np.testing.assert_allclose(decoded, expected, atol=1e-9)
+
+
+def test_known_polyline():
+    # The example from Google's encoded polyline documentation.
+    decoded = polyline.decode("_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+    np.testing.assert_allclose(
+        decoded, [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    )
+
+
+@pytest.mark.parametrize("bad", ["_p~iF~ps|", "_p~iF~ps|U_ulL", "abc\x1f"])
+def test_invalid_polylines(bad):
+    with pytest.raises(ValueError):
+        polyline.decode(bad)
+
+
+def test_empty_polyline():
+    assert polyline.decode("").shape == (0, 2)
+
+
+def test_resample_spacing_and_ends():
+    # About 1.11 km due north along a meridian.
+    points = np.array([(0.0, 0.0), (0.005, 0.0), (0.01, 0.0)])
+    samples, distances = polyline.resample(points, 100.0)
+    total = polyline.segment_lengths(points).sum()
+    assert total == pytest.approx(1111.95, abs=0.1)
+    assert distances[0] == 0.0 and distances[-1] == pytest.approx(total)
+    np.testing.assert_allclose(np.diff(distances[:-1]), 100.0)
+    np.testing.assert_allclose(samples[[0, -1]], points[[0, -1]])
+    np.testing.assert_allclose(samples[:, 0], distances / total * 0.01)
+    assert len(samples) == 13
+
+
+def test_resample_degenerate_paths():
+    single = np.array([(1.0, 2.0)])
+    samples, distances = polyline.resample(single, 50.0)
+    np.testing.assert_array_equal(samples, single)
+    assert distances.tolist() == [0.0]
+    still = np.array([(1.0, 2.0), (1.0, 2.0)])
+    samples, distances = polyline.resample(still, 50.0)
+    assert distances.tolist() == [0.0]
+    assert len(samples) == 1
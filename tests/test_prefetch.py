@@ -0,0 +1,42 @@
+"""
+Tests for which lookups the trip prefetcher warms.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from unittest import mock
+from locus.tools import prefetch
+
+
+def day(offset: int) -> str:
+    return (date.today() + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def test_air_quality_only_for_current_trips(monkeypatch):
+    assert prefetch.prefetch_air_quality(None, None)
+    assert prefetch.prefetch_air_quality(day(-1), day(1))
+    assert not prefetch.prefetch_air_quality(day(5), day(8))
+    assert not prefetch.prefetch_air_quality(day(-8), day(-5))
+    # Unless the trip starts before a cached entry would expire.
+    monkeypatch.setattr(prefetch, "AIR_QUALITY_TTL", 2 * 24 * 3600)
+    assert prefetch.prefetch_air_quality(day(1), day(3))
+
+
+def test_future_leg_skips_air_quality(monkeypatch):
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIzaFAKE")
+
+    async def geocode(destination):
+        return {"lat": 48.86, "lng": 2.35}
+
+    async def lookup(*args):
+        return {"ok": True}
+
+    air_quality = mock.AsyncMock(return_value={"aqi": 40})
+    monkeypatch.setattr(prefetch, "geocode_location_async", geocode)
+    monkeypatch.setattr(prefetch, "run_weather_lookup", lookup)
+    monkeypatch.setattr(prefetch, "check_air_quality", air_quality)
+    scheduler = prefetch.PrefetchScheduler()
+    assert asyncio.run(scheduler.warm("Paris", day(5), day(8))) == 1
+    air_quality.assert_not_called()
+    assert asyncio.run(scheduler.warm("Paris", day(0), day(2))) == 3
+    air_quality.assert_awaited_once_with("Paris")
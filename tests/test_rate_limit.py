@@ -0,0 +1,54 @@
+"""
+Tests for the per-key token buckets and daily budgets.
+"""
+
+import pytest
+from locus.shared_libraries import rate_limit
+from locus.shared_libraries.rate_limit import BULK, INTERACTIVE, DailyBudgetExceeded
+
+PLACES = "https://maps.googleapis.com/maps/api/place/textsearch/json?key=AIzaFAKE"
+GEOCODE = "https://maps.googleapis.com/maps/api/geocode/json?key=AIzaFAKE"
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setenv("LOCUS_RATE_LIMIT_PLACES", "4")
+    monkeypatch.setenv("LOCUS_RATE_LIMIT_BURST_SECONDS", "1")
+    monkeypatch.setenv("LOCUS_RATE_LIMIT_BULK_RESERVE", "0.5")
+    return rate_limit.RateLimiter()
+
+
+def test_family_bucket_allows_a_burst_then_waits(limiter):
+    assert [limiter.reserve(PLACES, INTERACTIVE) for _ in range(4)] == [0.0] * 4
+    wait = limiter.reserve(PLACES, INTERACTIVE)
+    assert 0 < wait <= 0.25
+    # Other families of the same key have their own bucket.
+    assert limiter.reserve(GEOCODE, INTERACTIVE) == 0.0
+
+
+def test_bulk_calls_leave_a_reserve_for_interactive_ones(limiter):
+    taken = 0
+    while limiter.reserve(PLACES, BULK) == 0.0:
+        taken += 1
+    assert taken == 2
+    assert limiter.reserve(PLACES, INTERACTIVE) == 0.0
+
+
+def test_requests_without_a_key_are_not_limited(limiter):
+    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+    assert all(limiter.reserve(url, INTERACTIVE) == 0.0 for _ in range(10))
+
+
+def test_daily_budget_degrades_bulk_then_refuses(limiter, monkeypatch):
+    monkeypatch.setenv("LOCUS_RATE_LIMIT_PLACES", "1000")
+    monkeypatch.setenv("LOCUS_DAILY_BUDGET_PLACES", "10")
+    monkeypatch.setenv("LOCUS_DAILY_BUDGET_DEGRADE", "0.5")
+    for _ in range(5):
+        limiter.reserve(PLACES, BULK)
+    with pytest.raises(DailyBudgetExceeded):
+        limiter.reserve(PLACES, BULK)
+    for _ in range(5):
+        limiter.reserve(PLACES, INTERACTIVE)
+    with pytest.raises(DailyBudgetExceeded):
+        limiter.reserve(PLACES, INTERACTIVE)
+    assert list(limiter.stats()["daily_usage"].values()) == [10]
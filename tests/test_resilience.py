@@ -0,0 +1,100 @@
+"""
+Tests for the circuit breaker state machine and the retry backoff.
+"""
+
+import time
+import pytest
+from locus.shared_libraries import deadline, resilience
+from locus.shared_libraries.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh():
+    resilience.reset()
+    yield
+    resilience.reset()
+
+
+def tripped(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=2, **kwargs)
+    for _ in range(2):
+        breaker.acquire()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    # A success in between resets the count.
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    assert breaker.snapshot()["rejected"] == 1
+    assert breaker.snapshot()["trips"] == 1
+
+
+def test_half_open_probe_closes_on_success():
+    breaker = tripped(recovery_timeout=0.01, half_open_probes=1)
+    time.sleep(0.02)
+    assert breaker.state == HALF_OPEN
+    breaker.acquire()
+    # Only one probe at a time.
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.acquire()
+
+
+def test_half_open_probe_reopens_on_failure():
+    breaker = tripped(recovery_timeout=0.01, half_open_probes=1)
+    time.sleep(0.02)
+    breaker.acquire()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["trips"] == 2
+
+
+def test_release_frees_the_probe_without_a_verdict():
+    breaker = tripped(recovery_timeout=0.01, half_open_probes=1)
+    time.sleep(0.02)
+    breaker.acquire()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    breaker.acquire()
+
+
+def test_retry_delay_backs_off_with_jitter(monkeypatch):
+    monkeypatch.setenv("LOCUS_RETRY_MAX_ATTEMPTS", "10")
+    monkeypatch.setenv("LOCUS_RETRY_BASE_DELAY", "1")
+    monkeypatch.setenv("LOCUS_RETRY_MAX_DELAY", "4")
+    for attempt, bound in ((1, 1), (2, 2), (3, 4), (6, 4)):
+        delays = [resilience.retry_delay(attempt) for _ in range(50)]
+        assert all(0 <= d <= bound for d in delays)
+        assert max(delays) > bound / 2
+    assert resilience.get_breaker_states()["retries"] == 200
+
+
+def test_retry_delay_gives_up(monkeypatch):
+    monkeypatch.setenv("LOCUS_RETRY_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("LOCUS_RETRY_MAX_DELAY", "4")
+    assert resilience.retry_delay(3) is None
+    # Retry-After raises the delay, unless it is longer than the cap.
+    assert resilience.retry_delay(1, "2") >= 2
+    assert resilience.retry_delay(1, "10") is None
+    # Nor does a retry sleep past the request deadline.
+    with deadline.deadline(0.5):
+        assert resilience.retry_delay(1, "1") is None
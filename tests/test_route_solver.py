@@ -0,0 +1,104 @@
+"""
+Tests for the itinerary visiting-order heuristic against brute force.
+"""
+
+import itertools
+import numpy as np
+import pytest
+from locus.sub_agents.navigator.tools import route_solver
+
+NINE = 9 * 3600.0
+SEEDS = range(20)
+
+
+def make_day(n: int, seed: int, windows: bool):
+    """Random stops a few km apart, with an hour at each and some windows."""
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2)) * 5000
+    seconds = np.linalg.norm(points[:, None] - points[None], axis=2) / 1.4
+    seconds *= 1 + 0.2 * rng.random((n, n))
+    np.fill_diagonal(seconds, 0.0)
+    service = np.full(n, 3600.0)
+    bounds = None
+    if windows:
+        bounds = np.full((n, 2), np.nan)
+        bounds[0] = [9.5 * 3600, 11 * 3600]
+        bounds[2] = [10 * 3600, 11 * 3600]
+        bounds[n - 1] = [12 * 3600, 14 * 3600]
+    return seconds, service, bounds
+
+
+def score(travel, late):
+    return travel + route_solver.LATENESS_PENALTY * late
+
+
+def brute_force(seconds, service, windows, closed):
+    """The best score over every order that starts at stop 0."""
+    n = len(seconds)
+    orders = np.array([(0,) + p for p in itertools.permutations(range(1, n))])
+    travel, late = route_solver.evaluate(
+        orders, seconds, service, windows, NINE, closed
+    )
+    return float(score(travel, late).min())
+
+
+def solve_ratios(n, closed, windows):
+    ratios = []
+    for seed in SEEDS:
+        seconds, service, bounds = make_day(n, seed, windows)
+        solution = route_solver.solve(seconds, service, bounds, NINE, closed)
+        found = score(solution["travel_seconds"], solution["late_seconds"])
+        ratios.append(found / brute_force(seconds, service, bounds, closed))
+    return np.array(ratios)
+
+
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("windows", [False, True])
+def test_matches_brute_force_on_five_stops(closed, windows):
+    ratios = solve_ratios(5, closed, windows)
+    assert np.allclose(ratios, 1.0)
+
+
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("windows", [False, True])
+def test_close_to_brute_force_on_eight_stops(closed, windows):
+    ratios = solve_ratios(8, closed, windows)
+    assert (ratios >= 1.0 - 1e-9).all()
+    assert np.mean(ratios < 1.0 + 1e-9) >= 0.8
+    assert ratios.max() <= 1.1
+    assert ratios.mean() <= 1.01
+
+
+def test_schedule_agrees_with_evaluate():
+    seconds, service, bounds = make_day(8, 3, True)
+    rng = np.random.default_rng(0)
+    for closed in (False, True):
+        for _ in range(20):
+            order = np.concatenate(([0], rng.permutation(np.arange(1, 8))))
+            travel, late = route_solver.evaluate(
+                order[None, :], seconds, service, bounds, NINE, closed
+            )
+            legs = route_solver.schedule(order, seconds, service, bounds, NINE, closed)
+            assert sum(leg["travel"] for leg in legs) == pytest.approx(travel[0])
+            assert sum(leg["late"] for leg in legs) == pytest.approx(late[0])
+
+
+def test_start_window_delays_the_day():
+    seconds = np.array([[0.0, 600.0], [600.0, 0.0]])
+    service = np.array([3600.0, 3600.0])
+    windows = np.array([[10 * 3600, 12 * 3600], [np.nan, np.nan]])
+    legs = route_solver.schedule([0, 1], seconds, service, windows, NINE, False)
+    assert legs[0]["from"] is None
+    assert legs[0]["wait"] == 3600.0
+    assert legs[0]["depart"] == 11 * 3600
+    assert legs[1]["arrive"] == 11 * 3600 + 600
+
+
+def test_late_start_window_counts_as_lateness():
+    seconds = np.array([[0.0, 600.0], [600.0, 0.0]])
+    service = np.zeros(2)
+    windows = np.array([[7 * 3600, 8 * 3600], [np.nan, np.nan]])
+    _, late = route_solver.evaluate(
+        np.array([[0, 1]]), seconds, service, windows, NINE, False
+    )
+    assert late[0] == 3600.0
@@ -0,0 +1,118 @@
+"""
+Tests for coalescing concurrent identical calls.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from locus.shared_libraries import deadline
+from locus.shared_libraries.deadline import DeadlineExceeded
+from locus.shared_libraries.singleflight import SingleFlight
+
+
+def slow_fetch(calls: list, result="done", delay=0.05):
+    async def fetch(*args):
+        calls.append(args)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return fetch
+
+
+def test_concurrent_async_calls_share_one_fetch():
+    flight, calls = SingleFlight(), []
+    fetch = slow_fetch(calls)
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async("key", fetch, "arg") for _ in range(5)),
+            flight.do_async("other", fetch, "other"),
+        )
+
+    assert asyncio.run(main()) == ["done"] * 6
+    assert sorted(calls) == [("arg",), ("other",)]
+    assert flight.coalesced == 4
+    assert flight.in_flight() == 0
+
+
+def test_async_error_reaches_every_waiter():
+    flight, calls = SingleFlight(), []
+    fetch = slow_fetch(calls, ValueError("upstream"))
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async("key", fetch) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert [type(r) for r in results] == [ValueError] * 3
+    assert len(calls) == 1
+
+
+def test_cancelled_waiter_leaves_the_shared_call_running():
+    flight, calls = SingleFlight(), []
+    fetch = slow_fetch(calls)
+
+    async def main():
+        first = asyncio.ensure_future(flight.do_async("key", fetch))
+        second = asyncio.ensure_future(flight.do_async("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+    assert len(calls) == 1
+
+
+def test_waiter_out_of_budget_stops_waiting():
+    flight, calls = SingleFlight(), []
+    fetch = slow_fetch(calls, delay=0.2)
+
+    async def impatient():
+        with deadline.deadline(0.05):
+            return await flight.do_async("key", fetch)
+
+    async def main():
+        return await asyncio.gather(
+            impatient(), flight.do_async("key", fetch), return_exceptions=True
+        )
+
+    hurried, patient = asyncio.run(main())
+    assert isinstance(hurried, DeadlineExceeded)
+    assert patient == "done"
+    assert len(calls) == 1
+
+
+def test_threaded_calls_share_one_fetch():
+    flight, calls = SingleFlight(), []
+    started, release = threading.Event(), threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "done"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    leader.start()
+    started.wait(5)
+    waiters = [
+        threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+        for _ in range(3)
+    ]
+    for thread in waiters:
+        thread.start()
+    while flight.coalesced < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(5)
+    assert results == ["done"] * 4
+    assert len(calls) == 1
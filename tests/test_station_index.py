@@ -0,0 +1,49 @@
+"""
+Tests for when the transit station index answers without the Places API.
+"""
+
+from locus.shared_libraries.cache import TwoTierCache
+from locus.shared_libraries.station_index import StationIndex
+
+
+def place(name: str, lat: float, lng: float) -> dict:
+    location = {"lat": lat, "lng": lng}
+    return {"name": name, "place_id": name, "geometry": {"location": location}}
+
+
+def index() -> StationIndex:
+    return StationIndex(TwoTierCache("test.stations", ttl=60, persistent=False))
+
+
+def test_complete_response_covers_its_circle():
+    stations = index()
+    assert stations.query(0.0, 0.0, 1000) is None
+    found = stations.add_response(0.0, 0.0, 1000, [place("Central", 0.001, 0.0)])
+    assert [s["name"] for s in found] == ["Central"]
+    assert [s["name"] for s in stations.query(0.0, 0.001, 500)] == ["Central"]
+
+
+def test_truncated_response_covers_nothing():
+    stations = index()
+    found = stations.add_response(
+        0.0, 0.0, 1000, [place("Central", 0.008, 0.0)], next_page_token="more"
+    )
+    assert [s["name"] for s in found] == ["Central"]
+    # Nearer stations may be on the next page.
+    assert stations.query(0.0, 0.0, 500) is None
+
+
+def test_persisted_responses_are_read_outside_the_lock():
+    cache = TwoTierCache("test.stations.persisted", ttl=60, persistent=False)
+    StationIndex(cache).add_response(0.0, 0.0, 1000, [place("Central", 0.0, 0.0)])
+    stations = StationIndex(cache)
+    scan = cache.scan
+
+    def unlocked_scan(prefix):
+        assert not stations._lock.locked()
+        return scan(prefix)
+
+    cache.scan = unlocked_scan
+    stations.load()
+    assert stations.loaded
+    assert [s["name"] for s in stations.query(0.0, 0.0, 500)] == ["Central"]
@@ -0,0 +1,73 @@
+"""
+Tests for how a day of weather history is cut from history:lookup and cached.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import pytest
+from locus.shared_libraries.spatial_cache import SpatialCache
+from locus.sub_agents.weather.tools import weather
+
+TOKYO = (35.68, 139.76)
+
+
+def hours_from(start: str, count: int) -> list:
+    """Hourly records with UTC timestamps, the temperature being the index."""
+    first = datetime.fromisoformat(start).replace(tzinfo=timezone.utc)
+    return [
+        {
+            "timestamp": (first + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "temperature": {"degrees": float(i)},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """Serves the given hours from history:lookup; returns the request params."""
+    monkeypatch.setattr(weather, "get_timezone", lambda *args: "Asia/Tokyo")
+    cache = SpatialCache("test.weather.history", ttl=1e6, persistent=False)
+    monkeypatch.setattr(weather, "history_cache", cache)
+    sent = []
+
+    def serve(hours):
+        def get(url, params):
+            sent.append(params)
+            return mock.Mock(json=lambda: {"history": {"hours": hours}})
+
+        monkeypatch.setattr(weather.http_client, "get", get)
+        return sent
+
+    serve.cache = cache
+    return serve
+
+
+def expires_in(cache: SpatialCache, date: str) -> float:
+    _, expires_at = cache.cache.memory.get(cache.key(*TOKYO, date))
+    return expires_at - time.time()
+
+
+def test_hours_are_cut_to_the_local_date(history):
+    # 2026-10-10 in Tokyo runs from 15:00 UTC on the 9th; the feed has more.
+    sent = history(hours_from("2026-10-09T12:00", 30))
+    result = weather.get_historical_weather(*TOKYO, "key", "Tokyo", "2026-10-10")
+    assert sent[0]["timestamp"] == "2026-10-10T03:00:00Z"
+    stats = result["historical_weather"]
+    assert (stats["min_temp_celsius"], stats["max_temp_celsius"]) == (3.0, 26.0)
+    assert expires_in(history.cache, "2026-10-10") > 1e5
+
+
+def test_partial_day_is_cached_briefly(history):
+    history(hours_from("2026-10-09T15:00", 10))
+    result = weather.get_historical_weather(*TOKYO, "key", "Tokyo", "2026-10-10")
+    assert result["historical_weather"]["max_temp_celsius"] == 9.0
+    assert expires_in(history.cache, "2026-10-10") <= weather.PARTIAL_HISTORY_TTL
+
+
+def test_clock_change_day_is_complete_with_25_hours():
+    payload = {"history": {"hours": hours_from("2026-10-24T22:00", 25)}}
+    day = weather.local_day(payload, "2026-10-25", "Europe/Paris")
+    assert day["complete"]
+    assert len(day["history"]["hours"]) == 25